@@ -0,0 +1,280 @@
+# vim: set fileencoding=utf-8
+"""
+benchmarks/event_delivery.py
+
+This script defines the EventDeliveryBenchmark class, and runs it.
+
+Usage: python -m benchmarks.event_delivery --events 1000
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import argparse
+import asyncio
+import importlib.util
+import json
+from org.acmsl.iac.licdata.infrastructure.dbus.local_event_bus import LocalEventBus
+import shutil
+import statistics
+import subprocess
+import time
+from typing import Awaitable, Callable, Dict, List
+import uuid
+
+
+class Delivered:
+    """
+    An event delivered in the benchmark.
+
+    Class name: Delivered
+
+    Responsibilities:
+        - Stand for a pythoneda.shared.Event, with a payload of some size.
+
+    Collaborators:
+        - None
+    """
+
+    def __init__(self, eventId: str, payload: str):
+        """
+        Creates a new Delivered instance.
+        :param eventId: The id of the event.
+        :type eventId: str
+        :param payload: The payload.
+        :type payload: str
+        """
+        self.id = eventId
+        self.payload = payload
+
+
+class EventDeliveryBenchmark:
+    """
+    Measures how long an event takes to reach a listener in the same
+    process, through LocalEventBus and through d-bus.
+
+    Class name: EventDeliveryBenchmark
+
+    Responsibilities:
+        - Deliver events one at a time through LocalEventBus, timing each
+          one from publishing to the handler.
+        - Send the same events as d-bus signals, serialized as JSON, through
+          a private dbus-daemon (or a given bus), timing each one from
+          sending to the receiving handler.
+        - Report the average, median, 95th percentile and maximum latency of
+          each path.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.dbus.LocalEventBus
+    """
+
+    INTERFACE = "org.acmsl.iac.licdata.infrastructure.Benchmark"
+
+    PATH = "/org/acmsl/iac/licdata"
+
+    def __init__(self, events: int, payloadBytes: int, address: str = None):
+        """
+        Creates a new EventDeliveryBenchmark instance.
+        :param events: How many events to deliver through each path.
+        :type events: int
+        :param payloadBytes: The size of the payload of each event.
+        :type payloadBytes: int
+        :param address: The address of the d-bus bus. If omitted, a private
+        dbus-daemon is started.
+        :type address: str
+        """
+        self._events = [
+            Delivered(uuid.uuid4().hex, "x" * payloadBytes) for _ in range(events)
+        ]
+        self._address = address
+
+    @classmethod
+    def report(cls, path: str, latencies: List[float]) -> Dict:
+        """
+        Summarizes given latencies.
+        :param path: The delivery path: local or dbus.
+        :type path: str
+        :param latencies: The latency of each event, in seconds.
+        :type latencies: List[float]
+        :return: The number of events, and their average, median, 95th
+        percentile and maximum latency, in milliseconds.
+        :rtype: Dict
+        """
+        ordered = sorted(latencies)
+        return {
+            "path": path,
+            "events": len(ordered),
+            "avg_ms": round(statistics.mean(ordered) * 1000, 4),
+            "p50_ms": round(statistics.median(ordered) * 1000, 4),
+            "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 4),
+            "max_ms": round(ordered[-1] * 1000, 4),
+        }
+
+    async def time_each(self, deliver: Callable[[Delivered], Awaitable]) -> List[float]:
+        """
+        Delivers the events one at a time, timing each one.
+        :param deliver: The function delivering an event, returning once the
+        handler got it.
+        :type deliver: Callable[[Delivered], Awaitable]
+        :return: The latency of each event, in seconds.
+        :rtype: List[float]
+        """
+        result = []
+        for event in self._events:
+            started = time.perf_counter()
+            await deliver(event)
+            result.append(time.perf_counter() - started)
+        return result
+
+    async def measure_local(self) -> Dict:
+        """
+        Delivers the events through LocalEventBus.
+        :return: The latency report.
+        :rtype: Dict
+        """
+        bus = LocalEventBus()
+        loop = asyncio.get_running_loop()
+        received = {}
+
+        async def handler(event: Delivered):
+            received.pop(event.id).set_result(None)
+
+        bus.subscribe([Delivered.__module__], handler)
+
+        async def deliver(event: Delivered):
+            received[event.id] = loop.create_future()
+            waiter = received[event.id]
+            await bus.publish(event)
+            await waiter
+
+        return self.__class__.report("local", await self.time_each(deliver))
+
+    async def measure_dbus(self, address: str) -> Dict:
+        """
+        Delivers the events as d-bus signals, through given bus.
+        :param address: The address of the bus.
+        :type address: str
+        :return: The latency report.
+        :rtype: Dict
+        """
+        from dbus_next import Message, MessageType
+        from dbus_next.aio import MessageBus
+
+        sender = await MessageBus(bus_address=address).connect()
+        receiver = await MessageBus(bus_address=address).connect()
+        loop = asyncio.get_running_loop()
+        received = {}
+
+        def handler(message: Message):
+            if (
+                message.message_type == MessageType.SIGNAL
+                and message.interface == self.__class__.INTERFACE
+            ):
+                event = json.loads(message.body[0])
+                received.pop(event["id"]).set_result(
+                    Delivered(event["id"], event["payload"])
+                )
+
+        receiver.add_message_handler(handler)
+        await receiver.call(
+            Message(
+                destination="org.freedesktop.DBus",
+                path="/org/freedesktop/DBus",
+                interface="org.freedesktop.DBus",
+                member="AddMatch",
+                signature="s",
+                body=[f"type='signal',interface='{self.__class__.INTERFACE}'"],
+            )
+        )
+
+        async def deliver(event: Delivered):
+            received[event.id] = loop.create_future()
+            waiter = received[event.id]
+            await sender.send(
+                Message.new_signal(
+                    self.__class__.PATH,
+                    self.__class__.INTERFACE,
+                    "Delivered",
+                    "s",
+                    [json.dumps({"id": event.id, "payload": event.payload})],
+                )
+            )
+            await waiter
+
+        try:
+            return self.__class__.report("dbus", await self.time_each(deliver))
+        finally:
+            sender.disconnect()
+            receiver.disconnect()
+
+    async def run(self) -> List[Dict]:
+        """
+        Delivers the events through each path, printing one report per path.
+        :return: Such reports.
+        :rtype: List[Dict]
+        """
+        result = [await self.measure_local()]
+        print(json.dumps(result[-1]), flush=True)
+        if importlib.util.find_spec("dbus_next") is None:
+            report = {"path": "dbus", "skipped": "dbus-next is not installed"}
+        elif self._address is not None:
+            report = await self.measure_dbus(self._address)
+        elif shutil.which("dbus-daemon") is None:
+            report = {"path": "dbus", "skipped": "dbus-daemon is not installed"}
+        else:
+            daemon = subprocess.Popen(
+                ["dbus-daemon", "--session", "--nofork", "--print-address=1"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+            try:
+                report = await self.measure_dbus(daemon.stdout.readline().strip())
+            finally:
+                daemon.terminate()
+                daemon.wait()
+                daemon.stdout.close()
+        print(json.dumps(report), flush=True)
+        result.append(report)
+        return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the latency of delivering events in-process through LocalEventBus against d-bus signals."
+    )
+    parser.add_argument(
+        "--events", type=int, default=1000, help="Events delivered through each path."
+    )
+    parser.add_argument(
+        "--payload-bytes", type=int, default=512, help="Payload size of each event."
+    )
+    parser.add_argument(
+        "--address",
+        help="Address of the d-bus bus to use, instead of a private dbus-daemon.",
+    )
+    args = parser.parse_args()
+    asyncio.run(
+        EventDeliveryBenchmark(args.events, args.payload_bytes, args.address).run()
+    )
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
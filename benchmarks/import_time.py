@@ -0,0 +1,159 @@
+# vim: set fileencoding=utf-8
+"""
+benchmarks/import_time.py
+
+This script defines the ImportTimeBudget class, and runs it.
+
+Usage: python -m benchmarks.import_time --budget-ms 500
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List
+
+
+class ImportTimeBudget:
+    """
+    Checks how long importing a module takes, and which SDKs it drags in.
+
+    Class name: ImportTimeBudget
+
+    Responsibilities:
+        - Import a module in a fresh interpreter, with -X importtime.
+        - Compare its cumulative import time against a budget.
+        - Report the heavy SDK modules it loaded, which should stay lazy.
+
+    Collaborators:
+        - The packages whose exports are resolved lazily.
+    """
+
+    DEFAULT_MODULES = [
+        "org.acmsl.iac.licdata.infrastructure",
+        "org.acmsl.iac.licdata.infrastructure.azure",
+        "org.acmsl.iac.licdata.infrastructure.cli.pulumi_options_cli",
+        "org.acmsl.iac.licdata.infrastructure.azure.request_azure_docker_image_details",
+    ]
+
+    DEFAULT_BUDGET_MS = 500.0
+
+    HEAVY_MODULES = ["pulumi_azure_native", "azure.mgmt", "pulumi.automation"]
+
+    def __init__(self, budgetMs: float, heavyModules: List[str]):
+        """
+        Creates a new ImportTimeBudget instance.
+        :param budgetMs: The maximum cumulative import time, in milliseconds.
+        :type budgetMs: float
+        :param heavyModules: The modules (and their submodules) that must not be loaded.
+        :type heavyModules: List[str]
+        """
+        super().__init__()
+        self._budget_ms = budgetMs
+        self._heavy_modules = heavyModules
+
+    def measure(self, module: str) -> Dict:
+        """
+        Imports given module in a fresh interpreter.
+        :param module: The module.
+        :type module: str
+        :return: The cumulative import time, the heavy modules loaded and
+        whether the module is within budget.
+        :rtype: Dict
+        """
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+        )
+        cumulative_us = 0
+        loaded = []
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line[len("import time:") :].split("|", 2)
+            name = name.strip()
+            if name == module:
+                cumulative_us = int(cumulative)
+            if any(
+                name == heavy or name.startswith(f"{heavy}.")
+                for heavy in self._heavy_modules
+            ):
+                loaded.append(name)
+        result = {
+            "module": module,
+            "cumulative_ms": round(cumulative_us / 1000, 1),
+            "heavy_modules": sorted(loaded),
+        }
+        if process.returncode != 0:
+            result["error"] = process.stderr.strip().splitlines()[-1]
+        result["ok"] = (
+            process.returncode == 0
+            and not loaded
+            and result["cumulative_ms"] <= self._budget_ms
+        )
+        return result
+
+    def run(self, modules: List[str]) -> bool:
+        """
+        Checks given modules, printing one report per module.
+        :param modules: The modules.
+        :type modules: List[str]
+        :return: True if every module is within budget.
+        :rtype: bool
+        """
+        result = True
+        for module in modules:
+            report = self.measure(module)
+            print(json.dumps(report), flush=True)
+            result = result and report["ok"]
+        return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check the import time of the packages against a budget, and that they don't load the heavy SDKs."
+    )
+    parser.add_argument(
+        "--modules",
+        default=",".join(ImportTimeBudget.DEFAULT_MODULES),
+        help="Comma-separated modules to import.",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=ImportTimeBudget.DEFAULT_BUDGET_MS,
+        help="Maximum cumulative import time of each module, in milliseconds.",
+    )
+    parser.add_argument(
+        "--heavy",
+        default=",".join(ImportTimeBudget.HEAVY_MODULES),
+        help="Comma-separated modules that must stay unloaded.",
+    )
+    args = parser.parse_args()
+    budget = ImportTimeBudget(args.budget_ms, args.heavy.split(","))
+    sys.exit(0 if budget.run(args.modules.split(",")) else 1)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
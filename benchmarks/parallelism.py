@@ -0,0 +1,244 @@
+# vim: set fileencoding=utf-8
+"""
+benchmarks/parallelism.py
+
+This script defines the ParallelismBenchmark class, and runs it.
+
+Usage: python -m benchmarks.parallelism --levels 1,4,8,16,32
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import argparse
+import json
+from org.acmsl.iac.licdata.infrastructure.pulumi_resource_timings import (
+    PulumiResourceTimings,
+)
+import os
+import pulumi
+from pulumi import automation as auto
+from pulumi import dynamic
+import tempfile
+import time
+from typing import Dict, List
+import uuid
+
+
+class SleepProvider(dynamic.ResourceProvider):
+    """
+    A local provider whose resources just take some time to create and delete.
+
+    Class name: SleepProvider
+
+    Responsibilities:
+        - Stand in for a cloud provider, without any cloud.
+
+    Collaborators:
+        - pulumi.dynamic.ResourceProvider
+    """
+
+    def create(self, props):
+        """
+        Creates a resource, taking its delay.
+        :param props: The inputs of the resource.
+        :type props: dict
+        :return: The outcome.
+        :rtype: pulumi.dynamic.CreateResult
+        """
+        time.sleep(float(props["delay"]))
+        return dynamic.CreateResult(id_=uuid.uuid4().hex, outs=props)
+
+    def delete(self, id, props):
+        """
+        Deletes a resource, taking its delay.
+        :param id: The id of the resource.
+        :type id: str
+        :param props: The outputs of the resource.
+        :type props: dict
+        """
+        time.sleep(float(props["delay"]))
+
+
+class Sleep(dynamic.Resource):
+    """
+    A resource of SleepProvider.
+
+    Class name: Sleep
+
+    Responsibilities:
+        - Take some time to create and delete.
+
+    Collaborators:
+        - SleepProvider
+    """
+
+    def __init__(self, name: str, delay: float, opts: pulumi.ResourceOptions = None):
+        """
+        Creates a new Sleep instance.
+        :param name: The name of the resource.
+        :type name: str
+        :param delay: How long (in seconds) creating or deleting it takes.
+        :type delay: float
+        :param opts: The resource options.
+        :type opts: pulumi.ResourceOptions
+        """
+        super().__init__(SleepProvider(), name, {"delay": delay}, opts)
+
+
+class ParallelismBenchmark:
+    """
+    Measures deploy and destroy times against the engine parallelism.
+
+    Class name: ParallelismBenchmark
+
+    Responsibilities:
+        - Deploy and destroy a mock stack, shaped like a small Licdata stack,
+          at each parallelism level.
+        - Report the wall time and the critical path of each run, to tune
+          PulumiStackOperation.DEFAULT_PARALLELISM from data.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.PulumiResourceTimings
+    """
+
+    def __init__(self, width: int, depth: int, delay: float):
+        """
+        Creates a new ParallelismBenchmark instance.
+        :param width: How many independent chains of resources the stack has.
+        :type width: int
+        :param depth: How many resources each chain has.
+        :type depth: int
+        :param delay: How long (in seconds) creating or deleting a resource takes.
+        :type delay: float
+        """
+        self._width = width
+        self._depth = depth
+        self._delay = delay
+
+    def program(self):
+        """
+        Declares the mock stack: width chains of depth dependent resources.
+        """
+        for chain in range(self._width):
+            previous = None
+            for step in range(self._depth):
+                previous = Sleep(
+                    f"sleep-{chain}-{step}",
+                    self._delay,
+                    pulumi.ResourceOptions(
+                        depends_on=[previous] if previous is not None else None
+                    ),
+                )
+
+    def measure(self, stack: auto.Stack, step: str, parallel: int) -> Dict:
+        """
+        Runs given step, timing it.
+        :param stack: The stack.
+        :type stack: pulumi.automation.Stack
+        :param step: The step: up or destroy.
+        :type step: str
+        :param parallel: The parallelism.
+        :type parallel: int
+        :return: The timing report.
+        :rtype: Dict
+        """
+        timings = PulumiResourceTimings()
+        start = time.monotonic()
+        getattr(stack, step)(parallel=parallel, on_event=timings.on_event)
+        elapsed = time.monotonic() - start
+        dependencies = {
+            resource["urn"]: resource.get("dependencies", None) or []
+            for resource in (stack.export_stack().deployment or {}).get(
+                "resources", None
+            )
+            or []
+            if "urn" in resource
+        }
+        result = timings.report(dependencies, limit=0, reverse=step == "destroy")
+        result.pop("slowest", None)
+        result.pop("critical_path", None)
+        result["step"] = step
+        result["parallel"] = parallel
+        result["seconds"] = round(elapsed, 3)
+        return result
+
+    def run(self, levels: List[int]) -> List[Dict]:
+        """
+        Deploys and destroys the mock stack at each parallelism level, on a
+        throwaway local backend.
+        :param levels: The parallelism levels.
+        :type levels: List[int]
+        :return: The timing report of each run.
+        :rtype: List[Dict]
+        """
+        result = []
+        with tempfile.TemporaryDirectory() as backend:
+            os.environ.setdefault("PULUMI_CONFIG_PASSPHRASE", "")
+            stack = auto.create_or_select_stack(
+                stack_name="bench",
+                project_name="licdata-parallelism-bench",
+                program=self.program,
+                opts=auto.LocalWorkspaceOptions(
+                    project_settings=auto.ProjectSettings(
+                        name="licdata-parallelism-bench",
+                        runtime="python",
+                        backend=auto.ProjectBackend(url=f"file://{backend}"),
+                    )
+                ),
+            )
+            for level in levels:
+                for step in ["up", "destroy"]:
+                    report = self.measure(stack, step, level)
+                    print(json.dumps(report), flush=True)
+                    result.append(report)
+            stack.workspace.remove_stack("bench")
+        return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure deploy and destroy times against the Pulumi engine parallelism, on a local mock stack."
+    )
+    parser.add_argument(
+        "--levels",
+        default="1,4,8,16,32",
+        help="Comma-separated parallelism levels.",
+    )
+    parser.add_argument(
+        "--width", type=int, default=16, help="Independent chains of resources."
+    )
+    parser.add_argument(
+        "--depth", type=int, default=3, help="Dependent resources per chain."
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=1.0,
+        help="Seconds each resource takes to create or delete.",
+    )
+    args = parser.parse_args()
+    ParallelismBenchmark(args.width, args.depth, args.delay).run(
+        [int(level) for level in args.levels.split(",")]
+    )
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
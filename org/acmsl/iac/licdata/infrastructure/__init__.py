@@ -21,10 +21,41 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 __path__ = __import__("pkgutil").extend_path(__path__, __name__)
 
-from .remove_docker_resources_with_pulumi import RemoveDockerResourcesWithPulumi
-from .remove_infrastructure_with_pulumi import RemoveInfrastructureWithPulumi
-from .update_docker_resources_with_pulumi import UpdateDockerResourcesWithPulumi
-from .update_infrastructure_with_pulumi import UpdateInfrastructureWithPulumi
+from .lazy_exports import LazyExports
+
+_EXPORTS = {
+    "CausalChain": "causal_chain",
+    "EnvironmentSetting": "environment_setting",
+    "EventMetadata": "event_metadata",
+    "LazyExports": "lazy_exports",
+    "OperationFingerprintJournal": "operation_fingerprint_journal",
+    "PackageDigest": "package_digest",
+    "PersistedStackRecords": "persisted_stack_records",
+    "PulumiPluginCache": "pulumi_plugin_cache",
+    "PulumiRefreshJournal": "pulumi_refresh_journal",
+    "PulumiResourceTimings": "pulumi_resource_timings",
+    "PulumiStackExecutor": "pulumi_stack_executor",
+    "PulumiStackOperation": "pulumi_stack_operation",
+    "PulumiWorkspacePool": "pulumi_workspace_pool",
+    "RefreshMode": "refresh_mode",
+    "RefreshPolicy": "refresh_policy",
+    "RemoveDockerResourcesWithPulumi": "remove_docker_resources_with_pulumi",
+    "RemoveInfrastructureWithPulumi": "remove_infrastructure_with_pulumi",
+    "StackOperationCoalescer": "stack_operation_coalescer",
+    "StackOperationScheduler": "stack_operation_scheduler",
+    "StackOutputsCache": "stack_outputs_cache",
+    "UpdateDockerResourcesWithPulumi": "update_docker_resources_with_pulumi",
+    "UpdateInfrastructureWithPulumi": "update_infrastructure_with_pulumi",
+}
+
+_LAZY_EXPORTS = LazyExports(__name__, _EXPORTS)
+
+__all__ = _LAZY_EXPORTS.names
+
+__getattr__ = _LAZY_EXPORTS.attribute
+
+__dir__ = _LAZY_EXPORTS.attributes
+
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
 # Local Variables:
@@ -21,14 +21,40 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 __path__ = __import__("pkgutil").extend_path(__path__, __name__)
 
-from .functions_deployment_slot import FunctionsDeploymentSlot
-from .functions_package import FunctionsPackage
-from .licdata_api import LicdataApi
-from .licdata_web_app import LicdataWebApp
-from .update_azure_docker_resources_with_pulumi import (
-    UpdateAzureDockerResourcesWithPulumi,
-)
-from .update_azure_infrastructure_with_pulumi import UpdateAzureInfrastructureWithPulumi
-from .pulumi_azure_stack_operation_factory import PulumiAzureStackOperationFactory
+from ..lazy_exports import LazyExports
+
+_EXPORTS = {
+    "ArmPacedStackOperation": "arm_paced_stack_operation",
+    "ArmRateLimiter": "arm_rate_limiter",
+    "ArmThrottling": "arm_throttling",
+    "ArmThrottlingPolicy": "arm_throttling_policy",
+    "AsyncArmThrottlingPolicy": "async_arm_throttling_policy",
+    "AsyncCachedTokenCredential": "async_cached_token_credential",
+    "AzureClientPool": "azure_client_pool",
+    "AzureResourceInventory": "azure_resource_inventory",
+    "CachedTokenCredential": "cached_token_credential",
+    "DockerStackPrewarmer": "docker_stack_prewarmer",
+    "DockerStackRefresh": "docker_stack_refresh",
+    "FoundationStackReference": "foundation_stack_reference",
+    "FunctionsDeploymentSlot": "functions_deployment_slot",
+    "FunctionsPackage": "functions_package",
+    "FunctionsPackageUploader": "functions_package_uploader",
+    "LicdataApi": "licdata_api",
+    "LicdataWebApp": "licdata_web_app",
+    "PulumiAzureStackOperationFactory": "pulumi_azure_stack_operation_factory",
+    "RemoveAzureInfrastructureWithPulumi": "remove_azure_infrastructure_with_pulumi",
+    "TokenCredentialCache": "token_credential_cache",
+    "UpdateAzureDockerResourcesWithPulumi": "update_azure_docker_resources_with_pulumi",
+    "UpdateAzureInfrastructureWithPulumi": "update_azure_infrastructure_with_pulumi",
+}
+
+_LAZY_EXPORTS = LazyExports(__name__, _EXPORTS)
+
+__all__ = _LAZY_EXPORTS.names
+
+__getattr__ = _LAZY_EXPORTS.attribute
+
+__dir__ = _LAZY_EXPORTS.attributes
+
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
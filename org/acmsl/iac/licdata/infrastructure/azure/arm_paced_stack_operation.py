@@ -0,0 +1,117 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/azure/arm_paced_stack_operation.py
+
+This script defines the ArmPacedStackOperation class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .arm_rate_limiter import ArmRateLimiter
+import re
+
+
+class ArmPacedStackOperation:
+    """
+    Paces the Pulumi steps of Azure stack operations with the ARM rate limiter.
+
+    Class name: ArmPacedStackOperation
+
+    Responsibilities:
+        - Share the ARM budget of the subscription between the Pulumi steps
+          and the direct Azure SDK calls. The engine calls ARM on its own, so
+          each step is charged up front, as many tokens as its parallelism,
+          rather than per ARM call.
+        - Lower the engine parallelism while the subscription is throttled.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.ArmRateLimiter
+        - org.acmsl.iac.licdata.infrastructure.PulumiStackOperation
+    """
+
+    THROTTLING_CODES = re.compile(
+        r"\b(TooManyRequests|SubscriptionRequestsThrottled)\b"
+    )
+
+    @property
+    def arm_rate_limiter(self) -> ArmRateLimiter:
+        """
+        Retrieves the rate limiter of the subscription.
+        :return: Such limiter.
+        :rtype: org.acmsl.iac.licdata.infrastructure.azure.ArmRateLimiter
+        """
+        return ArmRateLimiter.for_subscription(
+            self.event.metadata.get("azure_subscription_id", None)
+        )
+
+    def parallelism(self, step: str) -> int:
+        """
+        Retrieves how many resource operations the engine may run in parallel
+        in given step, capped by the current ARM budget while the
+        subscription is throttled.
+        :param step: The step: refresh, preview, up or destroy.
+        :type step: str
+        :return: The parallelism.
+        :rtype: int
+        """
+        result = super().parallelism(step)
+        limiter = self.arm_rate_limiter
+        if limiter.is_throttled():
+            result = min(result, limiter.concurrency_budget())
+        return result
+
+    async def _before_step(self, step: str):
+        """
+        Waits until the subscription has budget for the calls the engine
+        issues at once in given step. It charges parallelism(step) tokens
+        once per step, not per ARM call: the engine's own calls don't go
+        through the limiter.
+        :param step: The step: refresh, preview, up or destroy.
+        :type step: str
+        """
+        await super()._before_step(step)
+        await self.arm_rate_limiter.acquire_async(self.parallelism(step))
+
+    def _step_succeeded(self, step: str):
+        """
+        Notifies that a Pulumi step completed, so the limiter can recover
+        from an earlier throttling.
+        :param step: The step: refresh, preview, up or destroy.
+        :type step: str
+        """
+        super()._step_succeeded(step)
+        self.arm_rate_limiter.observe(200, {})
+
+    def _operation_failed(self, error: Exception):
+        """
+        Notifies that a Pulumi step failed, backing off if ARM throttled it,
+        as told by the TooManyRequests or SubscriptionRequestsThrottled codes
+        in the error.
+        :param error: The error.
+        :type error: Exception
+        """
+        super()._operation_failed(error)
+        if self.__class__.THROTTLING_CODES.search(str(error)):
+            self.arm_rate_limiter.observe(429, {})
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
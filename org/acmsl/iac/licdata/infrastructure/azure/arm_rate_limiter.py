@@ -0,0 +1,321 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/azure/arm_rate_limiter.py
+
+This script defines the ArmRateLimiter class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+from email.utils import parsedate_to_datetime
+from org.acmsl.iac.licdata.infrastructure import EnvironmentSetting
+from pythoneda.shared import BaseObject
+import threading
+import time
+from typing import Mapping, Optional
+
+
+class ArmRateLimiter(BaseObject):
+    """
+    A token bucket bounding the Azure Resource Manager calls of a subscription.
+
+    Class name: ArmRateLimiter
+
+    Responsibilities:
+        - Pace the ARM calls of a subscription, shared by every operation
+          in the daemon.
+        - Adapt the budget to the Retry-After and remaining-quota headers
+          returned by ARM: back off on throttling, recover gradually.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.ArmThrottlingPolicy
+        - org.acmsl.iac.licdata.infrastructure.azure.AsyncArmThrottlingPolicy
+    """
+
+    DEFAULT_RATE = 10.0
+
+    DEFAULT_BURST = 200
+
+    MIN_RATE = 0.5
+
+    REMAINING_QUOTA_HEADER_PREFIX = "x-ms-ratelimit-remaining-subscription"
+
+    _limiters = {}
+
+    _limiters_lock = threading.Lock()
+
+    def __init__(self, rate: float = None, burst: int = None):
+        """
+        Creates a new ArmRateLimiter instance.
+        :param rate: The sustained calls per second. If omitted, it's read from
+        the LICDATA_IAC_ARM_RATE environment variable, defaulting to DEFAULT_RATE.
+        :type rate: float
+        :param burst: The bucket capacity. If omitted, it's read from the
+        LICDATA_IAC_ARM_BURST environment variable, defaulting to DEFAULT_BURST.
+        :type burst: int
+        """
+        super().__init__()
+        if rate is None:
+            rate = EnvironmentSetting.number(
+                "LICDATA_IAC_ARM_RATE", self.__class__.DEFAULT_RATE
+            )
+        if burst is None:
+            burst = EnvironmentSetting.integer(
+                "LICDATA_IAC_ARM_BURST", self.__class__.DEFAULT_BURST
+            )
+        self._base_rate = max(self.__class__.MIN_RATE, rate)
+        self._rate = self._base_rate
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._throttled = 0
+        self._waited_seconds = 0.0
+
+    @classmethod
+    def for_subscription(cls, subscriptionId: str) -> "ArmRateLimiter":
+        """
+        Retrieves the shared limiter of given subscription.
+        :param subscriptionId: The subscription id.
+        :type subscriptionId: str
+        :return: The limiter.
+        :rtype: org.acmsl.iac.licdata.infrastructure.azure.ArmRateLimiter
+        """
+        with cls._limiters_lock:
+            result = cls._limiters.get(subscriptionId, None)
+            if result is None:
+                result = cls()
+                cls._limiters[subscriptionId] = result
+        return result
+
+    @property
+    def rate(self) -> float:
+        """
+        Retrieves the current sustained calls per second.
+        :return: Such rate.
+        :rtype: float
+        """
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        """
+        Retrieves the bucket capacity.
+        :return: Such capacity.
+        :rtype: int
+        """
+        return self._burst
+
+    @property
+    def throttled(self) -> int:
+        """
+        Retrieves how many throttling responses were observed.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._throttled
+
+    @property
+    def waited_seconds(self) -> float:
+        """
+        Retrieves how long callers have waited for the bucket, in total.
+        :return: Such time.
+        :rtype: float
+        """
+        return self._waited_seconds
+
+    def is_throttled(self) -> bool:
+        """
+        Checks whether the limiter is still backing off: paused by a
+        Retry-After, or below its configured rate.
+        :return: True in such case.
+        :rtype: bool
+        """
+        with self._lock:
+            return self._rate < self._base_rate or self._paused_until > time.monotonic()
+
+    def concurrency_budget(self) -> int:
+        """
+        Retrieves how many calls may reasonably run concurrently, given the
+        current rate.
+        :return: Such number.
+        :rtype: int
+        """
+        return max(1, int(self._rate))
+
+    def _refill(self, now: float):
+        """
+        Adds the tokens accumulated since the last update.
+        :param now: The current monotonic time.
+        :type now: float
+        """
+        self._tokens = min(
+            float(self._burst), self._tokens + (now - self._updated_at) * self._rate
+        )
+        self._updated_at = now
+
+    def _reserve(self, cost: float) -> float:
+        """
+        Takes given tokens from the bucket, if available.
+        :param cost: The tokens.
+        :type cost: float
+        :return: 0 if taken, or how long to wait before retrying.
+        :rtype: float
+        """
+        cost = min(float(cost), float(self._burst))
+        with self._lock:
+            now = time.monotonic()
+            if self._paused_until > now:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= cost:
+                self._tokens -= cost
+                return 0.0
+            return (cost - self._tokens) / self._rate
+
+    def _waited(self, delay: float):
+        """
+        Accounts for a wait for the bucket.
+        :param delay: The seconds waited.
+        :type delay: float
+        """
+        with self._lock:
+            self._waited_seconds += delay
+
+    def acquire(self, cost: float = 1):
+        """
+        Takes given tokens from the bucket, blocking until available.
+        :param cost: The tokens.
+        :type cost: float
+        """
+        delay = self._reserve(cost)
+        while delay > 0:
+            self._waited(delay)
+            time.sleep(delay)
+            delay = self._reserve(cost)
+
+    async def acquire_async(self, cost: float = 1):
+        """
+        Takes given tokens from the bucket, waiting without blocking the loop.
+        :param cost: The tokens.
+        :type cost: float
+        """
+        delay = self._reserve(cost)
+        while delay > 0:
+            self._waited(delay)
+            await asyncio.sleep(delay)
+            delay = self._reserve(cost)
+
+    @classmethod
+    def retry_after(cls, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Reads how long ARM asks to wait, from given response headers.
+        :param headers: The response headers.
+        :type headers: Mapping[str, str]
+        :return: The seconds to wait, or None if not specified.
+        :rtype: Optional[float]
+        """
+        for name in ["retry-after-ms", "x-ms-retry-after-ms"]:
+            value = headers.get(name, None)
+            if value is not None:
+                try:
+                    return max(0.0, float(value) / 1000)
+                except ValueError:
+                    pass
+        value = headers.get("retry-after", None)
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def remaining_quota(cls, headers: Mapping[str, str]) -> Optional[int]:
+        """
+        Reads the lowest remaining subscription quota, from given response headers.
+        :param headers: The response headers.
+        :type headers: Mapping[str, str]
+        :return: The remaining calls, or None if not reported.
+        :rtype: Optional[int]
+        """
+        result = None
+        for name, value in headers.items():
+            if name.lower().startswith(cls.REMAINING_QUOTA_HEADER_PREFIX):
+                try:
+                    remaining = int(value)
+                except ValueError:
+                    continue
+                if result is None or remaining < result:
+                    result = remaining
+        return result
+
+    def observe(self, statusCode: int, headers: Mapping[str, str]):
+        """
+        Adapts the budget to an ARM response.
+        :param statusCode: The HTTP status code.
+        :type statusCode: int
+        :param headers: The response headers.
+        :type headers: Mapping[str, str]
+        """
+        retry_after = self.__class__.retry_after(headers)
+        remaining = self.__class__.remaining_quota(headers)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if statusCode == 429:
+                self._throttled += 1
+                self._rate = max(self.__class__.MIN_RATE, self._rate / 2)
+                self._tokens = 0.0
+                self.__class__.logger().warning(
+                    f"ARM throttled the subscription, slowing down to {self._rate:.1f} calls/s"
+                )
+            elif statusCode < 400 and self._rate < self._base_rate:
+                self._rate = min(self._base_rate, self._rate + self._base_rate / 20)
+            if retry_after is not None and (statusCode == 429 or statusCode == 503):
+                self._paused_until = max(self._paused_until, now + retry_after)
+            if remaining is not None and remaining < self._tokens:
+                self._tokens = float(remaining)
+
+    def stats(self) -> dict:
+        """
+        Retrieves the limiter counters.
+        :return: The current rate, tokens, throttling responses and waits.
+        :rtype: dict
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate": self._rate,
+                "tokens": self._tokens,
+                "throttled": self._throttled,
+                "waited_seconds": self._waited_seconds,
+            }
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,80 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/azure/arm_throttling.py
+
+This script defines the ArmThrottling class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .arm_rate_limiter import ArmRateLimiter
+
+
+class ArmThrottling:
+    """
+    Behavior shared by the sync and async ARM throttling policies.
+
+    Class name: ArmThrottling
+
+    Responsibilities:
+        - Hold the limiter that paces the requests.
+        - Feed each response back to the limiter.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.ArmRateLimiter
+        - org.acmsl.iac.licdata.infrastructure.azure.ArmThrottlingPolicy
+        - org.acmsl.iac.licdata.infrastructure.azure.AsyncArmThrottlingPolicy
+    """
+
+    def __init__(self, limiter: ArmRateLimiter):
+        """
+        Creates a new ArmThrottling instance.
+        :param limiter: The limiter.
+        :type limiter: org.acmsl.iac.licdata.infrastructure.azure.ArmRateLimiter
+        """
+        super().__init__()
+        self._limiter = limiter
+
+    @property
+    def limiter(self) -> ArmRateLimiter:
+        """
+        Retrieves the limiter.
+        :return: Such limiter.
+        :rtype: org.acmsl.iac.licdata.infrastructure.azure.ArmRateLimiter
+        """
+        return self._limiter
+
+    def _observed(self, response):
+        """
+        Feeds given response back to the limiter.
+        :param response: The response.
+        :type response: azure.core.pipeline.PipelineResponse
+        :return: The same response.
+        :rtype: azure.core.pipeline.PipelineResponse
+        """
+        self._limiter.observe(
+            response.http_response.status_code, response.http_response.headers
+        )
+        return response
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
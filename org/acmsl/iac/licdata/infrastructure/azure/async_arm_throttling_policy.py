@@ -0,0 +1,59 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/azure/async_arm_throttling_policy.py
+
+This script defines the AsyncArmThrottlingPolicy class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .arm_throttling import ArmThrottling
+from azure.core.pipeline.policies import AsyncHTTPPolicy
+
+
+class AsyncArmThrottlingPolicy(ArmThrottling, AsyncHTTPPolicy):
+    """
+    Paces the requests of an async Azure client with an ArmRateLimiter.
+
+    Class name: AsyncArmThrottlingPolicy
+
+    Responsibilities:
+        - Wait for the limiter before each attempt, without blocking the loop.
+        - Feed each response back to the limiter.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.ArmThrottling
+    """
+
+    async def send(self, request):
+        """
+        Sends given request, once the limiter allows it.
+        :param request: The request.
+        :type request: azure.core.pipeline.PipelineRequest
+        :return: The response.
+        :rtype: azure.core.pipeline.PipelineResponse
+        """
+        await self._limiter.acquire_async()
+        return self._observed(await self.next.send(request))
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,244 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/azure/azure_client_pool.py
+
+This script defines the AzureClientPool class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .arm_rate_limiter import ArmRateLimiter
+from .async_cached_token_credential import AsyncCachedTokenCredential
+from .cached_token_credential import CachedTokenCredential
+from pythoneda.shared import BaseObject
+import threading
+from typing import Dict, Optional
+
+
+class AzureClientPool(BaseObject):
+    """
+    Shares Azure credentials and management clients across the daemon.
+
+    Class name: AzureClientPool
+
+    Responsibilities:
+        - Keep one credential per tenant, caching its access tokens.
+        - Keep one management client per (tenant, subscription), so HTTP
+          sessions are reused.
+        - Pace the clients' requests with the limiter of their subscription.
+        - Count hits and misses, to confirm bursts don't re-authenticate.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.CachedTokenCredential
+        - org.acmsl.iac.licdata.infrastructure.azure.AsyncCachedTokenCredential
+        - org.acmsl.iac.licdata.infrastructure.azure.ArmRateLimiter
+        - azure.mgmt.resource.ResourceManagementClient
+    """
+
+    _singleton = None
+
+    def __init__(self):
+        """
+        Creates a new AzureClientPool instance.
+        """
+        super().__init__()
+        self._credentials = {}
+        self._async_credentials = {}
+        self._clients = {}
+        self._async_clients = {}
+        self._lock = threading.Lock()
+        self._client_hits = 0
+        self._client_misses = 0
+
+    @classmethod
+    def instance(cls) -> "AzureClientPool":
+        """
+        Retrieves the process-wide instance.
+        :return: Such instance.
+        :rtype: org.acmsl.iac.licdata.infrastructure.azure.AzureClientPool
+        """
+        if cls._singleton is None:
+            cls._singleton = cls()
+        return cls._singleton
+
+    def credential(self, tenantId: Optional[str] = None) -> CachedTokenCredential:
+        """
+        Retrieves the shared credential of given tenant.
+        :param tenantId: The tenant id, or None for the default one.
+        :type tenantId: Optional[str]
+        :return: The credential.
+        :rtype: org.acmsl.iac.licdata.infrastructure.azure.CachedTokenCredential
+        """
+        with self._lock:
+            result = self._credentials.get(tenantId, None)
+            if result is None:
+                from azure.identity import DefaultAzureCredential
+
+                result = CachedTokenCredential(
+                    DefaultAzureCredential(**self.__class__._tenant_kwargs(tenantId))
+                )
+                self._credentials[tenantId] = result
+        return result
+
+    def async_credential(
+        self, tenantId: Optional[str] = None
+    ) -> AsyncCachedTokenCredential:
+        """
+        Retrieves the shared async credential of given tenant.
+        :param tenantId: The tenant id, or None for the default one.
+        :type tenantId: Optional[str]
+        :return: The credential.
+        :rtype: org.acmsl.iac.licdata.infrastructure.azure.AsyncCachedTokenCredential
+        """
+        with self._lock:
+            result = self._async_credentials.get(tenantId, None)
+            if result is None:
+                from azure.identity.aio import DefaultAzureCredential
+
+                result = AsyncCachedTokenCredential(
+                    DefaultAzureCredential(**self.__class__._tenant_kwargs(tenantId))
+                )
+                self._async_credentials[tenantId] = result
+        return result
+
+    def resource_client(self, subscriptionId: str, tenantId: Optional[str] = None):
+        """
+        Retrieves the shared ResourceManagementClient of given subscription.
+        :param subscriptionId: The subscription id.
+        :type subscriptionId: str
+        :param tenantId: The tenant id, or None for the default one.
+        :type tenantId: Optional[str]
+        :return: The client.
+        :rtype: azure.mgmt.resource.ResourceManagementClient
+        """
+        key = (tenantId, subscriptionId)
+        with self._lock:
+            result = self._clients.get(key, None)
+            if result is not None:
+                self._client_hits += 1
+                return result
+            self._client_misses += 1
+        from azure.mgmt.resource import ResourceManagementClient
+        from .arm_throttling_policy import ArmThrottlingPolicy
+
+        result = ResourceManagementClient(
+            self.credential(tenantId),
+            subscriptionId,
+            per_retry_policies=[
+                ArmThrottlingPolicy(ArmRateLimiter.for_subscription(subscriptionId))
+            ],
+        )
+        with self._lock:
+            return self._clients.setdefault(key, result)
+
+    def async_resource_client(
+        self, subscriptionId: str, tenantId: Optional[str] = None
+    ):
+        """
+        Retrieves the shared async ResourceManagementClient of given subscription.
+        :param subscriptionId: The subscription id.
+        :type subscriptionId: str
+        :param tenantId: The tenant id, or None for the default one.
+        :type tenantId: Optional[str]
+        :return: The client.
+        :rtype: azure.mgmt.resource.aio.ResourceManagementClient
+        """
+        key = (tenantId, subscriptionId)
+        with self._lock:
+            result = self._async_clients.get(key, None)
+            if result is not None:
+                self._client_hits += 1
+                return result
+            self._client_misses += 1
+        from azure.mgmt.resource.aio import ResourceManagementClient
+        from .async_arm_throttling_policy import AsyncArmThrottlingPolicy
+
+        result = ResourceManagementClient(
+            self.async_credential(tenantId),
+            subscriptionId,
+            per_retry_policies=[
+                AsyncArmThrottlingPolicy(
+                    ArmRateLimiter.for_subscription(subscriptionId)
+                )
+            ],
+        )
+        with self._lock:
+            return self._async_clients.setdefault(key, result)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retrieves the hit and miss counters.
+        :return: The client and token hits and misses.
+        :rtype: Dict[str, int]
+        """
+        with self._lock:
+            credentials = list(self._credentials.values()) + list(
+                self._async_credentials.values()
+            )
+            return {
+                "client_hits": self._client_hits,
+                "client_misses": self._client_misses,
+                "token_hits": sum(credential.hits for credential in credentials),
+                "token_misses": sum(credential.misses for credential in credentials),
+            }
+
+    async def close(self):
+        """
+        Closes every pooled client and credential.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            async_clients = list(self._async_clients.values())
+            credentials = list(self._credentials.values())
+            async_credentials = list(self._async_credentials.values())
+            self._clients.clear()
+            self._async_clients.clear()
+            self._credentials.clear()
+            self._async_credentials.clear()
+        for client in clients:
+            client.close()
+        for client in async_clients:
+            await client.close()
+        for credential in credentials:
+            credential.close()
+        for credential in async_credentials:
+            await credential.close()
+
+    @classmethod
+    def _tenant_kwargs(cls, tenantId: Optional[str]) -> Dict:
+        """
+        Builds the DefaultAzureCredential arguments for given tenant.
+        :param tenantId: The tenant id, or None for the default one.
+        :type tenantId: Optional[str]
+        :return: The arguments.
+        :rtype: Dict
+        """
+        if tenantId is None:
+            return {}
+        return {
+            "shared_cache_tenant_id": tenantId,
+            "visual_studio_code_tenant_id": tenantId,
+            "additionally_allowed_tenants": [tenantId],
+        }
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
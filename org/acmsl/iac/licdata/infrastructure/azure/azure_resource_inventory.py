@@ -0,0 +1,197 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/azure/azure_resource_inventory.py
+
+This script defines the AzureResourceInventory class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import bisect
+from org.acmsl.iac.licdata.infrastructure import EnvironmentSetting
+from pythoneda.shared import BaseObject
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class AzureResourceInventory(BaseObject):
+    """
+    Caches the resources of Azure resource groups, indexed for prefix lookups.
+
+    Class name: AzureResourceInventory
+
+    Responsibilities:
+        - List each resource group once, and answer lookups from memory.
+        - Index the resources by type, with names sorted for prefix searches.
+        - Expire listings after a TTL, or when our own operations change them.
+
+    Collaborators:
+        - azure.mgmt.resource.ResourceManagementClient: Provides the listings.
+    """
+
+    DEFAULT_TTL = 5 * 60
+
+    _singleton = None
+
+    def __init__(self, ttl: float = None):
+        """
+        Creates a new AzureResourceInventory instance.
+        :param ttl: How long (in seconds) a listing is trusted. Defaults to
+        LICDATA_IAC_RESOURCE_INVENTORY_TTL, or DEFAULT_TTL.
+        :type ttl: float
+        """
+        super().__init__()
+        if ttl is None:
+            ttl = EnvironmentSetting.number(
+                "LICDATA_IAC_RESOURCE_INVENTORY_TTL", self.__class__.DEFAULT_TTL
+            )
+        self._ttl = ttl
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "AzureResourceInventory":
+        """
+        Retrieves the process-wide instance.
+        :return: Such instance.
+        :rtype: org.acmsl.iac.licdata.infrastructure.azure.AzureResourceInventory
+        """
+        if cls._singleton is None:
+            cls._singleton = cls()
+        return cls._singleton
+
+    def is_fresh(self, subscriptionId: str, resourceGroupName: str) -> bool:
+        """
+        Checks whether there's a listing of given resource group within the TTL.
+        :param subscriptionId: The subscription id.
+        :type subscriptionId: str
+        :param resourceGroupName: The name of the resource group.
+        :type resourceGroupName: str
+        :return: True in such case.
+        :rtype: bool
+        """
+        return self._fresh_group(subscriptionId, resourceGroupName) is not None
+
+    def store(
+        self, subscriptionId: str, resourceGroupName: str, resources: Iterable[Any]
+    ) -> Dict:
+        """
+        Replaces the listing of given resource group.
+        :param subscriptionId: The subscription id.
+        :type subscriptionId: str
+        :param resourceGroupName: The name of the resource group.
+        :type resourceGroupName: str
+        :param resources: The resources, as returned by the management SDK.
+        :type resources: Iterable[azure.mgmt.resource.resources.models.GenericResourceExpanded]
+        :return: The new listing.
+        :rtype: Dict
+        """
+        index = {}
+        for resource in resources:
+            names, by_name = index.setdefault(resource.type.lower(), ([], {}))
+            if resource.name not in by_name:
+                names.append(resource.name)
+            by_name[resource.name] = resource
+        for names, _ in index.values():
+            names.sort()
+        result = {"loaded_at": time.monotonic(), "index": index}
+        with self._lock:
+            self._groups[(subscriptionId, resourceGroupName.lower())] = result
+        return result
+
+    def find(
+        self,
+        subscriptionId: str,
+        resourceGroupName: str,
+        namePrefix: str,
+        resourceType: str,
+        lister: Callable[[], Iterable[Any]] = None,
+    ) -> Optional[Any]:
+        """
+        Finds the first resource (in name order) of given type whose name
+        starts with given prefix. It's sync-only: without a fresh listing, it
+        calls the lister, blocking the calling thread, so async callers must
+        run it in an executor.
+        :param subscriptionId: The subscription id.
+        :type subscriptionId: str
+        :param resourceGroupName: The name of the resource group.
+        :type resourceGroupName: str
+        :param namePrefix: The name prefix.
+        :type namePrefix: str
+        :param resourceType: The resource type, i.e. "Microsoft.Web/sites".
+        :type resourceType: str
+        :param lister: Lists the resource group when there's no fresh listing.
+        If omitted, an unknown resource group yields None.
+        :type lister: Callable[[], Iterable[Any]]
+        :return: The resource, or None if not found.
+        :rtype: Optional[Any]
+        """
+        group = self._fresh_group(subscriptionId, resourceGroupName)
+        if group is None:
+            if lister is None:
+                return None
+            # a TTL of 0 expires the listing right away, so use it as stored
+            group = self.store(subscriptionId, resourceGroupName, lister())
+        names, by_name = group["index"].get(resourceType.lower(), ([], {}))
+        position = bisect.bisect_left(names, namePrefix)
+        if position < len(names) and names[position].startswith(namePrefix):
+            return by_name[names[position]]
+        return None
+
+    def invalidate(self, subscriptionId: str = None, resourceGroupName: str = None):
+        """
+        Forgets the listings of given subscription and resource group.
+        :param subscriptionId: The subscription id. If omitted, all subscriptions.
+        :type subscriptionId: str
+        :param resourceGroupName: The resource group. If omitted, all of them.
+        :type resourceGroupName: str
+        """
+        with self._lock:
+            for key in list(self._groups.keys()):
+                if (subscriptionId is None or key[0] == subscriptionId) and (
+                    resourceGroupName is None or key[1] == resourceGroupName.lower()
+                ):
+                    del self._groups[key]
+
+    def _fresh_group(
+        self, subscriptionId: str, resourceGroupName: str
+    ) -> Optional[Dict]:
+        """
+        Retrieves the listing of given resource group, if within the TTL.
+        :param subscriptionId: The subscription id.
+        :type subscriptionId: str
+        :param resourceGroupName: The name of the resource group.
+        :type resourceGroupName: str
+        :return: The listing, or None.
+        :rtype: Optional[Dict]
+        """
+        key = (subscriptionId, resourceGroupName.lower())
+        with self._lock:
+            group = self._groups.get(key, None)
+            if group is not None and time.monotonic() - group["loaded_at"] > self._ttl:
+                del self._groups[key]
+                group = None
+        return group
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
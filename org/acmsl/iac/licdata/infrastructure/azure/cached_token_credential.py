@@ -0,0 +1,70 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/azure/cached_token_credential.py
+
+This script defines the CachedTokenCredential class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .token_credential_cache import TokenCredentialCache
+
+
+class CachedTokenCredential(TokenCredentialCache):
+    """
+    A token credential that reuses access tokens until shortly before they expire.
+
+    Class name: CachedTokenCredential
+
+    Responsibilities:
+        - Serve access tokens to the synchronous Azure clients.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.TokenCredentialCache
+        - azure.core.credentials.TokenCredential: The wrapped credential.
+    """
+
+    def get_token(self, *scopes, **kwargs):
+        """
+        Retrieves an access token, from the cache if possible.
+        :param scopes: The requested scopes.
+        :type scopes: tuple
+        :param kwargs: The other token request parameters.
+        :type kwargs: dict
+        :return: The token.
+        :rtype: azure.core.credentials.AccessToken
+        """
+        key = self.__class__.cache_key(scopes, kwargs)
+        result = self.cached_token(key)
+        if result is None:
+            result = self._credential.get_token(*scopes, **kwargs)
+            self.cache_token(key, result)
+        return result
+
+    def close(self):
+        """
+        Closes the wrapped credential.
+        """
+        self._credential.close()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,175 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/azure/docker_stack_prewarmer.py
+
+This script defines the DockerStackPrewarmer class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+from .docker_stack_refresh import DockerStackRefresh
+from .foundation_stack_reference import FoundationStackReference
+from org.acmsl.iac.licdata.infrastructure import (
+    EnvironmentSetting,
+    EventMetadata,
+    StackOperationScheduler,
+)
+from pythoneda.shared import BaseObject
+from pythoneda.shared.iac.events import DockerImageDetailsRequested
+import time
+from typing import Dict, Optional
+
+
+class DockerStackPrewarmer(BaseObject):
+    """
+    Gets the Docker-layer stack ready while the Docker image is being built.
+
+    Class name: DockerStackPrewarmer
+
+    Responsibilities:
+        - Select the stack, load the plugins and refresh the stack as soon as
+          the image is requested.
+        - Let the Docker resources update skip its own refresh, if the
+          pre-warmed state is still recent enough.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.RequestAzureDockerImageDetails
+        - org.acmsl.iac.licdata.infrastructure.azure.UpdateAzureDockerResourcesWithPulumi
+        - org.acmsl.iac.licdata.infrastructure.azure.DockerStackRefresh
+        - org.acmsl.iac.licdata.infrastructure.StackOperationScheduler
+    """
+
+    DEFAULT_MAX_AGE = 10 * 60
+
+    _singleton = None
+
+    def __init__(self, maxAge: float = None):
+        """
+        Creates a new DockerStackPrewarmer instance.
+        :param maxAge: How long (in seconds) a pre-warmed stack remains usable.
+        If omitted, it's read from the LICDATA_IAC_PREWARM_MAX_AGE environment
+        variable, defaulting to DEFAULT_MAX_AGE.
+        :type maxAge: float
+        """
+        super().__init__()
+        if maxAge is None:
+            maxAge = EnvironmentSetting.number(
+                "LICDATA_IAC_PREWARM_MAX_AGE", self.__class__.DEFAULT_MAX_AGE
+            )
+        self._max_age = maxAge
+        self._prewarms = {}
+
+    @classmethod
+    def instance(cls) -> "DockerStackPrewarmer":
+        """
+        Retrieves the process-wide instance.
+        :return: Such instance.
+        :rtype: org.acmsl.iac.licdata.infrastructure.azure.DockerStackPrewarmer
+        """
+        if cls._singleton is None:
+            cls._singleton = cls()
+        return cls._singleton
+
+    @classmethod
+    def docker_stack_name(cls, stackName: str, metadata: Dict) -> str:
+        """
+        Retrieves the name of the stack holding the Docker resources.
+        :param stackName: The name of the stack of the request.
+        :type stackName: str
+        :param metadata: The metadata of the request.
+        :type metadata: Dict
+        :return: The app stack in layered mode, the stack of the request otherwise.
+        :rtype: str
+        """
+        if EventMetadata.flag(metadata, "layered"):
+            return FoundationStackReference.app_stack_name(stackName)
+        return stackName
+
+    def prewarm(self, event: DockerImageDetailsRequested):
+        """
+        Starts pre-warming the Docker-layer stack of given request in the background.
+        :param event: The request of the Docker image.
+        :type event: pythoneda.shared.iac.events.DockerImageDetailsRequested
+        """
+        stack_name = self.__class__.docker_stack_name(event.stack_name, event.metadata)
+        key = (event.project_name, stack_name)
+        previous = self._prewarms.get(key, None)
+        if previous is not None and not previous.done():
+            return
+        self._prewarms[key] = asyncio.ensure_future(
+            StackOperationScheduler.instance().run(
+                key,
+                StackOperationScheduler.UPDATE,
+                lambda: self._prewarm(DockerStackRefresh(event, stack_name)),
+            )
+        )
+
+    def claim(self, projectName: str, stackName: str) -> bool:
+        """
+        Takes the pre-warmed state of given stack, which is discarded afterwards.
+        A pre-warm still waiting for its turn is cancelled: the caller holds
+        the stack already, and will refresh it itself.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the Pulumi stack.
+        :type stackName: str
+        :return: True if the stack got refreshed recently enough.
+        :rtype: bool
+        """
+        prewarm = self._prewarms.pop((projectName, stackName), None)
+        if prewarm is None:
+            return False
+        if not prewarm.done():
+            prewarm.cancel()
+            return False
+        if prewarm.cancelled() or prewarm.exception() is not None:
+            return False
+        refreshed_at = prewarm.result()
+        if refreshed_at is None:
+            return False
+        age = time.time() - refreshed_at
+        if age > self._max_age:
+            self.__class__.logger().info(
+                f"Discarding pre-warmed {projectName}/{stackName}: refreshed {age:.0f}s ago"
+            )
+            return False
+        return True
+
+    async def _prewarm(self, refresh: DockerStackRefresh) -> Optional[float]:
+        """
+        Selects the stack, loads the plugins and refreshes the stack.
+        :param refresh: The refresh of the stack.
+        :type refresh: org.acmsl.iac.licdata.infrastructure.azure.DockerStackRefresh
+        :return: When the stack was last refreshed, or None if it never was
+        or the refresh failed.
+        :rtype: Optional[float]
+        """
+        result = await refresh.perform()
+        if result is not None:
+            self.__class__.logger().info(
+                f"Pre-warmed {refresh.event.project_name}/{refresh.pulumi_stack_name}"
+            )
+        return result
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
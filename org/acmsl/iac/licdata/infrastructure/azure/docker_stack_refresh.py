@@ -0,0 +1,115 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/azure/docker_stack_refresh.py
+
+This script defines the DockerStackRefresh class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .arm_paced_stack_operation import ArmPacedStackOperation
+from org.acmsl.iac.licdata.infrastructure import (
+    PulumiRefreshJournal,
+    PulumiStackOperation,
+)
+from pulumi.automation.errors import CommandError
+from pythoneda.shared import BaseObject
+from pythoneda.shared.iac.events import DockerImageDetailsRequested
+from typing import Optional
+
+
+class DockerStackRefresh(ArmPacedStackOperation, PulumiStackOperation, BaseObject):
+    """
+    Refreshes the Docker-layer stack ahead of the Docker resources update.
+
+    Class name: DockerStackRefresh
+
+    Responsibilities:
+        - Select and refresh the stack the way the update would: following
+          the refresh policy, the per-step parallelism and the ARM pacing.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.DockerStackPrewarmer
+        - org.acmsl.iac.licdata.infrastructure.azure.ArmPacedStackOperation
+        - org.acmsl.iac.licdata.infrastructure.PulumiStackOperation
+    """
+
+    def __init__(self, event: DockerImageDetailsRequested, stackName: str):
+        """
+        Creates a new DockerStackRefresh instance.
+        :param event: The request of the Docker image.
+        :type event: pythoneda.shared.iac.events.DockerImageDetailsRequested
+        :param stackName: The name of the stack holding the Docker resources.
+        :type stackName: str
+        """
+        super().__init__()
+        self._event = event
+        self._stack_name = stackName
+
+    @property
+    def event(self) -> DockerImageDetailsRequested:
+        """
+        Retrieves the request of the Docker image.
+        :return: Such request.
+        :rtype: pythoneda.shared.iac.events.DockerImageDetailsRequested
+        """
+        return self._event
+
+    @property
+    def pulumi_stack_name(self) -> str:
+        """
+        Retrieves the name of the stack holding the Docker resources.
+        :return: Such name.
+        :rtype: str
+        """
+        return self._stack_name
+
+    async def perform(self) -> Optional[float]:
+        """
+        Selects the stack, loads the plugins and refreshes the stack, unless
+        the refresh policy says it's not needed.
+        :return: When the stack was last refreshed, or None if it never was
+        or the refresh failed.
+        :rtype: Optional[float]
+        """
+
+        def do_nothing():
+            pass
+
+        try:
+            stack = await self._select_stack(do_nothing)
+            try:
+                await self._refresh_if_needed(stack)
+            finally:
+                self._release_stack()
+        except CommandError as e:
+            self.__class__.logger().warning(
+                f"Could not pre-warm {self.event.project_name}/{self.pulumi_stack_name}: {e}"
+            )
+            self._operation_failed(e)
+            return None
+        return PulumiRefreshJournal.instance().last_refresh(
+            self.event.project_name, self.pulumi_stack_name
+        )
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
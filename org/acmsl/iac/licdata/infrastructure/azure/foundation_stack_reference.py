@@ -0,0 +1,184 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/azure/foundation_stack_reference.py
+
+This script defines the FoundationStackReference class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pulumi
+from pythoneda.shared import BaseObject
+from typing import Dict
+
+
+class FoundationStackReference(BaseObject):
+    """
+    The foundation resources of Licdata, as seen from the app stack.
+
+    Class name: FoundationStackReference
+
+    Responsibilities:
+        - Export the ids of the foundation resources from the foundation stack.
+        - Read them back in the app stack, through a stack reference, as
+          resources the app stack doesn't manage.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.UpdateAzureInfrastructureWithPulumi
+        - org.acmsl.iac.licdata.infrastructure.azure.UpdateAzureDockerResourcesWithPulumi
+        - org.acmsl.iac.licdata.infrastructure.azure.RemoveAzureInfrastructureWithPulumi
+
+    Stacks deployed before switching to the layered mode hold the WebApp
+    and the Docker pull role definition and assignment in the foundation
+    stack. Move them to the app stack before the first layered update, so
+    it doesn't try to create them again:
+        pulumi state move --source <stack> --dest <stack>-app <urn>...
+    with the URNs listed by "pulumi stack --stack <stack> --show-urns".
+    Run a layered update of the foundation stack afterwards, to export the
+    ids the app stack reads.
+    """
+
+    APP_STACK_SUFFIX = "-app"
+
+    OUTPUTS = {
+        "resource_group": "foundation_resource_group_id",
+        "function_storage_account": "foundation_function_storage_account_id",
+        "app_service_plan": "foundation_app_service_plan_id",
+        "app_insights": "foundation_app_insights_id",
+        "container_registry": "foundation_container_registry_id",
+    }
+
+    def __init__(self, stackName: str, projectName: str, referenceName: str = None):
+        """
+        Creates a new FoundationStackReference instance.
+        :param stackName: The name of the foundation stack.
+        :type stackName: str
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param referenceName: The fully-qualified name of the foundation stack.
+        Defaults to <organization>/<projectName>/<stackName>.
+        :type referenceName: str
+        """
+        super().__init__()
+        if referenceName is None:
+            referenceName = f"{pulumi.get_organization()}/{projectName}/{stackName}"
+        self._stack_reference = pulumi.StackReference(referenceName)
+        self._resources = self.__class__._read(self._stack_reference)
+
+    @classmethod
+    def app_stack_name(cls, stackName: str) -> str:
+        """
+        Builds the name of the app stack of given foundation stack.
+        :param stackName: The name of the foundation stack.
+        :type stackName: str
+        :return: The name of the app stack.
+        :rtype: str
+        """
+        return f"{stackName}{cls.APP_STACK_SUFFIX}"
+
+    @classmethod
+    def export(cls, infrastructure):
+        """
+        Exports the ids of the foundation resources. It's meant to be called
+        from the program of the foundation stack.
+        :param infrastructure: The operation that declared the foundation.
+        :type infrastructure: org.acmsl.iac.licdata.infrastructure.azure.UpdateAzureInfrastructureWithPulumi
+        """
+        for attribute, output in cls.OUTPUTS.items():
+            pulumi.export(output, getattr(infrastructure, attribute).id)
+
+    @classmethod
+    def _read(cls, stackReference: pulumi.StackReference) -> Dict:
+        """
+        Reads the foundation resources through given stack reference.
+        :param stackReference: The reference to the foundation stack.
+        :type stackReference: pulumi.StackReference
+        :return: The resources, per attribute.
+        :rtype: Dict
+        """
+        import pulumi_azure_native.containerregistry as acr
+        import pulumi_azure_native.insights as insights
+        import pulumi_azure_native.resources as resources
+        import pulumi_azure_native.storage as storage
+        import pulumi_azure_native.web as web
+
+        resource_types = {
+            "resource_group": resources.ResourceGroup,
+            "function_storage_account": storage.StorageAccount,
+            "app_service_plan": web.AppServicePlan,
+            "app_insights": insights.Component,
+            "container_registry": acr.Registry,
+        }
+        return {
+            attribute: resource_types[attribute].get(
+                output, stackReference.require_output(output)
+            )
+            for attribute, output in cls.OUTPUTS.items()
+        }
+
+    @property
+    def resource_group(self):
+        """
+        Retrieves the Resource Group.
+        :return: Such Resource Group.
+        :rtype: pulumi_azure_native.resources.ResourceGroup
+        """
+        return self._resources["resource_group"]
+
+    @property
+    def function_storage_account(self):
+        """
+        Retrieves the Function Storage Account.
+        :return: Such Storage Account.
+        :rtype: pulumi_azure_native.storage.StorageAccount
+        """
+        return self._resources["function_storage_account"]
+
+    @property
+    def app_service_plan(self):
+        """
+        Retrieves the App Service Plan.
+        :return: Such App Service Plan.
+        :rtype: pulumi_azure_native.web.AppServicePlan
+        """
+        return self._resources["app_service_plan"]
+
+    @property
+    def app_insights(self):
+        """
+        Retrieves the App Insights instance.
+        :return: Such instance.
+        :rtype: pulumi_azure_native.insights.Component
+        """
+        return self._resources["app_insights"]
+
+    @property
+    def container_registry(self):
+        """
+        Retrieves the Container Registry.
+        :return: Such Container Registry.
+        :rtype: pulumi_azure_native.containerregistry.Registry
+        """
+        return self._resources["container_registry"]
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -19,6 +19,8 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from .functions_package import FunctionsPackage
+from org.acmsl.iac.licdata.infrastructure import PackageDigest
 import pulumi
 import pulumi_azure_native
 from pythoneda.shared.iac.pulumi.azure import (
@@ -26,6 +28,7 @@ from pythoneda.shared.iac.pulumi.azure import (
     WebApp,
     WebAppDeploymentSlot,
 )
+from typing import Optional
 
 
 class FunctionsDeploymentSlot(WebAppDeploymentSlot):
@@ -36,6 +39,7 @@ class FunctionsDeploymentSlot(WebAppDeploymentSlot):
 
     Responsibilities:
         - Deployment slots for Licdata functions.
+        - Deploy the same package the FunctionsPackage uploaded.
 
     Collaborators:
         - None
@@ -45,6 +49,7 @@ class FunctionsDeploymentSlot(WebAppDeploymentSlot):
         self,
         webApp: WebApp,
         resourceGroup: ResourceGroup,
+        functionsPackage: FunctionsPackage = None,
     ):
         """
         Creates a new FunctionsDeploymentSlot instance.
@@ -52,8 +57,28 @@ class FunctionsDeploymentSlot(WebAppDeploymentSlot):
         :type webApp: pythoneda.iac.pulumi.azure.WebApp
         :param resourceGroup: The ResourceGroup.
         :type resourceGroup: pythoneda.iac.pulumi.azure.ResourceGroup
+        :param functionsPackage: The uploaded functions package, if any.
+        :type functionsPackage: org.acmsl.iac.licdata.infrastructure.azure.FunctionsPackage
         """
-        super().__init__("license_functions", "./rest.zip", webApp, resourceGroup)
+        self._package_path = (
+            functionsPackage.package_path
+            if functionsPackage is not None
+            else "./rest.zip"
+        )
+        super().__init__("license_functions", self._package_path, webApp, resourceGroup)
+
+    @property
+    def package_digest(self) -> Optional[str]:
+        """
+        Retrieves the SHA-256 of the deployed functions package. It's computed
+        on first use.
+        :return: Such digest, as a hex string, or None if the package is missing.
+        :rtype: Optional[str]
+        """
+        try:
+            return PackageDigest.sha256(self._package_path)
+        except FileNotFoundError:
+            return None
 
     # @override
     def _resource_name(self, stackName: str, projectName: str, location: str) -> str:
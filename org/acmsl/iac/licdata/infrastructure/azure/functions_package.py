@@ -19,12 +19,16 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from org.acmsl.iac.licdata.infrastructure import PackageDigest
+import os
+import pulumi
 from pythoneda.shared.iac.pulumi.azure import (
     Blob,
     BlobContainer,
     StorageAccount,
     ResourceGroup,
 )
+from typing import Optional
 
 
 class FunctionsPackage(Blob):
@@ -35,6 +39,8 @@ class FunctionsPackage(Blob):
 
     Responsibilities:
         - Package Licdata functions for Azure.
+        - Name the blob after the package content, so the blob only changes
+          when the content of the package does.
 
     Collaborators:
         - None
@@ -45,6 +51,7 @@ class FunctionsPackage(Blob):
         blobContainer: BlobContainer,
         storageAccount: StorageAccount,
         resourceGroup: ResourceGroup,
+        packagePath: str = "./rest.zip",
     ):
         """
         Creates a new FunctionsPackage instance.
@@ -54,15 +61,55 @@ class FunctionsPackage(Blob):
         :type storageAccount: pythoneda.iac.pulumi..azure.StorageAccount
         :param resourceGroup: The ResourceGroup.
         :type resourceGroup: pythoneda.iac.pulumi.azure.ResourceGroup
+        :param packagePath: The path of the functions package.
+        :type packagePath: str
         """
+        self._package_path = packagePath
         super().__init__(
-            "rest.zip",
-            pulumi.FileAsset("./rest.zip"),
+            self.__class__.blob_name(packagePath),
+            pulumi.FileAsset(packagePath),
             blobContainer,
             storageAccount,
             resourceGroup,
         )
 
+    @classmethod
+    def blob_name(cls, packagePath: str) -> str:
+        """
+        Builds the name of the blob of given package.
+        :param packagePath: The path of the functions package.
+        :type packagePath: str
+        :return: The content-addressed name, or the plain file name if the
+        package is missing, so Pulumi reports the missing asset itself.
+        :rtype: str
+        """
+        try:
+            return PackageDigest.content_addressed_name(packagePath)
+        except FileNotFoundError:
+            return os.path.basename(packagePath)
+
+    @property
+    def package_path(self) -> str:
+        """
+        Retrieves the path of the functions package.
+        :return: Such path.
+        :rtype: str
+        """
+        return self._package_path
+
+    @property
+    def digest(self) -> str:
+        """
+        Retrieves the SHA-256 of the functions package. PackageDigest cached
+        it when naming the blob, so the package is not hashed again.
+        :return: Such digest, as a hex string, or None if the package is missing.
+        :rtype: Optional[str]
+        """
+        try:
+            return PackageDigest.sha256(self._package_path)
+        except FileNotFoundError:
+            return None
+
     # @override
     def _resource_name(self, stackName: str, projectName: str, location: str) -> str:
         """
@@ -0,0 +1,227 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/azure/functions_package_uploader.py
+
+This script defines the FunctionsPackageUploader class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import base64
+from concurrent.futures import ThreadPoolExecutor
+import mmap
+import os
+from org.acmsl.iac.licdata.infrastructure import EnvironmentSetting, PackageDigest
+from pythoneda.shared import BaseObject
+
+
+class FunctionsPackageUploader(BaseObject):
+    """
+    Uploads large functions packages to blob storage, block by block.
+
+    Class name: FunctionsPackageUploader
+
+    Responsibilities:
+        - Split the package into blocks and stage them concurrently.
+        - Memory-map the package, so blocks are sent without extra copies.
+        - Skip the upload when the blob already holds the same content.
+
+    Collaborators:
+        - azure.storage.blob.BlobClient: The target blob.
+        - org.acmsl.iac.licdata.infrastructure.PackageDigest
+    """
+
+    DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, blobClient, blockSize: int = None, maxWorkers: int = None):
+        """
+        Creates a new FunctionsPackageUploader instance.
+        :param blobClient: The client of the target blob.
+        :type blobClient: azure.storage.blob.BlobClient
+        :param blockSize: The size of each block, in bytes.
+        :type blockSize: int
+        :param maxWorkers: How many blocks to upload concurrently. Defaults to
+        LICDATA_IAC_UPLOAD_WORKERS, or DEFAULT_MAX_WORKERS.
+        :type maxWorkers: int
+        """
+        super().__init__()
+        self._blob_client = blobClient
+        self._block_size = blockSize or self.__class__.DEFAULT_BLOCK_SIZE
+        if maxWorkers is None:
+            maxWorkers = EnvironmentSetting.integer(
+                "LICDATA_IAC_UPLOAD_WORKERS", self.__class__.DEFAULT_MAX_WORKERS
+            )
+        self._max_workers = max(1, maxWorkers)
+
+    @classmethod
+    def for_blob(
+        cls,
+        accountUrl: str,
+        containerName: str,
+        blobName: str,
+        credential=None,
+        **kwargs,
+    ) -> "FunctionsPackageUploader":
+        """
+        Creates an uploader for given blob.
+        :param accountUrl: The URL of the storage account.
+        :type accountUrl: str
+        :param containerName: The name of the container.
+        :type containerName: str
+        :param blobName: The name of the blob.
+        :type blobName: str
+        :param credential: The credential. Defaults to the shared one of AzureClientPool.
+        :type credential: azure.core.credentials.TokenCredential
+        :param kwargs: Additional uploader parameters.
+        :type kwargs: dict
+        :return: The uploader.
+        :rtype: org.acmsl.iac.licdata.infrastructure.azure.FunctionsPackageUploader
+        """
+        from azure.storage.blob import BlobClient
+
+        if credential is None:
+            from .azure_client_pool import AzureClientPool
+
+            credential = AzureClientPool.instance().credential()
+        return cls(
+            BlobClient(accountUrl, containerName, blobName, credential=credential),
+            **kwargs,
+        )
+
+    @classmethod
+    def for_connection_string(
+        cls, connectionString: str, containerName: str, blobName: str, **kwargs
+    ) -> "FunctionsPackageUploader":
+        """
+        Creates an uploader for given blob, using a connection string, i.e.
+        the one of a local Azurite emulator.
+        :param connectionString: The connection string.
+        :type connectionString: str
+        :param containerName: The name of the container.
+        :type containerName: str
+        :param blobName: The name of the blob.
+        :type blobName: str
+        :param kwargs: Additional uploader parameters.
+        :type kwargs: dict
+        :return: The uploader.
+        :rtype: org.acmsl.iac.licdata.infrastructure.azure.FunctionsPackageUploader
+        """
+        from azure.storage.blob import BlobClient
+
+        return cls(
+            BlobClient.from_connection_string(
+                connectionString, containerName, blobName
+            ),
+            **kwargs,
+        )
+
+    def upload(self, path: str) -> bool:
+        """
+        Uploads the package, unless the blob already has the same content.
+        This call blocks.
+        :param path: The path of the package.
+        :type path: str
+        :return: False if the upload was skipped.
+        :rtype: bool
+        """
+        from azure.core.exceptions import ResourceNotFoundError
+        from azure.storage.blob import BlobBlock
+
+        digest = PackageDigest.sha256(path)
+        try:
+            properties = self._blob_client.get_blob_properties()
+            if (properties.metadata or {}).get("sha256", None) == digest:
+                self.__class__.logger().info(
+                    f"{self._blob_client.blob_name} is up to date ({digest}), skipping upload"
+                )
+                return False
+        except ResourceNotFoundError:
+            pass
+
+        size = os.path.getsize(path)
+        if size <= self._block_size:
+            with open(path, "rb") as file:
+                self._blob_client.upload_blob(
+                    file, length=size, overwrite=True, metadata={"sha256": digest}
+                )
+            return True
+
+        with open(path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            view = memoryview(mapped)
+            try:
+                block_ids = self._stage_blocks(view, size)
+            finally:
+                view.release()
+        self._blob_client.commit_block_list(
+            [BlobBlock(block_id=block_id) for block_id in block_ids],
+            metadata={"sha256": digest},
+        )
+        return True
+
+    def _stage_blocks(self, view: memoryview, size: int) -> list:
+        """
+        Stages the blocks of the package concurrently.
+        :param view: The memory-mapped package.
+        :type view: memoryview
+        :param size: The size of the package.
+        :type size: int
+        :return: The ids of the staged blocks, in order.
+        :rtype: list
+        """
+        block_ids = []
+        chunks = []
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="block-upload"
+            ) as pool:
+                futures = []
+                for index, offset in enumerate(range(0, size, self._block_size)):
+                    block_id = base64.b64encode(f"{index:08d}".encode()).decode()
+                    block_ids.append(block_id)
+                    chunk = view[offset : offset + self._block_size]
+                    chunks.append(chunk)
+                    futures.append(
+                        pool.submit(
+                            self._blob_client.stage_block,
+                            block_id,
+                            chunk,
+                            length=len(chunk),
+                        )
+                    )
+                try:
+                    for future in futures:
+                        future.result()
+                finally:
+                    for future in futures:
+                        future.cancel()
+        finally:
+            # the map can't be closed while slices of it are still around
+            for chunk in chunks:
+                chunk.release()
+        return block_ids
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
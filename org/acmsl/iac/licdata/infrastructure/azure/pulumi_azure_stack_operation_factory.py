@@ -19,6 +19,10 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from org.acmsl.iac.licdata.infrastructure import (
+    StackOperationCoalescer,
+    StackOperationScheduler,
+)
 from pythoneda.shared.artifact.events import DockerImageRequested
 from pythoneda.shared.iac import (
     StackOperationFactory,
@@ -36,10 +40,6 @@ from pythoneda.shared.iac.events import (
 )
 from typing import Dict, Union
 from .request_azure_docker_image_details import RequestAzureDockerImageDetails
-from .update_azure_docker_resources_with_pulumi import (
-    UpdateAzureDockerResourcesWithPulumi,
-)
-from .update_azure_infrastructure_with_pulumi import UpdateAzureInfrastructureWithPulumi
 
 
 class PulumiAzureStackOperationFactory(StackOperationFactory):
@@ -50,9 +50,13 @@ class PulumiAzureStackOperationFactory(StackOperationFactory):
 
     Responsibilities:
         - Create PulumiAzureStack instances.
+        - Make redundant update requests for the same stack merge.
+        - Make the operations on each stack run one at a time.
 
     Collaborators:
         - org.acmsl.licdata.infrastructure.azure.PulumiAzureStack
+        - org.acmsl.iac.licdata.infrastructure.StackOperationCoalescer
+        - org.acmsl.iac.licdata.infrastructure.StackOperationScheduler
     """
 
     def __init__(self):
@@ -97,9 +101,28 @@ class PulumiAzureStackOperationFactory(StackOperationFactory):
         if isinstance(event, DockerImageDetailsRequested):
             result = RequestAzureDockerImageDetails(event)
         elif isinstance(event, DockerResourcesUpdateRequested):
+            from .update_azure_docker_resources_with_pulumi import (
+                UpdateAzureDockerResourcesWithPulumi,
+            )
+
             result = UpdateAzureDockerResourcesWithPulumi(event)
+            result.coalesce_with(StackOperationCoalescer.instance())
+            result.schedule_with(StackOperationScheduler.instance())
         elif isinstance(event, InfrastructureUpdateRequested):
+            from .update_azure_infrastructure_with_pulumi import (
+                UpdateAzureInfrastructureWithPulumi,
+            )
+
             result = UpdateAzureInfrastructureWithPulumi(event)
+            result.coalesce_with(StackOperationCoalescer.instance())
+            result.schedule_with(StackOperationScheduler.instance())
+        elif isinstance(event, InfrastructureRemovalRequested):
+            from .remove_azure_infrastructure_with_pulumi import (
+                RemoveAzureInfrastructureWithPulumi,
+            )
+
+            result = RemoveAzureInfrastructureWithPulumi(event)
+            result.schedule_with(StackOperationScheduler.instance())
 
         return result
 
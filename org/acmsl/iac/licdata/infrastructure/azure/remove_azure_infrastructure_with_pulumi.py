@@ -0,0 +1,74 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/azure/remove_azure_infrastructure_with_pulumi.py
+
+This script defines the RemoveAzureInfrastructureWithPulumi class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .arm_paced_stack_operation import ArmPacedStackOperation
+from .foundation_stack_reference import FoundationStackReference
+from org.acmsl.iac.licdata.infrastructure import RemoveInfrastructureWithPulumi
+from pythoneda.shared.iac.events import InfrastructureRemovalRequested
+from typing import List
+
+
+class RemoveAzureInfrastructureWithPulumi(
+    ArmPacedStackOperation, RemoveInfrastructureWithPulumi
+):
+    """
+    Azure-specific Pulumi implementation to remove Licdata infrastructure stacks.
+
+    Class name: RemoveAzureInfrastructureWithPulumi
+
+    Responsibilities:
+        - Destroy the app stack of the layered mode, if any, before the
+          foundation stack.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.RemoveInfrastructureWithPulumi
+        - org.acmsl.iac.licdata.infrastructure.azure.ArmPacedStackOperation
+        - org.acmsl.iac.licdata.infrastructure.azure.FoundationStackReference
+    """
+
+    def __init__(self, event: InfrastructureRemovalRequested):
+        """
+        Creates a new RemoveAzureInfrastructureWithPulumi instance.
+        :param event: The request.
+        :type event: pythoneda.shared.iac.events.InfrastructureRemovalRequested
+        """
+        super().__init__(event)
+
+    @property
+    def dependent_stack_names(self) -> List[str]:
+        """
+        Retrieves the names of the stacks that may depend on the stack of the
+        event. The app stack of the layered mode references the foundation
+        stack, so it goes first, if it exists.
+        :return: The name of the app stack.
+        :rtype: List[str]
+        """
+        return [FoundationStackReference.app_stack_name(self.event.stack_name)]
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -19,9 +19,15 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from org.acmsl.iac.licdata.infrastructure import (
+    CausalChain,
+    EventMetadata,
+    StackOutputsCache,
+)
 from pythoneda.shared.artifact.events import DockerImageRequested
 from pythoneda.shared.iac import RequestDockerImageDetails
 from pythoneda.shared.iac.events import DockerImageDetailsRequested
+from typing import List
 
 
 class RequestAzureDockerImageDetails(RequestDockerImageDetails):
@@ -35,6 +41,9 @@ class RequestAzureDockerImageDetails(RequestDockerImageDetails):
 
     Collaborators:
         - pythoneda.shared.iac.RequestDockerImageDetails
+        - org.acmsl.iac.licdata.infrastructure.StackOutputsCache
+        - org.acmsl.iac.licdata.infrastructure.azure.DockerStackPrewarmer
+        - pythoneda.shared.iac.pulumi.azure.Outputs: Names the cached outputs.
     """
 
     def __init__(self, event: DockerImageDetailsRequested):
@@ -56,26 +65,79 @@ class RequestAzureDockerImageDetails(RequestDockerImageDetails):
             "Cannot instantiate RequestAzureDockerImageDetails directly"
         )
 
-    async def perform(self):
+    @classmethod
+    def docker_image_requested(
+        cls, credentialName: str, registryUrl: str, previousEventIds: List[str]
+    ) -> DockerImageRequested:
         """
-        Emits a request for the Docker image.
+        Builds the request for the Licdata Docker image.
+        :param credentialName: The name of the registry credential.
+        :type credentialName: str
+        :param registryUrl: The url of the registry.
+        :type registryUrl: str
+        :param previousEventIds: The ids of the previous events.
+        :type previousEventIds: List[str]
         :return: A DockerImageRequested event.
         :rtype: pythoneda.shared.artifact.events.DockerImageRequested
         """
+        return DockerImageRequested(
+            "licdata",
+            "latest",
+            {
+                "variant": "azure",
+                "python_version": "3.11",
+                "azure_base_image_version": "4",
+                "credential_name": credentialName,
+                "docker_registry_url": registryUrl,
+            },
+            previousEventIds,
+        )
+
+    async def perform(self):
+        """
+        Emits a request for the Docker image. The registry details missing
+        in the request are taken from the cached outputs of the stack.
+        If enabled, the Docker-layer stack is pre-warmed while the image is built.
+        :return: A DockerImageRequested event, or nothing if the infrastructure
+        update already requested the image.
+        :rtype: List[pythoneda.shared.artifact.events.DockerImageRequested]
+        """
+        if EventMetadata.flag(self.event.metadata, "prewarm"):
+            from .docker_stack_prewarmer import DockerStackPrewarmer
+
+            DockerStackPrewarmer.instance().prewarm(self.event)
+        if self.event.metadata.get("docker_image_requested", None) is not None:
+            # the infrastructure update already requested it, while deploying
+            self.__class__.logger().info(
+                f"Docker image already requested ({self.event.metadata['docker_image_requested']})"
+            )
+            return []
+        credential_name = self.event.metadata.get("credential_name", None)
+        docker_registry_url = self.event.metadata.get("docker_registry_url", None)
+        if credential_name is None or docker_registry_url is None:
+            # the outputs the infrastructure program exports; imported here
+            # since requests carrying the details don't need the Azure SDK
+            from pythoneda.shared.iac.pulumi.azure import Outputs
+
+            outputs = (
+                StackOutputsCache.instance().get(
+                    self.event.project_name, self.event.stack_name
+                )
+                or {}
+            )
+            if credential_name is None:
+                credential_name = outputs.get(
+                    Outputs.CONTAINER_REGISTRY_USERNAME.value, None
+                )
+            if docker_registry_url is None:
+                docker_registry_url = outputs.get(
+                    Outputs.CONTAINER_REGISTRY_URL.value, None
+                )
         return [
-            DockerImageRequested(
-                "licdata",
-                "latest",
-                {
-                    "variant": "azure",
-                    "python_version": "3.11",
-                    "azure_base_image_version": "4",
-                    "credential_name": self.event.metadata.get("credential_name", None),
-                    "docker_registry_url": self.event.metadata.get(
-                        "docker_registry_url", None
-                    ),
-                },
-                [self.event.id] + self.event.previous_event_ids,
+            self.__class__.docker_image_requested(
+                credential_name,
+                docker_registry_url,
+                CausalChain.of(self.event),
             )
         ]
 
@@ -0,0 +1,135 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/azure/token_credential_cache.py
+
+This script defines the TokenCredentialCache class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pythoneda.shared import BaseObject
+import threading
+import time
+
+
+class TokenCredentialCache(BaseObject):
+    """
+    Token caching shared by the sync and async cached credentials.
+
+    Class name: TokenCredentialCache
+
+    Responsibilities:
+        - Cache access tokens per scopes, tenant and claims.
+        - Count cache hits and misses.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.CachedTokenCredential
+        - org.acmsl.iac.licdata.infrastructure.azure.AsyncCachedTokenCredential
+    """
+
+    DEFAULT_REFRESH_MARGIN = 5 * 60
+
+    def __init__(self, credential, refreshMargin: float = None):
+        """
+        Creates a new TokenCredentialCache instance.
+        :param credential: The wrapped credential.
+        :type credential: azure.core.credentials.TokenCredential or azure.core.credentials_async.AsyncTokenCredential
+        :param refreshMargin: How long (in seconds) before expiry a token is renewed.
+        :type refreshMargin: float
+        """
+        super().__init__()
+        self._credential = credential
+        if refreshMargin is None:
+            refreshMargin = self.__class__.DEFAULT_REFRESH_MARGIN
+        self._refresh_margin = refreshMargin
+        self._tokens = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        """
+        Retrieves how many tokens were served from the cache.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Retrieves how many tokens had to be acquired.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._misses
+
+    @classmethod
+    def cache_key(cls, scopes: tuple, kwargs: dict) -> tuple:
+        """
+        Builds the cache key of a token request.
+        :param scopes: The requested scopes.
+        :type scopes: tuple
+        :param kwargs: The other token request parameters.
+        :type kwargs: dict
+        :return: The key.
+        :rtype: tuple
+        """
+        return (
+            tuple(sorted(scopes)),
+            kwargs.get("tenant_id", None),
+            kwargs.get("claims", None),
+        )
+
+    def cached_token(self, key: tuple):
+        """
+        Retrieves a cached token, if it's still valid for long enough.
+        :param key: The cache key.
+        :type key: tuple
+        :return: The token, or None.
+        :rtype: azure.core.credentials.AccessToken
+        """
+        with self._lock:
+            token = self._tokens.get(key, None)
+            if (
+                token is not None
+                and token.expires_on - self._refresh_margin > time.time()
+            ):
+                self._hits += 1
+                return token
+            self._misses += 1
+            return None
+
+    def cache_token(self, key: tuple, token):
+        """
+        Caches given token.
+        :param key: The cache key.
+        :type key: tuple
+        :param token: The token.
+        :type token: azure.core.credentials.AccessToken
+        """
+        with self._lock:
+            self._tokens[key] = token
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -19,11 +19,17 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
-from azure.identity import DefaultAzureCredential
-from azure.mgmt.resource import ResourceManagementClient
+from .arm_paced_stack_operation import ArmPacedStackOperation
+from .azure_client_pool import AzureClientPool
+from .azure_resource_inventory import AzureResourceInventory
+from .docker_stack_prewarmer import DockerStackPrewarmer
+from .foundation_stack_reference import FoundationStackReference
 from .licdata_web_app import LicdataWebApp
 from .update_azure_infrastructure_with_pulumi import UpdateAzureInfrastructureWithPulumi
-from org.acmsl.iac.licdata.infrastructure import UpdateDockerResourcesWithPulumi
+from org.acmsl.iac.licdata.infrastructure import (
+    CausalChain,
+    UpdateDockerResourcesWithPulumi,
+)
 import pulumi
 from pulumi import automation as auto
 import pulumi_azure_native.resources as resources
@@ -52,10 +58,12 @@ from pythoneda.shared.iac.pulumi.azure import (
     StorageAccount,
     WebApp,
 )
-from typing import Dict, List
+from typing import Any, Dict, List
 
 
-class UpdateAzureDockerResourcesWithPulumi(UpdateDockerResourcesWithPulumi):
+class UpdateAzureDockerResourcesWithPulumi(
+    ArmPacedStackOperation, UpdateDockerResourcesWithPulumi
+):
     """
     Updates Azure-specific Docker resources in IaC stacks with Pulumi.
 
@@ -66,6 +74,7 @@ class UpdateAzureDockerResourcesWithPulumi(UpdateDockerResourcesWithPulumi):
 
     Collaborators:
         - org.acmsl.licdata.infrastructure.UpdateDockerResourcesWithPulumi
+        - org.acmsl.iac.licdata.infrastructure.azure.ArmPacedStackOperation
     """
 
     def __init__(self, event: DockerResourcesUpdateRequested):
@@ -77,6 +86,7 @@ class UpdateAzureDockerResourcesWithPulumi(UpdateDockerResourcesWithPulumi):
         self._docker_pull_role_definition = None
         self._docker_pull_role_assignment = None
         self._web_app = None
+        self._foundation = None
         self._update_azure_infrastructure_with_pulumi = (
             UpdateAzureInfrastructureWithPulumi(
                 InfrastructureUpdateRequested(
@@ -84,7 +94,7 @@ class UpdateAzureDockerResourcesWithPulumi(UpdateDockerResourcesWithPulumi):
                     event.project_name,
                     event.location,
                     event.metadata,
-                    [event.id] + event.previous_event_ids,
+                    CausalChain.of(event),
                 )
             )
         )
@@ -101,6 +111,31 @@ class UpdateAzureDockerResourcesWithPulumi(UpdateDockerResourcesWithPulumi):
             "Cannot instantiate UpdateAzureDockerResourcesWithPulumi directly"
         )
 
+    @property
+    def pulumi_stack_name(self) -> str:
+        """
+        Retrieves the name of the Pulumi stack the operation works on: the
+        app stack in layered mode, the stack of the event otherwise.
+        :return: Such name.
+        :rtype: str
+        """
+        if self.layered:
+            return FoundationStackReference.app_stack_name(self.event.stack_name)
+        return self.event.stack_name
+
+    @property
+    def foundation(self):
+        """
+        Retrieves the foundation resources the Docker resources depend on:
+        read through a stack reference in layered mode, declared in the same
+        stack otherwise.
+        :return: Such resources.
+        :rtype: Union[org.acmsl.iac.licdata.infrastructure.azure.FoundationStackReference, org.acmsl.iac.licdata.infrastructure.azure.UpdateAzureInfrastructureWithPulumi]
+        """
+        if self._foundation is not None:
+            return self._foundation
+        return self._update_azure_infrastructure_with_pulumi
+
     @property
     def docker_pull_role_definition(self) -> DockerPullRoleDefinition:
         """
@@ -139,61 +174,99 @@ class UpdateAzureDockerResourcesWithPulumi(UpdateDockerResourcesWithPulumi):
                 "credential_name": secretName,
                 "docker_registry_url": registryUrl,
             },
-            [self.event.id] + self.event.previous_event_ids,
+            self._previous_event_ids(),
         )
 
     def find_azure_resource_by_name_prefix(
         self, resourceGroupName: str, namePrefix: str, resourceType: str
-    ) -> pulumi.Resource:
+    ):
         """
         Finds an Azure resource by its name prefix.
+        Lookups are served from the resource inventory, which lists each
+        resource group at most once per TTL.
         :param resourceGroupName: The name of the resource group.
         :type resourceGroupName: str
         :param namePrefix: The name prefix.
         :type namePrefix: str
         :param resourceType: The resource type.
         :type resourceType: str
-        :return: The Azure resource.
-        :rtype: pulumi.Resource
+        :return: The Azure resource, or None if not found.
+        :rtype: azure.mgmt.resource.resources.models.GenericResourceExpanded
         """
-        from azure.identity import DefaultAzureCredential
-        from azure.mgmt.resource import ResourceManagementClient
+        from azure.core.exceptions import HttpResponseError
 
         result = None
 
-        credential = ClientSecretCredential(tenant_id, app_id, password)
         subscription_id = self.event.metadata.get("azure_subscription_id", None)
-        resource_client = ResourceManagementClient(credential, subscription_id)
 
-        print(
-            f"Using ResourceManagementClient(ClientSecretCredential(tenant, app, password), subscription_id)"
-        )
+        tenant_id = self.event.metadata.get("azure_tenant_id", None)
+
+        def list_resource_group():
+            resource_client = AzureClientPool.instance().resource_client(
+                subscription_id, tenant_id
+            )
+            return resource_client.resources.list_by_resource_group(resourceGroupName)
 
         try:
-            resources = resource_client.resources.list_by_resource_group(
-                resourceGroupName
+            result = AzureResourceInventory.instance().find(
+                subscription_id,
+                resourceGroupName,
+                namePrefix,
+                resourceType,
+                list_resource_group,
+            )
+        except HttpResponseError as e:
+            self.__class__.logger().error(
+                f"Could not list resource group {resourceGroupName}: {e}"
             )
 
-            filtered_resources = [
-                res
-                for res in resources
-                if res.type.lower() == resource_type.lower()
-                and res.name.startswith(namePrefix)
-            ]
+        return result
 
-            if len(filtered_resources) > 0:
-                result = filtered_resources[0]
-        except Error as e:
-            print(e)
+    async def _refresh_if_needed(
+        self, stack: auto.Stack, targets: List[str] = None, stackName: str = None
+    ) -> bool:
+        """
+        Refreshes the stack, unless it was pre-warmed recently enough or the
+        refresh policy says it's not needed.
+        :param stack: The stack.
+        :type stack: pulumi.automation.Stack
+        :param targets: The URNs to restrict the refresh to, if any.
+        :type targets: List[str]
+        :param stackName: The name of the stack. Defaults to pulumi_stack_name.
+        :type stackName: str
+        :return: True if the stack got refreshed.
+        :rtype: bool
+        """
+        if stackName is None:
+            stackName = self.pulumi_stack_name
+        if DockerStackPrewarmer.instance().claim(self.event.project_name, stackName):
+            self.__class__.logger().info(
+                f"Using pre-warmed {self.event.project_name}/{stackName}, skipping refresh"
+            )
+            return False
+        return await super()._refresh_if_needed(stack, targets, stackName)
 
-        return result
+    def _stack_changed(self):
+        """
+        Notifies that the operation has changed the deployed resources.
+        """
+        AzureResourceInventory.instance().invalidate(
+            self.event.metadata.get("azure_subscription_id", None)
+        )
 
     def declare_infrastructure(self) -> Event:
         """
-        Declares the infrastructure resources.
+        Declares the infrastructure resources, or references them in layered mode.
         :return: Either a InfrastructureUpdated or a InfrastructureUpdateFailed
         :rtype: Event
         """
+        if self.layered:
+            self._foundation = FoundationStackReference(
+                self.event.stack_name,
+                self.event.project_name,
+                self.event.metadata.get("foundation_stack_reference", None),
+            )
+            return None
         return self._update_azure_infrastructure_with_pulumi.declare_infrastructure()
 
     def declare_docker_resources(self) -> List[Event]:
@@ -212,22 +285,20 @@ class UpdateAzureDockerResourcesWithPulumi(UpdateDockerResourcesWithPulumi):
             self.event.location,
             self.event.image_name,
             self.event.image_version,
-            self._update_azure_infrastructure_with_pulumi.container_registry.login_server.apply(
-                lambda name: name
-            ),
+            self.foundation.container_registry.login_server.apply(lambda name: name),
             None,
-            self._update_azure_infrastructure_with_pulumi.app_insights,
-            self._update_azure_infrastructure_with_pulumi.function_storage_account,
-            self._update_azure_infrastructure_with_pulumi.app_service_plan,
-            self._update_azure_infrastructure_with_pulumi.container_registry,
-            self._update_azure_infrastructure_with_pulumi.resource_group,
+            self.foundation.app_insights,
+            self.foundation.function_storage_account,
+            self.foundation.app_service_plan,
+            self.foundation.container_registry,
+            self.foundation.resource_group,
         )
         self._docker_pull_role_definition = DockerPullRoleDefinition(
             self.event.stack_name,
             self.event.project_name,
             self.event.location,
-            self._update_azure_infrastructure_with_pulumi.container_registry,
-            self._update_azure_infrastructure_with_pulumi.resource_group,
+            self.foundation.container_registry,
+            self.foundation.resource_group,
         )
         self._docker_pull_role_assignment = DockerPullRoleAssignment(
             self.event.stack_name,
@@ -235,30 +306,43 @@ class UpdateAzureDockerResourcesWithPulumi(UpdateDockerResourcesWithPulumi):
             self.event.location,
             self._web_app,
             self._docker_pull_role_definition,
-            self._update_azure_infrastructure_with_pulumi.container_registry,
-            self._update_azure_infrastructure_with_pulumi.resource_group,
+            self.foundation.container_registry,
+            self.foundation.resource_group,
         )
 
-    def _build_DockerResourcesUpdated_from_outcome(
-        self, outcome: auto.UpResult
+    def docker_resource_types(self) -> List[str]:
+        """
+        Retrieves the Pulumi types of the Docker-layer resources, used in
+        targeted updates.
+        :return: Such types.
+        :rtype: List[str]
+        """
+        return [
+            "azure-native:web:WebApp",
+            "azure-native:authorization:RoleDefinition",
+            "azure-native:authorization:RoleAssignment",
+        ]
+
+    def _build_DockerResourcesUpdated_from_outputs(
+        self, outputs: Dict[str, Any], noOp: bool = False
     ) -> DockerResourcesUpdated:
         """
-        Builds a DockerResourcesUpdated event from the outcome.
-        :param outcome: The outcome.
-        :type outcome: auto.UpResult
+        Builds a DockerResourcesUpdated event from the stack outputs.
+        :param outputs: The value of each stack output.
+        :type outputs: Dict[str, Any]
+        :param noOp: Whether the stack was already up to date.
+        :type noOp: bool
         :return: A DockerResourcesUpdated event.
         :rtype: pythoneda.shared.iac.events.DockerResourcesUpdated
         """
-        metadata = self.event.metadata.copy()
-        metadata[Outputs.API_DOMAIN.value] = outcome.outputs[
-            Outputs.API_DOMAIN.value
-        ].value
-        result = DockerResourcesUpdated(
+        metadata = self._result_metadata(noOp)
+        metadata[Outputs.API_DOMAIN.value] = outputs[Outputs.API_DOMAIN.value]
+        return DockerResourcesUpdated(
             self.event.stack_name,
             self.event.project_name,
             self.event.location,
             metadata,
-            [self.event.id] + self.event.previous_event_ids,
+            self._previous_event_ids(),
         )
 
 
@@ -19,12 +19,18 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from .arm_paced_stack_operation import ArmPacedStackOperation
+from .azure_resource_inventory import AzureResourceInventory
+from .foundation_stack_reference import FoundationStackReference
 from .functions_package import FunctionsPackage
 from .functions_deployment_slot import FunctionsDeploymentSlot
 from .licdata_web_app import LicdataWebApp
+from .request_azure_docker_image_details import RequestAzureDockerImageDetails
 from org.acmsl.iac.licdata.infrastructure import UpdateInfrastructureWithPulumi
+import asyncio
+from pulumi import automation as auto
 from pulumi import Output
-from pythoneda.shared import Event, EventEmitter
+from pythoneda.shared import Event, EventEmitter, Ports
 from pythoneda.shared.iac.events import InfrastructureUpdateRequested
 from pythoneda.shared.iac.pulumi.azure import (
     AppInsights,
@@ -41,10 +47,12 @@ from pythoneda.shared.iac.pulumi.azure import (
     ResourceGroup,
     WebApp,
 )
-from typing import Dict
+from typing import Dict, Optional
 
 
-class UpdateAzureInfrastructureWithPulumi(UpdateInfrastructureWithPulumi):
+class UpdateAzureInfrastructureWithPulumi(
+    ArmPacedStackOperation, UpdateInfrastructureWithPulumi
+):
     """
     Azure-specific Pulumi implementation of Licdata infrastructure stacks.
 
@@ -52,11 +60,21 @@ class UpdateAzureInfrastructureWithPulumi(UpdateInfrastructureWithPulumi):
 
     Responsibilities:
         - Use Azure-specific Pulumi stack as Licdata infrastructure stack.
+        - Request the Docker image as soon as the container registry exists, if enabled.
 
     Collaborators:
         - org.acmsl.licdata.infrastructure.UpdateInfrastructureWithPulumi
+        - org.acmsl.iac.licdata.infrastructure.azure.ArmPacedStackOperation
     """
 
+    REGISTRY_TYPE = "azure-native:containerregistry:Registry"
+
+    # a replayed result requests no Docker image early
+    TRANSIENT_RESULT_METADATA = (
+        UpdateInfrastructureWithPulumi.TRANSIENT_RESULT_METADATA
+        + ["docker_image_requested"]
+    )
+
     def __init__(self, event: InfrastructureUpdateRequested):
         """
         Creates a new UpdateAzureInfrastructureWithPulumi instance.
@@ -75,6 +93,8 @@ class UpdateAzureInfrastructureWithPulumi(UpdateInfrastructureWithPulumi):
         self._container_registry = None
         self._webapp_deployment_slot = None
         self._app_insights = None
+        self._early_docker_image_request = None
+        self._early_emission = None
         super().__init__(event)
 
     @classmethod
@@ -187,6 +207,140 @@ class UpdateAzureInfrastructureWithPulumi(UpdateInfrastructureWithPulumi):
         """
         return self._container_registry
 
+    @property
+    def early_registry_credentials(self) -> bool:
+        """
+        Checks whether the Docker image should be requested as soon as the
+        container registry exists, while the rest of the stack is deployed.
+        :return: True in such case.
+        :rtype: bool
+        """
+        return self._metadata_flag("early_registry_credentials")
+
+    @property
+    def early_docker_image_request(self) -> Optional[Event]:
+        """
+        Retrieves the Docker image request emitted during the update, if any.
+        :return: Such request.
+        :rtype: pythoneda.shared.artifact.events.DockerImageRequested
+        """
+        return self._early_docker_image_request
+
+    def _on_engine_event(
+        self, event: auto.EngineEvent, loop: asyncio.AbstractEventLoop
+    ):
+        """
+        Requests the Docker image as soon as the outputs of the container
+        registry are known, if enabled.
+        :param event: The engine event.
+        :type event: pulumi.automation.EngineEvent
+        :param loop: The event loop of the operation.
+        :type loop: asyncio.AbstractEventLoop
+        """
+        super()._on_engine_event(event, loop)
+        outputs_event = event.res_outputs_event
+        if (
+            outputs_event is None
+            or self._early_docker_image_request is not None
+            or not self.early_registry_credentials
+            or outputs_event.metadata.type != self.__class__.REGISTRY_TYPE
+        ):
+            return
+        outputs = (
+            outputs_event.metadata.new.outputs
+            if outputs_event.metadata.new is not None
+            else {}
+        ) or {}
+        registry_url = outputs.get("loginServer", None)
+        if registry_url is None:
+            return
+        # the admin user of a registry is named after it
+        self._early_docker_image_request = (
+            RequestAzureDockerImageDetails.docker_image_requested(
+                outputs.get("name", None),
+                registry_url,
+                self._previous_event_ids(),
+            )
+        )
+        self._early_emission = asyncio.run_coroutine_threadsafe(
+            self._emit(self._early_docker_image_request), loop
+        )
+        self._early_emission.add_done_callback(self._early_emission_done)
+
+    def _early_emission_done(self, future):
+        """
+        Logs the outcome of the early Docker image request.
+        :param future: The emission.
+        :type future: concurrent.futures.Future
+        """
+        if future.cancelled():
+            self.__class__.logger().warning(
+                "The early Docker image request was cancelled"
+            )
+        elif future.exception() is not None:
+            self.__class__.logger().error(
+                f"Could not emit the early Docker image request: {future.exception()}"
+            )
+
+    def _early_emission_succeeded(self) -> bool:
+        """
+        Checks whether the early Docker image request has been emitted.
+        :return: True in such case.
+        :rtype: bool
+        """
+        future = self._early_emission
+        return (
+            future is not None
+            and future.done()
+            and not future.cancelled()
+            and future.exception() is None
+            and future.result()
+        )
+
+    async def _emit(self, event: Event) -> bool:
+        """
+        Emits given event right away.
+        :param event: The event.
+        :type event: pythoneda.shared.Event
+        :return: True if the event got emitted.
+        :rtype: bool
+        """
+        emitter = Ports.instance().resolve_first(EventEmitter)
+        if emitter is None:
+            self.__class__.logger().warning(
+                f"No event emitter available to emit {event.__class__.__name__}"
+            )
+            return False
+        self.__class__.logger().info(
+            f"Container registry ready, emitting {event.__class__.__name__} before the update completes"
+        )
+        await emitter.emit(event)
+        return True
+
+    def _result_metadata(self, noOp: bool = False) -> Dict:
+        """
+        Builds the metadata of the resulting event, flagging whether the
+        Docker image was already requested. It's only flagged once the early
+        request has been emitted: if it failed, or is still on its way, the
+        Docker image gets requested again after the update.
+        :param noOp: Whether the operation turned out to be a no-op.
+        :type noOp: bool
+        :return: The metadata.
+        :rtype: Dict
+        """
+        result = super()._result_metadata(noOp)
+        if self._early_emission_succeeded():
+            result["docker_image_requested"] = self._early_docker_image_request.id
+        return result
+
+    def _stack_changed(self):
+        """
+        Notifies that the operation has changed the deployed resources.
+        """
+        AzureResourceInventory.instance().invalidate(
+            self.event.metadata.get("azure_subscription_id", None)
+        )
+
     def declare_infrastructure(self):
         """
         Creates the infrastructure.
@@ -248,30 +402,27 @@ class UpdateAzureInfrastructureWithPulumi(UpdateInfrastructureWithPulumi):
             self._resource_group,
         )
 
+        if self.layered:
+            FoundationStackReference.export(self)
+
     async def retrieve_container_registry_credentials(self) -> Dict[str, str]:
         """
-        Retrieves the container registry credentials.
+        Retrieves the container registry credentials, from the cached stack
+        outputs if possible.
         :return: A dictionary with the credentials.
         :rtype: Dict[str, str]
         """
-        username = self.outcome.outputs.get(
-            Outputs.CONTAINER_REGISTRY_USERNAME.value, None
-        )
-        if username is not None:
-            username = username.value
-        password = self.outcome.outputs.get(
-            Outputs.CONTAINER_REGISTRY_PASSWORD.value, None
-        )
-        if password is not None:
-            password = password.value
-        url = self.outcome.outputs.get(Outputs.CONTAINER_REGISTRY_URL.value, None)
-        if url is not None:
-            url = url.value
-
+        outputs = await self._cached_outputs(self.declare_infrastructure)
         return {
-            "credential_name": username,
-            "credential_password": password,
-            "docker_registry_url": url,
+            "credential_name": outputs.get(
+                Outputs.CONTAINER_REGISTRY_USERNAME.value, None
+            ),
+            "credential_password": outputs.get(
+                Outputs.CONTAINER_REGISTRY_PASSWORD.value, None
+            ),
+            "docker_registry_url": outputs.get(
+                Outputs.CONTAINER_REGISTRY_URL.value, None
+            ),
         }
 
 
@@ -0,0 +1,121 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/causal_chain.py
+
+This script defines the CausalChain class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import itertools
+import os
+from pythoneda.shared import BaseObject, Event
+from typing import List
+
+
+class CausalChain(BaseObject):
+    """
+    Builds the previous event ids of emitted events, keeping them bounded.
+
+    Class name: CausalChain
+
+    Responsibilities:
+        - Chain the ids of the events that caused a new one to their
+          ancestors, newest first, as existing consumers expect.
+        - Cap the chain, keeping the most recent ancestors and the root
+          event, so long-running chains don't grow without bound in memory
+          and in d-bus payloads.
+
+    Collaborators:
+        - None
+    """
+
+    DEFAULT_MAX_LENGTH = 32
+
+    MIN_LENGTH = 2
+
+    _max_length = None
+
+    @classmethod
+    def max_length(cls) -> int:
+        """
+        Retrieves how many ids a chain can hold. It's read from the
+        LICDATA_IAC_MAX_CAUSAL_CHAIN environment variable, defaulting to
+        DEFAULT_MAX_LENGTH.
+        :return: Such length.
+        :rtype: int
+        """
+        if cls._max_length is None:
+            value = os.environ.get("LICDATA_IAC_MAX_CAUSAL_CHAIN", None)
+            result = cls.DEFAULT_MAX_LENGTH
+            if value is not None:
+                try:
+                    result = int(value)
+                except ValueError:
+                    cls.logger().warning(
+                        f"Ignoring invalid LICDATA_IAC_MAX_CAUSAL_CHAIN: {value}"
+                    )
+            cls._max_length = max(cls.MIN_LENGTH, result)
+        return cls._max_length
+
+    @classmethod
+    def extend(
+        cls, eventIds: List[str], previousEventIds: List[str], maxLength: int = None
+    ) -> List[str]:
+        """
+        Builds the previous event ids of an event caused by given ones.
+        :param eventIds: The ids of the causing events, newest first.
+        :type eventIds: List[str]
+        :param previousEventIds: The previous event ids of the (newest)
+        causing event.
+        :type previousEventIds: List[str]
+        :param maxLength: How many ids to keep. Defaults to max_length().
+        :type maxLength: int
+        :return: The given ids followed by their ancestors. If there are too
+        many, the oldest ones are dropped, but the root.
+        :rtype: List[str]
+        """
+        if maxLength is None:
+            maxLength = cls.max_length()
+        maxLength = max(cls.MIN_LENGTH, maxLength)
+        previous = previousEventIds or []
+        if len(eventIds) + len(previous) <= maxLength:
+            return list(eventIds) + list(previous)
+        result = list(
+            itertools.islice(itertools.chain(eventIds, previous), maxLength - 1)
+        )
+        result.append(previous[-1] if previous else eventIds[-1])
+        return result
+
+    @classmethod
+    def of(cls, event: Event) -> List[str]:
+        """
+        Builds the previous event ids of an event caused by given one.
+        :param event: The causing event.
+        :type event: pythoneda.shared.Event
+        :return: Its id followed by its ancestors, bounded.
+        :rtype: List[str]
+        """
+        return cls.extend([event.id], event.previous_event_ids)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -20,6 +20,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 from argparse import ArgumentParser
+import asyncio
 from pythoneda.shared import PrimaryPort, PythonedaApplication
 from pythoneda.shared.infrastructure.cli import CliHandler
 
@@ -42,6 +43,7 @@ class PulumiOptionsCli(CliHandler, PrimaryPort):
         Creates a new PulumiOptionsCli instance.
         """
         super().__init__("Provide the Pulumi options")
+        self._warm_up = None
 
     @classmethod
     def priority(cls) -> int:
@@ -102,6 +104,55 @@ class PulumiOptionsCli(CliHandler, PrimaryPort):
             required=False,
             help="For Azure, the subscription id.",
         )
+        parser.add_argument(
+            "--refresh-policy",
+            choices=["always", "never", "stale"],
+            required=False,
+            help="Whether to refresh the stack before the operation: always, never, or only if the last refresh is stale.",
+        )
+        parser.add_argument(
+            "--refresh-max-age",
+            type=float,
+            required=False,
+            help="With --refresh-policy stale, the age (in minutes) after which the last refresh is stale.",
+        )
+        parser.add_argument(
+            "--preview-first",
+            action="store_true",
+            help="Run a preview first, and skip the update if nothing would change.",
+        )
+        parser.add_argument(
+            "--targeted",
+            action="store_true",
+            help="Restrict Docker updates to the Docker-layer resources and their dependents.",
+        )
+        parser.add_argument(
+            "--layered",
+            action="store_true",
+            help="Deploy the Docker resources in their own stack, referencing the infrastructure stack. Existing stacks must move their WebApp and Docker pull role resources to the <stack>-app stack first (pulumi state move).",
+        )
+        parser.add_argument(
+            "--early-registry-credentials",
+            action="store_true",
+            help="Request the Docker image as soon as the container registry exists.",
+        )
+        parser.add_argument(
+            "--prewarm",
+            action="store_true",
+            help="Select and refresh the Docker-layer stack while the Docker image is built.",
+        )
+        parser.add_argument(
+            "--parallel",
+            type=int,
+            required=False,
+            help="How many resource operations Pulumi may run in parallel.",
+        )
+        parser.add_argument(
+            "--idempotency-window",
+            type=float,
+            required=False,
+            help="For how long (in minutes) a successful update answers identical requests without running Pulumi. Disabled (0) by default.",
+        )
 
     async def handle(self, app: PythonedaApplication, args):
         """
@@ -111,6 +162,13 @@ class PulumiOptionsCli(CliHandler, PrimaryPort):
         :param args: The CLI args.
         :type args: argparse.args
         """
+        from org.acmsl.iac.licdata.infrastructure import PulumiPluginCache
+
+        # resolve the provider plugins while the app processes the options
+        self._warm_up = asyncio.ensure_future(
+            PulumiPluginCache.instance().ensure_warm()
+        )
+        self._warm_up.add_done_callback(self._warm_up_done)
         await app.accept_pulumi_options(
             {
                 "stack_name": args.stack,
@@ -118,9 +176,31 @@ class PulumiOptionsCli(CliHandler, PrimaryPort):
                 "location": args.location,
                 "operation": args.operation,
                 "azure_subscription_id": args.azure_subscription_id,
+                "refresh_policy": args.refresh_policy,
+                "refresh_max_age_minutes": args.refresh_max_age,
+                "preview_first": args.preview_first,
+                "targeted": args.targeted,
+                "layered": args.layered,
+                "early_registry_credentials": args.early_registry_credentials,
+                "prewarm": args.prewarm,
+                "parallel": args.parallel,
+                "idempotency_window_minutes": args.idempotency_window,
             }
         )
 
+    def _warm_up_done(self, future):
+        """
+        Logs a warm-up of the provider plugins that failed unexpectedly.
+        :param future: The warm-up.
+        :type future: asyncio.Future
+        """
+        from org.acmsl.iac.licdata.infrastructure import PulumiPluginCache
+
+        if not future.cancelled() and future.exception() is not None:
+            PulumiPluginCache.logger().warning(
+                f"Could not warm up Pulumi plugins: {future.exception()}"
+            )
+
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
 # Local Variables:
@@ -23,6 +23,8 @@ __path__ = __import__("pkgutil").extend_path(__path__, __name__)
 
 from .licdata_iac_dbus_signal_emitter import LicdataIacDbusSignalEmitter
 from .licdata_iac_dbus_signal_listener import LicdataIacDbusSignalListener
+from .local_event_bus import LocalEventBus
+from .signal_emission_queue import SignalEmissionQueue
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
 # Local Variables:
@@ -19,6 +19,9 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from .local_event_bus import LocalEventBus
+from .signal_emission_queue import SignalEmissionQueue
+from pythoneda.shared import Event
 from pythoneda.shared.infrastructure.dbus import DbusSignalEmitter
 from typing import List
 
@@ -32,10 +35,15 @@ class LicdataIacDbusSignalEmitter(DbusSignalEmitter):
     Responsibilities:
         - Connect to d-bus.
         - Emit Licdata IaC's events as d-bus signals.
+        - Hand them first to the listeners in the same process, if any.
+        - Send the signals in batches, without making the producers wait
+          for the bus, if a flush window is configured.
 
     Collaborators:
         - pythoneda.shared.application.PythonEDA: Requests emitting events.
         - org.acmsl.iac.licdata.events.infrastructure.dbus events
+        - org.acmsl.iac.licdata.infrastructure.dbus.LocalEventBus
+        - org.acmsl.iac.licdata.infrastructure.dbus.SignalEmissionQueue
     """
 
     def __init__(self):
@@ -43,6 +51,38 @@ class LicdataIacDbusSignalEmitter(DbusSignalEmitter):
         Creates a new LicdataIacDbusSignalEmitter instance.
         """
         super().__init__()
+        self._emission_queue = SignalEmissionQueue(self._emit_signal)
+
+    @property
+    def emission_queue(self) -> SignalEmissionQueue:
+        """
+        Retrieves the queue of the signals to emit.
+        :return: Such queue.
+        :rtype: org.acmsl.iac.licdata.infrastructure.dbus.SignalEmissionQueue
+        """
+        return self._emission_queue
+
+    async def emit(self, event: Event):
+        """
+        Emits given event: to the listeners in the same process directly,
+        and as a d-bus signal for the rest, right away or, if a flush window
+        is configured, in the next batch.
+        :param event: The event.
+        :type event: pythoneda.shared.Event
+        """
+        await LocalEventBus.instance().publish(event)
+        if self._emission_queue.flush_window > 0:
+            await self._emission_queue.put(event)
+        else:
+            await self._emit_signal(event)
+
+    async def _emit_signal(self, event: Event):
+        """
+        Emits given event as a d-bus signal.
+        :param event: The event.
+        :type event: pythoneda.shared.Event
+        """
+        await super().emit(event)
 
     @classmethod
     def event_packages(cls) -> List[str]:
@@ -19,6 +19,8 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+from .local_event_bus import LocalEventBus
+from pythoneda.shared import Event
 from pythoneda.shared.infrastructure.dbus import DbusSignalListener
 from typing import Dict, List
 
@@ -32,10 +34,13 @@ class LicdataIacDbusSignalListener(DbusSignalListener):
     Responsibilities:
         - Connect to d-bus.
         - Listen to signals relevant to Licdata IaC.
+        - Receive the relevant events emitted in the same process directly,
+          ignoring their d-bus copies.
 
     Collaborators:
         - pythoneda.shared.application.PythonEDA: Requests emitting events.
         - pythoneda.shared.artifact.events.infrastructure.dbus.DbusDockerImagePushed
+        - org.acmsl.iac.licdata.infrastructure.dbus.LocalEventBus
     """
 
     def __init__(self):
@@ -53,6 +58,44 @@ class LicdataIacDbusSignalListener(DbusSignalListener):
         """
         return ["pythoneda.shared.artifact.events.infrastructure.dbus"]
 
+    @classmethod
+    def local_event_packages(cls) -> List[str]:
+        """
+        Retrieves the packages of the supported events, as emitted in-process.
+        :return: The packages of the events behind each d-bus package.
+        :rtype: List[str]
+        """
+        return [
+            package.removesuffix(".infrastructure.dbus")
+            for package in cls.event_packages()
+        ]
+
+    async def accept(self, app):
+        """
+        Starts listening, both to the events emitted in the same process and
+        to d-bus.
+        :param app: The PythonEDA instance.
+        :type app: pythoneda.shared.application.PythonEDA
+        """
+        LocalEventBus.instance().subscribe(
+            self.__class__.local_event_packages(), app.accept
+        )
+        await super().accept(app)
+
+    async def listen(self, event: Event):
+        """
+        Notifies an event received from d-bus, unless it was delivered
+        in-process already.
+        :param event: The event.
+        :type event: pythoneda.shared.Event
+        """
+        if LocalEventBus.instance().was_delivered(event.id):
+            self.__class__.logger().debug(
+                f"Ignoring {event.__class__.__name__} {event.id}, delivered in-process already"
+            )
+            return
+        await super().listen(event)
+
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
 # Local Variables:
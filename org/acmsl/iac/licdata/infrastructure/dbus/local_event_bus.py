@@ -0,0 +1,220 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/dbus/local_event_bus.py
+
+This file defines the LocalEventBus class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+from collections import OrderedDict
+from org.acmsl.iac.licdata.infrastructure import EnvironmentSetting
+from pythoneda.shared import BaseObject, Event
+from typing import Awaitable, Callable, Dict, List, Set, Tuple
+
+
+class LocalEventBus(BaseObject):
+    """
+    Hands events to listeners in the same process, without d-bus.
+
+    Class name: LocalEventBus
+
+    Responsibilities:
+        - Deliver emitted events, as they are, to the in-process subscribers
+          interested in them, each one in its own task, as d-bus signals are.
+        - Remember the ids of the events delivered locally, so their d-bus
+          copies can be ignored.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.dbus.LicdataIacDbusSignalEmitter
+        - org.acmsl.iac.licdata.infrastructure.dbus.LicdataIacDbusSignalListener
+    """
+
+    DEFAULT_MAX_IN_FLIGHT = 1024
+
+    DELIVERED_IDS = 4096
+
+    _singleton = None
+
+    def __init__(self, maxInFlight: int = None):
+        """
+        Creates a new LocalEventBus instance.
+        :param maxInFlight: How many deliveries can run at once for each
+        subscriber. If omitted, it's read from the LICDATA_IAC_LOCAL_MAX_IN_FLIGHT
+        environment variable, defaulting to DEFAULT_MAX_IN_FLIGHT.
+        :type maxInFlight: int
+        """
+        super().__init__()
+        if maxInFlight is None:
+            maxInFlight = EnvironmentSetting.integer(
+                "LICDATA_IAC_LOCAL_MAX_IN_FLIGHT",
+                self.__class__.DEFAULT_MAX_IN_FLIGHT,
+            )
+        self._max_in_flight = max(1, maxInFlight)
+        self._subscriptions: Dict[
+            int, Tuple[List[str], Callable[[Event], Awaitable], Set[asyncio.Task]]
+        ] = {}
+        self._next_subscription = 0
+        self._delivered = OrderedDict()
+        self._stats = {"published": 0, "delivered": 0, "failed": 0, "overflowed": 0}
+
+    @classmethod
+    def instance(cls) -> "LocalEventBus":
+        """
+        Retrieves the process-wide instance.
+        :return: Such instance.
+        :rtype: org.acmsl.iac.licdata.infrastructure.dbus.LocalEventBus
+        """
+        if cls._singleton is None:
+            cls._singleton = cls()
+        return cls._singleton
+
+    def subscribe(
+        self, packages: List[str], handler: Callable[[Event], Awaitable]
+    ) -> int:
+        """
+        Subscribes given handler to the events of given packages.
+        :param packages: The packages of the events, i.e.
+        "pythoneda.shared.artifact.events".
+        :type packages: List[str]
+        :param handler: The handler.
+        :type handler: Callable[[pythoneda.shared.Event], Awaitable]
+        :return: The subscription, to unsubscribe later.
+        :rtype: int
+        """
+        self._next_subscription += 1
+        self._subscriptions[self._next_subscription] = (list(packages), handler, set())
+        return self._next_subscription
+
+    def unsubscribe(self, subscription: int):
+        """
+        Cancels given subscription, and the deliveries still running for it.
+        :param subscription: The subscription.
+        :type subscription: int
+        """
+        entry = self._subscriptions.pop(subscription, None)
+        if entry is not None:
+            for task in list(entry[2]):
+                task.cancel()
+
+    @classmethod
+    def matches(cls, event: Event, packages: List[str]) -> bool:
+        """
+        Checks whether given event belongs to any of given packages.
+        :param event: The event.
+        :type event: pythoneda.shared.Event
+        :param packages: The packages.
+        :type packages: List[str]
+        :return: True in such case.
+        :rtype: bool
+        """
+        module = event.__class__.__module__
+        return any(
+            module == package or module.startswith(f"{package}.")
+            for package in packages
+        )
+
+    async def publish(self, event: Event) -> int:
+        """
+        Starts delivering given event to the subscribers interested in it,
+        each delivery in its own task, so a long-running handler doesn't
+        hold back the events behind it. If any of them has too many
+        deliveries running, the event is left to d-bus instead.
+        :param event: The event.
+        :type event: pythoneda.shared.Event
+        :return: How many subscribers it is being delivered to.
+        :rtype: int
+        """
+        self._stats["published"] += 1
+        subscribers = [
+            (handler, tasks)
+            for packages, handler, tasks in self._subscriptions.values()
+            if self.__class__.matches(event, packages)
+        ]
+        if any(len(tasks) >= self._max_in_flight for _, tasks in subscribers):
+            self._stats["overflowed"] += 1
+            return 0
+        for handler, tasks in subscribers:
+            task = asyncio.ensure_future(self._deliver(handler, event))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if subscribers:
+            self._remember(event.id)
+        return len(subscribers)
+
+    def was_delivered(self, eventId: str) -> bool:
+        """
+        Checks whether given event was delivered locally already.
+        :param eventId: The id of the event.
+        :type eventId: str
+        :return: True in such case.
+        :rtype: bool
+        """
+        return eventId in self._delivered
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retrieves the counters of the bus.
+        :return: How many events were published, delivered, failed and left
+        to d-bus because too many deliveries were running, and how many
+        deliveries are running.
+        :rtype: Dict[str, int]
+        """
+        result = dict(self._stats)
+        result["in_flight"] = sum(
+            len(tasks) for _, _, tasks in self._subscriptions.values()
+        )
+        return result
+
+    def _remember(self, eventId: str):
+        """
+        Remembers given event was delivered locally, forgetting the oldest
+        ids beyond DELIVERED_IDS.
+        :param eventId: The id of the event.
+        :type eventId: str
+        """
+        self._delivered[eventId] = True
+        self._delivered.move_to_end(eventId)
+        while len(self._delivered) > self.__class__.DELIVERED_IDS:
+            self._delivered.popitem(last=False)
+
+    async def _deliver(self, handler: Callable[[Event], Awaitable], event: Event):
+        """
+        Hands given event to given handler.
+        :param handler: The handler.
+        :type handler: Callable[[pythoneda.shared.Event], Awaitable]
+        :param event: The event.
+        :type event: pythoneda.shared.Event
+        """
+        try:
+            await handler(event)
+            self._stats["delivered"] += 1
+        except Exception as e:
+            # nobody awaits the delivery, so the failure is only logged
+            self._stats["failed"] += 1
+            self.__class__.logger().error(
+                f"Could not deliver {event.__class__.__name__} locally: {e}"
+            )
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,242 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/dbus/signal_emission_queue.py
+
+This file defines the SignalEmissionQueue class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+from collections import deque
+from org.acmsl.iac.licdata.infrastructure import EnvironmentSetting
+from pythoneda.shared import BaseObject, Event
+import time
+from typing import Awaitable, Callable, Dict
+
+
+class SignalEmissionQueue(BaseObject):
+    """
+    Emits d-bus signals in batches, off the path of the producers.
+
+    Class name: SignalEmissionQueue
+
+    Responsibilities:
+        - Collect the events emitted within a short flush window, and send
+          them together, in order.
+        - Bound the queue, making producers wait, or dropping events, when
+          the bus can't keep up.
+        - Count queue depth, batch sizes and flush latencies.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.dbus.LicdataIacDbusSignalEmitter
+    """
+
+    DEFAULT_FLUSH_WINDOW_MS = 0
+
+    DEFAULT_MAX_QUEUED = 256
+
+    WAIT = "wait"
+
+    DROP_OLDEST = "drop_oldest"
+
+    DROP_NEWEST = "drop_newest"
+
+    OVERFLOW_POLICIES = [WAIT, DROP_OLDEST, DROP_NEWEST]
+
+    def __init__(
+        self,
+        send: Callable[[Event], Awaitable],
+        flushWindow: float = None,
+        maxQueued: int = None,
+        overflow: str = None,
+    ):
+        """
+        Creates a new SignalEmissionQueue instance.
+        :param send: The function sending a single signal.
+        :type send: Callable[[pythoneda.shared.Event], Awaitable]
+        :param flushWindow: How long (in seconds) to collect events before
+        sending them. If omitted, it's read (in milliseconds) from the
+        LICDATA_IAC_DBUS_FLUSH_MS environment variable, defaulting to
+        DEFAULT_FLUSH_WINDOW_MS, i.e. no batching. Batching is meant for
+        long-running processes: events still queued when the event loop
+        stops are lost, unless flush() is awaited first.
+        :type flushWindow: float
+        :param maxQueued: How many events can wait. If omitted, it's read from
+        the LICDATA_IAC_DBUS_MAX_QUEUED environment variable, defaulting to
+        DEFAULT_MAX_QUEUED.
+        :type maxQueued: int
+        :param overflow: What to do when the queue is full: WAIT, DROP_OLDEST
+        or DROP_NEWEST. If omitted, it's read from the LICDATA_IAC_DBUS_OVERFLOW
+        environment variable, defaulting to WAIT.
+        :type overflow: str
+        """
+        super().__init__()
+        self._send = send
+        if flushWindow is None:
+            flushWindow = (
+                EnvironmentSetting.number(
+                    "LICDATA_IAC_DBUS_FLUSH_MS",
+                    self.__class__.DEFAULT_FLUSH_WINDOW_MS,
+                )
+                / 1000
+            )
+        self._flush_window = max(0.0, flushWindow)
+        if maxQueued is None:
+            maxQueued = EnvironmentSetting.integer(
+                "LICDATA_IAC_DBUS_MAX_QUEUED", self.__class__.DEFAULT_MAX_QUEUED
+            )
+        self._max_queued = max(1, maxQueued)
+        if overflow is None:
+            overflow = EnvironmentSetting.choice(
+                "LICDATA_IAC_DBUS_OVERFLOW",
+                self.__class__.WAIT,
+                self.__class__.OVERFLOW_POLICIES,
+            )
+        if overflow not in self.__class__.OVERFLOW_POLICIES:
+            self.__class__.logger().warning(
+                f"Ignoring unknown overflow policy: {overflow}"
+            )
+            overflow = self.__class__.WAIT
+        self._overflow = overflow
+        self._pending = deque()
+        self._flusher = None
+        self._drained = None
+        self._stats = {
+            "queued": 0,
+            "dropped": 0,
+            "sent": 0,
+            "failed": 0,
+            "batches": 0,
+            "max_batch_size": 0,
+            "flush_seconds": 0.0,
+            "max_flush_seconds": 0.0,
+        }
+
+    @property
+    def flush_window(self) -> float:
+        """
+        Retrieves how long (in seconds) events are collected before sending them.
+        :return: Such window.
+        :rtype: float
+        """
+        return self._flush_window
+
+    async def put(self, event: Event):
+        """
+        Queues given event, to be sent in the next flush.
+        :param event: The event.
+        :type event: pythoneda.shared.Event
+        """
+        while len(self._pending) >= self._max_queued:
+            if self._overflow == self.__class__.DROP_NEWEST:
+                self._drop(event)
+                return
+            if self._overflow == self.__class__.DROP_OLDEST:
+                self._drop(self._pending.popleft())
+            else:
+                await self._wait_for_room()
+        self._pending.append(event)
+        self._stats["queued"] += 1
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.ensure_future(self._flush_later())
+
+    async def flush(self):
+        """
+        Sends the queued events right away, i.e. before shutting down.
+        """
+        while self._pending:
+            await self._send_batch()
+
+    def stats(self) -> Dict:
+        """
+        Retrieves the counters of the queue.
+        :return: The current queue depth, how many events were queued,
+        dropped, sent and failed, how many batches were sent, their
+        average and maximum size, and the average and maximum flush latency.
+        :rtype: Dict
+        """
+        result = dict(self._stats)
+        result["queue_depth"] = len(self._pending)
+        batches = max(1, result["batches"])
+        result["avg_batch_size"] = (result["sent"] + result["failed"]) / batches
+        result["avg_flush_seconds"] = result["flush_seconds"] / batches
+        return result
+
+    def _drop(self, event: Event):
+        """
+        Drops given event, since the queue is full.
+        :param event: The event.
+        :type event: pythoneda.shared.Event
+        """
+        self._stats["dropped"] += 1
+        self.__class__.logger().warning(
+            f"d-bus emission queue full, dropping {event.__class__.__name__} {event.id}"
+        )
+
+    async def _wait_for_room(self):
+        """
+        Waits until the next batch is sent.
+        """
+        if self._drained is None:
+            self._drained = asyncio.Event()
+        self._drained.clear()
+        await self._drained.wait()
+
+    async def _flush_later(self):
+        """
+        Sends the queued events once the flush window elapses, until none
+        are left.
+        """
+        while self._pending:
+            await asyncio.sleep(self._flush_window)
+            await self._send_batch()
+
+    async def _send_batch(self):
+        """
+        Sends the events queued so far, in order.
+        """
+        batch = list(self._pending)
+        self._pending.clear()
+        if self._drained is not None:
+            self._drained.set()
+        started = time.monotonic()
+        for event in batch:
+            try:
+                await self._send(event)
+                self._stats["sent"] += 1
+            except Exception as e:
+                # one failing signal must not hold back the rest of the batch
+                self._stats["failed"] += 1
+                self.__class__.logger().error(
+                    f"Could not emit {event.__class__.__name__} {event.id}: {e}"
+                )
+        elapsed = time.monotonic() - started
+        self._stats["batches"] += 1
+        self._stats["max_batch_size"] = max(self._stats["max_batch_size"], len(batch))
+        self._stats["flush_seconds"] += elapsed
+        self._stats["max_flush_seconds"] = max(
+            self._stats["max_flush_seconds"], elapsed
+        )
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,120 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/environment_setting.py
+
+This script defines the EnvironmentSetting class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+from pythoneda.shared import BaseObject
+from typing import Callable, List
+
+
+class EnvironmentSetting(BaseObject):
+    """
+    Reads the LICDATA_IAC_* tuning settings from the environment.
+
+    Class name: EnvironmentSetting
+
+    Responsibilities:
+        - Parse numeric and enumerated settings.
+        - Fall back to the default, with a warning, on invalid values, so
+          a typo never breaks an operation.
+
+    Collaborators:
+        - None
+    """
+
+    @classmethod
+    def integer(cls, name: str, default: int) -> int:
+        """
+        Reads an integer setting.
+        :param name: The environment variable.
+        :type name: str
+        :param default: The value to use if it's missing or invalid.
+        :type default: int
+        :return: The setting.
+        :rtype: int
+        """
+        return cls._parse(name, default, int)
+
+    @classmethod
+    def number(cls, name: str, default: float) -> float:
+        """
+        Reads a floating-point setting.
+        :param name: The environment variable.
+        :type name: str
+        :param default: The value to use if it's missing or invalid.
+        :type default: float
+        :return: The setting.
+        :rtype: float
+        """
+        return cls._parse(name, default, float)
+
+    @classmethod
+    def choice(cls, name: str, default: str, choices: List[str]) -> str:
+        """
+        Reads a setting restricted to given values.
+        :param name: The environment variable.
+        :type name: str
+        :param default: The value to use if it's missing or invalid.
+        :type default: str
+        :param choices: The accepted values.
+        :type choices: List[str]
+        :return: The setting.
+        :rtype: str
+        """
+        result = default
+        value = os.environ.get(name, None)
+        if value is not None:
+            if value in choices:
+                result = value
+            else:
+                cls.logger().warning(f"Ignoring invalid {name}: {value}")
+        return result
+
+    @classmethod
+    def _parse(cls, name: str, default, parse: Callable):
+        """
+        Reads a setting with given parser.
+        :param name: The environment variable.
+        :type name: str
+        :param default: The value to use if it's missing or invalid.
+        :type default: Any
+        :param parse: The parser.
+        :type parse: Callable
+        :return: The setting.
+        :rtype: Any
+        """
+        result = default
+        value = os.environ.get(name, None)
+        if value is not None:
+            try:
+                result = parse(value)
+            except ValueError:
+                cls.logger().warning(f"Ignoring invalid {name}: {value}")
+        return result
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
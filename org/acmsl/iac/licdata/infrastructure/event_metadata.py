@@ -0,0 +1,65 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/event_metadata.py
+
+This script defines the EventMetadata class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Dict
+
+
+class EventMetadata:
+    """
+    Reads the options carried in the metadata of the requests.
+
+    Class name: EventMetadata
+
+    Responsibilities:
+        - Parse boolean flags, whether they come as booleans or strings.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.PulumiStackOperation
+        - org.acmsl.iac.licdata.infrastructure.azure.RequestAzureDockerImageDetails
+    """
+
+    TRUE_VALUES = ["true", "yes", "1", "on"]
+
+    @classmethod
+    def flag(cls, metadata: Dict, name: str) -> bool:
+        """
+        Reads a boolean flag from given event metadata.
+        :param metadata: The event metadata.
+        :type metadata: Dict
+        :param name: The name of the flag.
+        :type name: str
+        :return: True if the flag is set.
+        :rtype: bool
+        """
+        value = (metadata or {}).get(name, None)
+        if isinstance(value, str):
+            return value.strip().lower() in cls.TRUE_VALUES
+        return bool(value)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,100 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/lazy_exports.py
+
+This script defines the LazyExports class.
+
+Copyright (C) 2024-today acmsl/licdata-iac-infrastructure
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import importlib
+import sys
+from typing import Any, Dict, List
+
+
+class LazyExports:
+    """
+    Resolves the exports of a package on first access.
+
+    Class name: LazyExports
+
+    Responsibilities:
+        - Import the module of an export only when it's accessed, so importing
+          the package doesn't load the Pulumi and Azure SDKs until needed.
+        - List the exports not loaded yet.
+
+    Collaborators:
+        - The packages using it as their module-level __getattr__ and __dir__.
+    """
+
+    def __init__(self, packageName: str, exports: Dict[str, str]):
+        """
+        Creates a new LazyExports instance.
+        :param packageName: The name of the package.
+        :type packageName: str
+        :param exports: The module (relative to the package) defining each export.
+        :type exports: Dict[str, str]
+        """
+        super().__init__()
+        self._package_name = packageName
+        self._exports = exports
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Retrieves the names of the exports.
+        :return: Such names.
+        :rtype: List[str]
+        """
+        return list(self._exports.keys())
+
+    def attribute(self, name: str) -> Any:
+        """
+        Imports the module of given export, and caches the export in the package.
+        :param name: The name of the export.
+        :type name: str
+        :return: The export.
+        :rtype: Any
+        """
+        module = self._exports.get(name, None)
+        if module is None:
+            raise AttributeError(
+                f"module {self._package_name!r} has no attribute {name!r}"
+            )
+        result = getattr(
+            importlib.import_module(f".{module}", self._package_name), name
+        )
+        setattr(sys.modules[self._package_name], name, result)
+        return result
+
+    def attributes(self) -> List[str]:
+        """
+        Lists the attributes of the package, including the exports not loaded yet.
+        :return: Such attributes.
+        :rtype: List[str]
+        """
+        return sorted(
+            set(vars(sys.modules[self._package_name]).keys()) | set(self.names)
+        )
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
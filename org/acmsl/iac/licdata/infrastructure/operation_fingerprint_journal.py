@@ -0,0 +1,153 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/operation_fingerprint_journal.py
+
+This script defines the OperationFingerprintJournal class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .persisted_stack_records import PersistedStackRecords
+from pythoneda.shared import BaseObject
+import time
+from typing import Dict, Optional
+
+
+class OperationFingerprintJournal(BaseObject):
+    """
+    Remembers the inputs and result of the last successful operation on each stack.
+
+    Class name: OperationFingerprintJournal
+
+    Responsibilities:
+        - Record, per stack, the kind of the last successful operation, the
+          fingerprint of its inputs and the metadata of its result.
+        - Persist them, so replayed requests are recognized after a restart.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.PersistedStackRecords
+        - org.acmsl.iac.licdata.infrastructure.PulumiStackOperation
+    """
+
+    _singleton = None
+
+    def __init__(self, records: PersistedStackRecords = None):
+        """
+        Creates a new OperationFingerprintJournal instance.
+        :param records: The underlying records.
+        :type records: org.acmsl.iac.licdata.infrastructure.PersistedStackRecords
+        """
+        super().__init__()
+        if records is None:
+            records = PersistedStackRecords("operation-fingerprints.json")
+        self._records = records
+
+    @classmethod
+    def instance(cls) -> "OperationFingerprintJournal":
+        """
+        Retrieves the process-wide instance.
+        :return: Such instance.
+        :rtype: org.acmsl.iac.licdata.infrastructure.OperationFingerprintJournal
+        """
+        if cls._singleton is None:
+            cls._singleton = cls()
+        return cls._singleton
+
+    def matching_result(
+        self,
+        projectName: str,
+        stackName: str,
+        kind: str,
+        fingerprint: str,
+        window: float,
+    ) -> Optional[Dict]:
+        """
+        Retrieves the result of the last successful run, if its inputs had
+        given fingerprint and it finished within given window.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        :param kind: The kind of operation.
+        :type kind: str
+        :param fingerprint: The fingerprint of the inputs.
+        :type fingerprint: str
+        :param window: How old (in seconds) the run can be.
+        :type window: float
+        :return: The metadata of the result, or None if there's no match.
+        :rtype: Optional[Dict]
+        """
+        entry = (self._records.get(projectName, stackName) or {}).get(kind, None)
+        if (
+            entry is None
+            or entry.get("fingerprint", None) != fingerprint
+            or time.time() - entry.get("succeeded_at", 0) > window
+        ):
+            return None
+        return dict(entry.get("metadata", {}))
+
+    def record_success(
+        self,
+        projectName: str,
+        stackName: str,
+        kind: str,
+        fingerprint: str,
+        metadata: Dict,
+    ):
+        """
+        Records a successful run, replacing the runs of any kind recorded
+        for the stack, since they may no longer describe it.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        :param kind: The kind of operation.
+        :type kind: str
+        :param fingerprint: The fingerprint of the inputs.
+        :type fingerprint: str
+        :param metadata: The metadata of the result. It must be JSON-serializable.
+        :type metadata: Dict
+        """
+        self._records.put(
+            projectName,
+            stackName,
+            {
+                kind: {
+                    "fingerprint": fingerprint,
+                    "succeeded_at": time.time(),
+                    "metadata": dict(metadata or {}),
+                }
+            },
+        )
+
+    def forget(self, projectName: str, stackName: str):
+        """
+        Forgets given stack, i.e. after destroying it.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        """
+        self._records.remove(projectName, stackName)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,97 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/package_digest.py
+
+This script defines the PackageDigest class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import hashlib
+import os
+from pythoneda.shared import BaseObject
+import threading
+from typing import Dict, Tuple
+
+
+class PackageDigest(BaseObject):
+    """
+    Computes content digests of deployment packages.
+
+    Class name: PackageDigest
+
+    Responsibilities:
+        - Compute the SHA-256 of a package, streaming it in chunks so large
+          archives are never read into memory at once.
+        - Avoid re-hashing packages that haven't changed since last time.
+
+    Collaborators:
+        - None
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    _digests: Dict[Tuple[str, int, int], str] = {}
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def sha256(cls, path: str) -> str:
+        """
+        Retrieves the SHA-256 of given file, as a hex string.
+        :param path: The path of the file.
+        :type path: str
+        :return: The digest.
+        :rtype: str
+        """
+        real_path = os.path.realpath(path)
+        stat = os.stat(real_path)
+        key = (real_path, stat.st_size, stat.st_mtime_ns)
+        with cls._lock:
+            result = cls._digests.get(key, None)
+        if result is None:
+            digest = hashlib.sha256()
+            with open(real_path, "rb") as file:
+                for chunk in iter(lambda: file.read(cls.CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            result = digest.hexdigest()
+            with cls._lock:
+                cls._digests[key] = result
+        return result
+
+    @classmethod
+    def content_addressed_name(cls, path: str, length: int = 16) -> str:
+        """
+        Builds a name for given file that changes only when its content does,
+        i.e. "rest-0123456789abcdef.zip" for "./rest.zip".
+        :param path: The path of the file.
+        :type path: str
+        :param length: How many hex digits of the digest to use.
+        :type length: int
+        :return: The name.
+        :rtype: str
+        """
+        stem, extension = os.path.splitext(os.path.basename(path))
+        return f"{stem}-{cls.sha256(path)[:length]}{extension}"
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,197 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/persisted_stack_records.py
+
+This script defines the PersistedStackRecords class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+import os
+from pathlib import Path
+from pythoneda.shared import BaseObject
+import tempfile
+import threading
+from typing import Dict, Optional
+
+
+class PersistedStackRecords(BaseObject):
+    """
+    A small JSON file of records, one per (project, stack).
+
+    Class name: PersistedStackRecords
+
+    Responsibilities:
+        - Keep per-stack records across daemon restarts.
+        - Write them atomically, so a crash never leaves a truncated file.
+
+    Collaborators:
+        - None
+    """
+
+    def __init__(self, fileName: str, stateDir: str = None):
+        """
+        Creates a new PersistedStackRecords instance.
+        :param fileName: The name of the file.
+        :type fileName: str
+        :param stateDir: The folder of the file. Defaults to default_state_dir().
+        :type stateDir: str
+        """
+        super().__init__()
+        if stateDir is None:
+            stateDir = self.__class__.default_state_dir()
+        self._path = Path(stateDir) / fileName
+        self._records = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default_state_dir(cls) -> str:
+        """
+        Retrieves the folder where the records are stored by default:
+        LICDATA_IAC_STATE_DIR if defined, or licdata-iac under the XDG
+        state folder otherwise.
+        :return: Such folder.
+        :rtype: str
+        """
+        result = os.environ.get("LICDATA_IAC_STATE_DIR", None)
+        if result is None:
+            xdg_state_home = os.environ.get(
+                "XDG_STATE_HOME", os.path.join(Path.home(), ".local", "state")
+            )
+            result = os.path.join(xdg_state_home, "licdata-iac")
+        return result
+
+    @classmethod
+    def key_for(cls, projectName: str, stackName: str) -> str:
+        """
+        Builds the key of the record of given stack.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        :return: The key.
+        :rtype: str
+        """
+        return f"{projectName}/{stackName}"
+
+    @property
+    def path(self) -> Path:
+        """
+        Retrieves the path of the file.
+        :return: Such path.
+        :rtype: pathlib.Path
+        """
+        return self._path
+
+    def get(self, projectName: str, stackName: str) -> Optional[Dict]:
+        """
+        Retrieves the record of given stack.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        :return: The record, or None if missing.
+        :rtype: Optional[Dict]
+        """
+        with self._lock:
+            record = self._load().get(
+                self.__class__.key_for(projectName, stackName), None
+            )
+            return dict(record) if record is not None else None
+
+    def put(self, projectName: str, stackName: str, record: Dict):
+        """
+        Stores the record of given stack.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        :param record: The record. It must be JSON-serializable.
+        :type record: Dict
+        """
+        with self._lock:
+            self._load()[self.__class__.key_for(projectName, stackName)] = dict(record)
+            self._save()
+
+    def remove(self, projectName: str, stackName: str):
+        """
+        Removes the record of given stack, if any.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        """
+        with self._lock:
+            if (
+                self._load().pop(self.__class__.key_for(projectName, stackName), None)
+                is not None
+            ):
+                self._save()
+
+    def _load(self) -> Dict[str, Dict]:
+        """
+        Loads the records, if not loaded already.
+        :return: The records.
+        :rtype: Dict[str, Dict]
+        """
+        if self._records is None:
+            self._records = {}
+            try:
+                with open(self._path, "r", encoding="utf-8") as file:
+                    self._records = json.load(file)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                self.__class__.logger().warning(
+                    f"Ignoring unreadable records in {self._path}: {e}"
+                )
+        return self._records
+
+    def _save(self):
+        """
+        Writes the records to disk, atomically. A failed write leaves the
+        previous file, and no temporary file, behind.
+        """
+        tmp = None
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(
+                dir=self._path.parent, prefix=f".{self._path.name}."
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(self._records, file)
+            os.replace(tmp, self._path)
+            tmp = None
+        except (OSError, TypeError, ValueError) as e:
+            self.__class__.logger().warning(
+                f"Could not persist records in {self._path}: {e}"
+            )
+        finally:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,347 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/pulumi_plugin_cache.py
+
+This script defines the PulumiPluginCache class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+from .environment_setting import EnvironmentSetting
+import importlib.metadata
+import json
+import os
+from pathlib import Path
+from pulumi import automation as auto
+from .pulumi_stack_executor import PulumiStackExecutor
+from pythoneda.shared import BaseObject
+import shutil
+import subprocess
+import time
+from typing import Dict, Optional
+
+
+class PulumiPluginCache(BaseObject):
+    """
+    Makes sure the provider plugins are available before the first operation.
+
+    Class name: PulumiPluginCache
+
+    Responsibilities:
+        - Resolve and verify the pinned provider plugins once, at startup,
+          backing off after a failed attempt.
+        - Seed the plugin cache from a local folder, for offline hosts.
+        - Record how long it took.
+
+    Collaborators:
+        - pulumi.automation.LocalWorkspace: To install and list plugins.
+        - org.acmsl.iac.licdata.infrastructure.PulumiStackExecutor
+    """
+
+    # the Python SDK of each provider decides which plugin version the engine asks for
+    SDK_DISTRIBUTIONS = {"azure-native": "pulumi_azure_native"}
+
+    DEFAULT_RETRY_BACKOFF = 5 * 60
+
+    _singleton = None
+
+    def __init__(
+        self,
+        plugins: Dict[str, str] = None,
+        pulumiHome: str = None,
+        seedDir: str = None,
+        retryBackoff: float = None,
+    ):
+        """
+        Creates a new PulumiPluginCache instance.
+        :param plugins: The pinned resource plugins (name -> version). If
+        omitted, they're read from the JSON file in LICDATA_IAC_PULUMI_PLUGIN_MANIFEST,
+        defaulting to default_plugins().
+        :type plugins: Dict[str, str]
+        :param pulumiHome: The Pulumi home, whose plugins folder is the cache.
+        Defaults to LICDATA_IAC_PULUMI_HOME, or Pulumi's own default.
+        :type pulumiHome: str
+        :param seedDir: A folder with plugin archives or expanded plugin folders
+        to install from. Defaults to LICDATA_IAC_PULUMI_PLUGIN_SEED_DIR.
+        :type seedDir: str
+        :param retryBackoff: How long (in seconds) to wait before retrying a
+        failed warm-up. If omitted, it's read from the
+        LICDATA_IAC_PULUMI_PLUGIN_RETRY_BACKOFF environment variable,
+        defaulting to DEFAULT_RETRY_BACKOFF.
+        :type retryBackoff: float
+        """
+        super().__init__()
+        if plugins is None:
+            plugins = self.__class__.read_manifest(
+                os.environ.get("LICDATA_IAC_PULUMI_PLUGIN_MANIFEST", None)
+            )
+        self._plugins = plugins
+        if pulumiHome is None:
+            pulumiHome = os.environ.get("LICDATA_IAC_PULUMI_HOME", None)
+        self._pulumi_home = pulumiHome
+        if seedDir is None:
+            seedDir = os.environ.get("LICDATA_IAC_PULUMI_PLUGIN_SEED_DIR", None)
+        self._seed_dir = seedDir
+        if retryBackoff is None:
+            retryBackoff = EnvironmentSetting.number(
+                "LICDATA_IAC_PULUMI_PLUGIN_RETRY_BACKOFF",
+                self.__class__.DEFAULT_RETRY_BACKOFF,
+            )
+        self._retry_backoff = retryBackoff
+        self._failed_at = None
+        self._warm_up_future = None
+        self._warm_up_duration = None
+
+    @classmethod
+    def instance(cls) -> "PulumiPluginCache":
+        """
+        Retrieves the process-wide instance.
+        :return: Such instance.
+        :rtype: org.acmsl.iac.licdata.infrastructure.PulumiPluginCache
+        """
+        if cls._singleton is None:
+            cls._singleton = cls()
+        return cls._singleton
+
+    @classmethod
+    def default_plugins(cls) -> Dict[str, str]:
+        """
+        Retrieves the plugins matching the installed provider SDKs.
+        :return: The plugins (name -> version) of the SDKs in SDK_DISTRIBUTIONS
+        that are installed.
+        :rtype: Dict[str, str]
+        """
+        result = {}
+        for name, distribution in cls.SDK_DISTRIBUTIONS.items():
+            try:
+                result[name] = f"v{importlib.metadata.version(distribution)}"
+            except importlib.metadata.PackageNotFoundError:
+                cls.logger().info(
+                    f"{distribution} is not installed, not warming up its plugin"
+                )
+        return result
+
+    @classmethod
+    def read_manifest(cls, path: Optional[str]) -> Dict[str, str]:
+        """
+        Reads the pinned plugins from given JSON manifest.
+        :param path: The path of the manifest, if any.
+        :type path: Optional[str]
+        :return: The plugins (name -> version), default_plugins() if there's
+        no manifest, or none if it can't be read, so nothing is prewarmed.
+        :rtype: Dict[str, str]
+        """
+        if path is None:
+            return cls.default_plugins()
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                return {
+                    str(name): str(version) for name, version in json.load(file).items()
+                }
+        except (AttributeError, OSError, ValueError) as e:
+            cls.logger().warning(
+                f"Ignoring unreadable plugin manifest {path}, not warming up plugins: {e}"
+            )
+            return {}
+
+    @property
+    def plugins(self) -> Dict[str, str]:
+        """
+        Retrieves the pinned plugins.
+        :return: Such plugins (name -> version).
+        :rtype: Dict[str, str]
+        """
+        return self._plugins
+
+    @property
+    def pulumi_home(self) -> Optional[str]:
+        """
+        Retrieves the Pulumi home, if a specific one is used.
+        :return: Such folder.
+        :rtype: Optional[str]
+        """
+        return self._pulumi_home
+
+    @property
+    def warm_up_duration(self) -> Optional[float]:
+        """
+        Retrieves how long the warm-up took, in seconds.
+        :return: Such duration, or None if it hasn't finished.
+        :rtype: Optional[float]
+        """
+        return self._warm_up_duration
+
+    def workspace_options(self) -> Optional[auto.LocalWorkspaceOptions]:
+        """
+        Retrieves the workspace options pointing to the plugin cache.
+        :return: Such options, or None to use Pulumi's defaults.
+        :rtype: Optional[pulumi.automation.LocalWorkspaceOptions]
+        """
+        if self._pulumi_home is None:
+            return None
+        return auto.LocalWorkspaceOptions(pulumi_home=self._pulumi_home)
+
+    async def ensure_warm(self) -> bool:
+        """
+        Warms up the plugin cache, once per process. Concurrent callers share
+        the same warm-up. A failed one is retried by the first caller after
+        the retry backoff; callers before that don't wait for it.
+        :return: True if all pinned plugins are available.
+        :rtype: bool
+        """
+        if self._warm_up_future is None:
+            if (
+                self._failed_at is not None
+                and time.monotonic() - self._failed_at < self._retry_backoff
+            ):
+                return False
+            self._warm_up_future = asyncio.ensure_future(
+                PulumiStackExecutor.instance().run(self.warm_up)
+            )
+        future = self._warm_up_future
+        result = False
+        try:
+            result = await asyncio.shield(future)
+        except Exception as e:
+            self.__class__.logger().warning(f"Could not warm up Pulumi plugins: {e}")
+        if not result and self._warm_up_future is future:
+            self._warm_up_future = None
+            self._failed_at = time.monotonic()
+        return result
+
+    def warm_up(self) -> bool:
+        """
+        Installs the pinned plugins that are missing, and verifies them.
+        This call blocks.
+        :return: True if all pinned plugins are available.
+        :rtype: bool
+        """
+        start = time.monotonic()
+        workspace = auto.LocalWorkspace(pulumi_home=self._pulumi_home)
+        installed = self._installed(workspace)
+        for name, version in self._plugins.items():
+            if self.__class__._normalize(version) in installed.get(name, []):
+                continue
+            if not self._seed(name, version):
+                self.__class__.logger().info(
+                    f"Installing Pulumi plugin {name} {version}"
+                )
+                workspace.install_plugin(name, version)
+        installed = self._installed(workspace)
+        missing = [
+            f"{name} {version}"
+            for name, version in self._plugins.items()
+            if self.__class__._normalize(version) not in installed.get(name, [])
+        ]
+        self._warm_up_duration = time.monotonic() - start
+        if missing:
+            self.__class__.logger().warning(
+                f"Pulumi plugins still missing after {self._warm_up_duration:.2f}s: {', '.join(missing)}"
+            )
+        else:
+            self.__class__.logger().info(
+                f"Pulumi plugins ready in {self._warm_up_duration:.2f}s"
+            )
+        return len(missing) == 0
+
+    @classmethod
+    def _normalize(cls, version: str) -> str:
+        """
+        Normalizes a plugin version, so "v2.11.0" and "2.11.0" match.
+        :param version: The version.
+        :type version: str
+        :return: The normalized version.
+        :rtype: str
+        """
+        return str(version).lstrip("v")
+
+    def _installed(self, workspace: auto.LocalWorkspace) -> Dict[str, list]:
+        """
+        Lists the installed resource plugins.
+        :param workspace: The workspace.
+        :type workspace: pulumi.automation.LocalWorkspace
+        :return: The installed versions, per plugin name.
+        :rtype: Dict[str, list]
+        """
+        result = {}
+        for plugin in workspace.list_plugins():
+            if str(getattr(plugin.kind, "value", plugin.kind)) != "resource":
+                continue
+            result.setdefault(plugin.name, []).append(
+                self.__class__._normalize(plugin.version)
+            )
+        return result
+
+    def _seed(self, name: str, version: str) -> bool:
+        """
+        Installs a plugin from the seed folder, if it's there.
+        :param name: The name of the plugin.
+        :type name: str
+        :param version: The version of the plugin.
+        :type version: str
+        :return: True if the plugin was seeded.
+        :rtype: bool
+        """
+        if self._seed_dir is None:
+            return False
+        seed_dir = Path(self._seed_dir)
+        version = f"v{self.__class__._normalize(version)}"
+        expanded = seed_dir / f"resource-{name}-{version}"
+        if expanded.is_dir():
+            pulumi_home = Path(
+                self._pulumi_home or os.path.join(Path.home(), ".pulumi")
+            )
+            target = pulumi_home / "plugins" / expanded.name
+            self.__class__.logger().info(
+                f"Seeding Pulumi plugin {name} {version} from {expanded}"
+            )
+            shutil.copytree(expanded, target, dirs_exist_ok=True)
+            return True
+        archives = sorted(seed_dir.glob(f"pulumi-resource-{name}-{version}-*.tar.gz"))
+        if archives:
+            self.__class__.logger().info(
+                f"Seeding Pulumi plugin {name} {version} from {archives[0]}"
+            )
+            env = dict(os.environ)
+            if self._pulumi_home is not None:
+                env["PULUMI_HOME"] = self._pulumi_home
+            subprocess.run(
+                [
+                    "pulumi",
+                    "plugin",
+                    "install",
+                    "resource",
+                    name,
+                    version,
+                    "--file",
+                    str(archives[0]),
+                ],
+                check=True,
+                env=env,
+                capture_output=True,
+            )
+            return True
+        return False
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,108 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/pulumi_refresh_journal.py
+
+This script defines the PulumiRefreshJournal class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .persisted_stack_records import PersistedStackRecords
+from pythoneda.shared import BaseObject
+import time
+from typing import Optional
+
+
+class PulumiRefreshJournal(BaseObject):
+    """
+    Remembers when each stack was last brought in sync with the cloud.
+
+    Class name: PulumiRefreshJournal
+
+    Responsibilities:
+        - Record the time of the last successful refresh or up of each stack.
+        - Persist it, so redeploys after a restart can skip redundant refreshes.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.PersistedStackRecords
+        - org.acmsl.iac.licdata.infrastructure.RefreshPolicy
+    """
+
+    _singleton = None
+
+    def __init__(self, records: PersistedStackRecords = None):
+        """
+        Creates a new PulumiRefreshJournal instance.
+        :param records: The underlying records.
+        :type records: org.acmsl.iac.licdata.infrastructure.PersistedStackRecords
+        """
+        super().__init__()
+        if records is None:
+            records = PersistedStackRecords("refresh-journal.json")
+        self._records = records
+
+    @classmethod
+    def instance(cls) -> "PulumiRefreshJournal":
+        """
+        Retrieves the process-wide instance.
+        :return: Such instance.
+        :rtype: org.acmsl.iac.licdata.infrastructure.PulumiRefreshJournal
+        """
+        if cls._singleton is None:
+            cls._singleton = cls()
+        return cls._singleton
+
+    def last_refresh(self, projectName: str, stackName: str) -> Optional[float]:
+        """
+        Retrieves when given stack was last refreshed.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        :return: The time, in epoch seconds, or None if unknown.
+        :rtype: Optional[float]
+        """
+        record = self._records.get(projectName, stackName)
+        return record.get("refreshed_at", None) if record is not None else None
+
+    def record_refresh(self, projectName: str, stackName: str):
+        """
+        Records that given stack has just been refreshed (or brought up).
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        """
+        self._records.put(projectName, stackName, {"refreshed_at": time.time()})
+
+    def forget(self, projectName: str, stackName: str):
+        """
+        Forgets given stack, i.e. after destroying it.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        """
+        self._records.remove(projectName, stackName)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,214 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/pulumi_resource_timings.py
+
+This script defines the PulumiResourceTimings class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from pulumi import automation as auto
+from pythoneda.shared import BaseObject
+import threading
+import time
+from typing import Dict, List
+
+
+class PulumiResourceTimings(BaseObject):
+    """
+    Measures how long each resource takes, from the Pulumi engine events.
+
+    Class name: PulumiResourceTimings
+
+    Responsibilities:
+        - Record when each resource step starts and ends.
+        - Report the slowest resources and the critical path through the
+          dependency graph.
+
+    Collaborators:
+        - pulumi.automation.EngineEvent: The events it listens to.
+    """
+
+    def __init__(self):
+        """
+        Creates a new PulumiResourceTimings instance.
+        """
+        super().__init__()
+        self._spans = {}
+        self._lock = threading.Lock()
+
+    def on_event(self, event: auto.EngineEvent):
+        """
+        Records the start or end of a resource step. Meant to be used as
+        the on_event callback of up, refresh and destroy.
+        :param event: The engine event.
+        :type event: pulumi.automation.EngineEvent
+        """
+        now = time.monotonic()
+        if event.resource_pre_event is not None:
+            metadata = event.resource_pre_event.metadata
+            with self._lock:
+                self._spans[metadata.urn] = {
+                    "urn": metadata.urn,
+                    "type": metadata.type,
+                    "op": getattr(metadata.op, "value", metadata.op),
+                    "start": now,
+                    "end": None,
+                }
+        else:
+            ended = event.res_outputs_event or event.res_op_failed_event
+            if ended is not None:
+                with self._lock:
+                    span = self._spans.get(ended.metadata.urn, None)
+                    if span is not None and span["end"] is None:
+                        span["end"] = now
+                        span["failed"] = event.res_op_failed_event is not None
+
+    def durations(self) -> Dict[str, Dict]:
+        """
+        Retrieves the finished steps, with their durations.
+        :return: The steps, per URN.
+        :rtype: Dict[str, Dict]
+        """
+        with self._lock:
+            spans = [dict(span) for span in self._spans.values()]
+        result = {}
+        for span in spans:
+            if span["end"] is None:
+                continue
+            span["duration"] = span["end"] - span["start"]
+            result[span["urn"]] = span
+        return result
+
+    def report(
+        self,
+        dependencies: Dict[str, List[str]] = None,
+        limit: int = 5,
+        reverse: bool = False,
+    ) -> Dict:
+        """
+        Builds the timing report.
+        :param dependencies: The URNs each resource depends on.
+        :type dependencies: Dict[str, List[str]]
+        :param limit: How many of the slowest resources to include.
+        :type limit: int
+        :param reverse: Whether the steps ran in reverse dependency order, as
+        deletions do.
+        :type reverse: bool
+        :return: A report with the slowest resources and the critical path.
+        :rtype: Dict
+        """
+        dependencies = dependencies or {}
+        if reverse:
+            dependencies = self.__class__.reversed_dependencies(dependencies)
+        durations = self.durations()
+        slowest = sorted(
+            durations.values(), key=lambda span: span["duration"], reverse=True
+        )
+        critical_path, critical_duration = self.__class__.critical_path(
+            {urn: span["duration"] for urn, span in durations.items()},
+            dependencies,
+        )
+        result = {
+            "resources": len(durations),
+            "slowest": [
+                {
+                    "urn": span["urn"],
+                    "type": span["type"],
+                    "op": span["op"],
+                    "seconds": round(span["duration"], 3),
+                }
+                for span in slowest[:limit]
+            ],
+            "critical_path": critical_path,
+            "critical_path_seconds": round(critical_duration, 3),
+        }
+        if durations:
+            result["wall_seconds"] = round(
+                max(span["end"] for span in durations.values())
+                - min(span["start"] for span in durations.values()),
+                3,
+            )
+        return result
+
+    @classmethod
+    def reversed_dependencies(
+        cls, dependencies: Dict[str, List[str]]
+    ) -> Dict[str, List[str]]:
+        """
+        Reverses given dependency graph: a resource is deleted only after
+        the resources depending on it.
+        :param dependencies: The URNs each resource depends on.
+        :type dependencies: Dict[str, List[str]]
+        :return: The URNs that depend on each resource.
+        :rtype: Dict[str, List[str]]
+        """
+        result = {}
+        for urn, urns in dependencies.items():
+            for dependency in urns:
+                result.setdefault(dependency, []).append(urn)
+        return result
+
+    @classmethod
+    def critical_path(
+        cls, durations: Dict[str, float], dependencies: Dict[str, List[str]]
+    ) -> tuple:
+        """
+        Finds the longest chain of dependent resources, weighted by duration.
+        :param durations: The duration of each resource step.
+        :type durations: Dict[str, float]
+        :param dependencies: The URNs each resource depends on.
+        :type dependencies: Dict[str, List[str]]
+        :return: The URNs along the path (first to last), and its duration.
+        :rtype: tuple
+        """
+        best = {}
+
+        def longest(urn: str, visiting: set) -> tuple:
+            if urn in best:
+                return best[urn]
+            visiting.add(urn)
+            previous = (0.0, None)
+            for dependency in dependencies.get(urn, []):
+                if dependency in visiting:
+                    continue
+                candidate = longest(dependency, visiting)
+                if candidate[0] > previous[0]:
+                    previous = (candidate[0], dependency)
+            visiting.discard(urn)
+            best[urn] = (previous[0] + durations.get(urn, 0.0), previous[1])
+            return best[urn]
+
+        end, total = None, 0.0
+        for urn in durations.keys():
+            candidate = longest(urn, set())[0]
+            if candidate > total:
+                end, total = urn, candidate
+        path = []
+        while end is not None:
+            path.append(end)
+            end = best[end][1]
+        path.reverse()
+        return path, total
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
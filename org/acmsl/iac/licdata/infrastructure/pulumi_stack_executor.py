@@ -0,0 +1,121 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/pulumi_stack_executor.py
+
+This script defines the PulumiStackExecutor class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from .environment_setting import EnvironmentSetting
+from pythoneda.shared import BaseObject
+from typing import Any, Callable
+
+
+class PulumiStackExecutor(BaseObject):
+    """
+    Runs blocking Pulumi Automation API calls off the event loop.
+
+    Class name: PulumiStackExecutor
+
+    Responsibilities:
+        - Run blocking Pulumi calls in a bounded pool of worker threads.
+        - Let several stack operations progress concurrently without
+          freezing the PythonEDA event loop.
+
+    Collaborators:
+        - pulumi.automation: The blocking calls it runs.
+    """
+
+    DEFAULT_MAX_WORKERS = 4
+
+    _singleton = None
+
+    def __init__(self, maxWorkers: int = None):
+        """
+        Creates a new PulumiStackExecutor instance.
+        :param maxWorkers: The maximum number of concurrent Pulumi calls.
+        If omitted, it's read from the LICDATA_IAC_PULUMI_MAX_WORKERS
+        environment variable, defaulting to DEFAULT_MAX_WORKERS.
+        :type maxWorkers: int
+        """
+        super().__init__()
+        if maxWorkers is None:
+            maxWorkers = EnvironmentSetting.integer(
+                "LICDATA_IAC_PULUMI_MAX_WORKERS", self.__class__.DEFAULT_MAX_WORKERS
+            )
+        self._max_workers = max(1, maxWorkers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="pulumi-stack"
+        )
+
+    @classmethod
+    def instance(cls) -> "PulumiStackExecutor":
+        """
+        Retrieves the process-wide instance.
+        :return: Such instance.
+        :rtype: org.acmsl.iac.licdata.infrastructure.PulumiStackExecutor
+        """
+        if cls._singleton is None:
+            cls._singleton = cls()
+        return cls._singleton
+
+    @property
+    def max_workers(self) -> int:
+        """
+        Retrieves the maximum number of concurrent Pulumi calls.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._max_workers
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Runs given blocking function in the pool, and waits for it
+        without blocking the event loop.
+        :param func: The blocking function.
+        :type func: Callable
+        :param args: The positional arguments.
+        :type args: tuple
+        :param kwargs: The keyword arguments.
+        :type kwargs: dict
+        :return: What the function returns.
+        :rtype: Any
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self, wait: bool = True):
+        """
+        Shuts down the pool.
+        :param wait: Whether to wait for the running calls to finish.
+        :type wait: bool
+        """
+        self._executor.shutdown(wait=wait)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,760 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/pulumi_stack_operation.py
+
+This script defines the PulumiStackOperation class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+from .causal_chain import CausalChain
+from .event_metadata import EventMetadata
+import hashlib
+import json
+import os
+from .operation_fingerprint_journal import OperationFingerprintJournal
+from pulumi import automation as auto
+from .pulumi_plugin_cache import PulumiPluginCache
+from .pulumi_refresh_journal import PulumiRefreshJournal
+from .pulumi_resource_timings import PulumiResourceTimings
+from .pulumi_stack_executor import PulumiStackExecutor
+from .pulumi_workspace_pool import PulumiWorkspacePool
+from .refresh_policy import RefreshPolicy
+from .stack_operation_coalescer import StackOperationCoalescer
+from .stack_operation_scheduler import StackOperationScheduler
+from .stack_outputs_cache import StackOutputsCache
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+
+class PulumiStackOperation:
+    """
+    Behavior shared by the Pulumi-based stack operations.
+
+    Class name: PulumiStackOperation
+
+    Responsibilities:
+        - Run the Pulumi steps common to updates and removals, driven by the
+          event metadata.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.PulumiStackExecutor
+        - org.acmsl.iac.licdata.infrastructure.PulumiPluginCache
+        - org.acmsl.iac.licdata.infrastructure.PulumiWorkspacePool
+        - org.acmsl.iac.licdata.infrastructure.PulumiRefreshJournal
+        - org.acmsl.iac.licdata.infrastructure.RefreshPolicy
+        - org.acmsl.iac.licdata.infrastructure.PulumiResourceTimings
+        - org.acmsl.iac.licdata.infrastructure.StackOperationCoalescer
+        - org.acmsl.iac.licdata.infrastructure.StackOperationScheduler
+        - org.acmsl.iac.licdata.infrastructure.StackOutputsCache
+        - org.acmsl.iac.licdata.infrastructure.OperationFingerprintJournal
+        - org.acmsl.iac.licdata.infrastructure.CausalChain
+    """
+
+    # refresh and preview only read, and ARM grants a subscription several
+    # times more reads than writes, so they fan out twice as wide as up and
+    # destroy. These are starting points, not measurements: tune them with
+    # benchmarks/parallelism.py.
+    DEFAULT_PARALLELISM = {"refresh": 32, "preview": 32, "up": 16, "destroy": 16}
+
+    # replaying results is opt-in
+    DEFAULT_IDEMPOTENCY_WINDOW_MINUTES = 0
+
+    # metadata entries that change how an operation runs, not what it deploys
+    EXECUTION_METADATA = [
+        "early_registry_credentials",
+        "idempotency_window_minutes",
+        "parallel",
+        "preview_first",
+        "prewarm",
+        "refresh_max_age_minutes",
+        "refresh_policy",
+        "targeted",
+    ]
+
+    # result metadata entries describing a single run, not worth replaying
+    TRANSIENT_RESULT_METADATA = ["replayed", "resource_timings"]
+
+    _timing_report = None
+
+    _coalescer = None
+
+    _merged_event_ids = ()
+
+    _scheduler = None
+
+    # the names of the stacks got from _select_stack and not released yet
+    _selected_stacks = ()
+
+    @property
+    def pulumi_stack_name(self) -> str:
+        """
+        Retrieves the name of the Pulumi stack the operation works on.
+        :return: The stack name of the event.
+        :rtype: str
+        """
+        return self.event.stack_name
+
+    def coalesce_with(self, coalescer: StackOperationCoalescer):
+        """
+        Makes the operation merge with redundant requests for the same stack.
+        :param coalescer: The coalescer.
+        :type coalescer: org.acmsl.iac.licdata.infrastructure.StackOperationCoalescer
+        """
+        self._coalescer = coalescer
+
+    @property
+    def coalescing_key(self) -> Hashable:
+        """
+        Retrieves the key identifying the operations that can be merged.
+        :return: The kind of operation, project, stack and location.
+        :rtype: Hashable
+        """
+        return (
+            self.__class__.__name__,
+            self.event.project_name,
+            self.pulumi_stack_name,
+            self.event.location,
+        )
+
+    def schedule_with(self, scheduler: StackOperationScheduler):
+        """
+        Makes the operation wait for its turn in given scheduler.
+        :param scheduler: The scheduler.
+        :type scheduler: org.acmsl.iac.licdata.infrastructure.StackOperationScheduler
+        """
+        self._scheduler = scheduler
+
+    @property
+    def scheduling_key(self) -> Hashable:
+        """
+        Retrieves the key of the stack, whose operations run one at a time.
+        :return: The project and stack.
+        :rtype: Hashable
+        """
+        return (self.event.project_name, self.pulumi_stack_name)
+
+    @property
+    def scheduling_priority(self) -> str:
+        """
+        Retrieves the priority of the operation in the scheduler.
+        :return: StackOperationScheduler.UPDATE.
+        :rtype: str
+        """
+        return StackOperationScheduler.UPDATE
+
+    @property
+    def merged_event_ids(self) -> List[str]:
+        """
+        Retrieves the ids of the requests merged into this operation.
+        :return: Such ids.
+        :rtype: List[str]
+        """
+        return list(self._merged_event_ids)
+
+    def absorb(self, other: "PulumiStackOperation"):
+        """
+        Merges given superseded operation into this one.
+        :param other: The superseded operation.
+        :type other: org.acmsl.iac.licdata.infrastructure.PulumiStackOperation
+        """
+        self._merged_event_ids = CausalChain.extend(
+            [other.event.id] + other.merged_event_ids, self.merged_event_ids
+        )
+
+    def _previous_event_ids(self) -> List[str]:
+        """
+        Builds the previous event ids of the events emitted by the operation:
+        the request, the requests merged into it, and their ancestors.
+        :return: Such ids, bounded by CausalChain.
+        :rtype: List[str]
+        """
+        return CausalChain.extend(
+            [self.event.id] + self.merged_event_ids, self.event.previous_event_ids
+        )
+
+    async def _coalesced(
+        self, perform: Callable[[], Awaitable[Any]], superseded: Any = None
+    ) -> Any:
+        """
+        Performs the operation, merging it with redundant requests if a
+        coalescer is in use.
+        :param perform: The function that actually performs the operation.
+        :type perform: Callable[[], Awaitable[Any]]
+        :param superseded: What to return if a later request supersedes this one.
+        :type superseded: Any
+        :return: What perform returns, or superseded.
+        :rtype: Any
+        """
+        if self._coalescer is None:
+            return await self._scheduled(perform)
+
+        async def scheduled():
+            return await self._scheduled(perform)
+
+        return await self._coalescer.run(
+            self.coalescing_key, self, scheduled, superseded
+        )
+
+    async def _scheduled(
+        self, perform: Callable[[], Awaitable[Any]], key: Hashable = None
+    ) -> Any:
+        """
+        Performs the operation once the scheduler, if any, gives it its turn.
+        :param perform: The function that actually performs the operation.
+        :type perform: Callable[[], Awaitable[Any]]
+        :param key: The key of the stack to wait for. Defaults to scheduling_key.
+        :type key: Hashable
+        :return: What perform returns.
+        :rtype: Any
+        """
+        try:
+            if self._scheduler is None:
+                return await perform()
+            return await self._scheduler.run(
+                key if key is not None else self.scheduling_key,
+                self.scheduling_priority,
+                perform,
+            )
+        finally:
+            while self._selected_stacks:
+                self._release_stack(self._selected_stacks[-1])
+
+    @classmethod
+    def metadata_flag(cls, metadata: Dict, name: str) -> bool:
+        """
+        Reads a boolean flag from given event metadata.
+        :param metadata: The event metadata.
+        :type metadata: Dict
+        :param name: The name of the flag.
+        :type name: str
+        :return: True if the flag is set.
+        :rtype: bool
+        """
+        return EventMetadata.flag(metadata, name)
+
+    def _metadata_flag(self, name: str) -> bool:
+        """
+        Reads a boolean flag from the event metadata.
+        :param name: The name of the flag.
+        :type name: str
+        :return: True if the flag is set.
+        :rtype: bool
+        """
+        return self.__class__.metadata_flag(self.event.metadata, name)
+
+    @property
+    def preview_first(self) -> bool:
+        """
+        Checks whether a preview should run first, to skip no-op updates.
+        :return: True in such case.
+        :rtype: bool
+        """
+        return self._metadata_flag("preview_first")
+
+    @property
+    def layered(self) -> bool:
+        """
+        Checks whether the Docker resources live in their own stack, apart
+        from the infrastructure they depend on.
+        :return: True in such case.
+        :rtype: bool
+        """
+        return self._metadata_flag("layered")
+
+    def parallelism(self, step: str) -> int:
+        """
+        Retrieves how many resource operations the engine may run in parallel
+        in given step. It's read from the "<step>_parallel" metadata entry,
+        then from "parallel", defaulting to DEFAULT_PARALLELISM.
+        :param step: The step: refresh, preview, up or destroy.
+        :type step: str
+        :return: The parallelism.
+        :rtype: int
+        """
+        metadata = self.event.metadata or {}
+        for name in [f"{step}_parallel", "parallel"]:
+            value = metadata.get(name, None)
+            if value is None:
+                continue
+            try:
+                return max(1, int(value))
+            except (TypeError, ValueError):
+                self.__class__.logger().warning(f"Ignoring invalid {name}: {value}")
+        return self.__class__.DEFAULT_PARALLELISM.get(step, None)
+
+    @property
+    def refresh_policy(self) -> RefreshPolicy:
+        """
+        Retrieves the refresh policy requested in the event metadata.
+        :return: Such policy.
+        :rtype: org.acmsl.iac.licdata.infrastructure.RefreshPolicy
+        """
+        return RefreshPolicy.from_metadata(self.event.metadata)
+
+    @property
+    def idempotency_window(self) -> float:
+        """
+        Retrieves how long (in seconds) the result of a successful operation
+        answers identical requests. It's read from the
+        "idempotency_window_minutes" metadata entry, then from the
+        LICDATA_IAC_IDEMPOTENCY_WINDOW_MINUTES environment variable,
+        defaulting to DEFAULT_IDEMPOTENCY_WINDOW_MINUTES. Zero disables it.
+        :return: Such window.
+        :rtype: float
+        """
+        for value in [
+            (self.event.metadata or {}).get("idempotency_window_minutes", None),
+            os.environ.get("LICDATA_IAC_IDEMPOTENCY_WINDOW_MINUTES", None),
+        ]:
+            if value is None:
+                continue
+            try:
+                return max(0.0, float(value)) * 60
+            except (TypeError, ValueError):
+                self.__class__.logger().warning(
+                    f"Ignoring invalid idempotency window: {value}"
+                )
+        return self.__class__.DEFAULT_IDEMPOTENCY_WINDOW_MINUTES * 60
+
+    def _fingerprint_inputs(self) -> Dict[str, Any]:
+        """
+        Retrieves the inputs that determine what the operation deploys.
+        Subclasses extend them with any other input of their program.
+        :return: The kind of operation, project, stack, location and the
+        event metadata, but the entries in EXECUTION_METADATA.
+        :rtype: Dict[str, Any]
+        """
+        metadata = {
+            name: value
+            for name, value in (self.event.metadata or {}).items()
+            if name not in self.__class__.EXECUTION_METADATA
+            and not name.endswith("_parallel")
+        }
+        return {
+            "kind": self.__class__.__name__,
+            "project": self.event.project_name,
+            "stack": self.pulumi_stack_name,
+            "location": self.event.location,
+            "metadata": metadata,
+        }
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Retrieves the fingerprint of the inputs of the operation.
+        :return: The SHA-256 of the normalized inputs, as hex.
+        :rtype: str
+        """
+        normalized = json.dumps(
+            self._fingerprint_inputs(),
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def _replayed_metadata(self) -> Optional[Dict]:
+        """
+        Retrieves the metadata of the result of the last successful operation
+        with the same inputs, if it's recent enough to answer this one
+        without running Pulumi.
+        :return: Such metadata, flagged with "replayed", or None.
+        :rtype: Optional[Dict]
+        """
+        window = self.idempotency_window
+        if window <= 0:
+            return None
+        result = OperationFingerprintJournal.instance().matching_result(
+            self.event.project_name,
+            self.pulumi_stack_name,
+            self.__class__.__name__,
+            self.fingerprint,
+            window,
+        )
+        if result is not None:
+            self.__class__.logger().info(
+                f"Stack {self.pulumi_stack_name} was updated with the same inputs recently, replaying its result"
+            )
+            result["replayed"] = True
+        return result
+
+    def _record_success(self, metadata: Dict):
+        """
+        Records the result of a successful operation, to answer replayed
+        requests. The stack may have changed since any other result was
+        recorded, so only this one is kept.
+        :param metadata: The metadata of the resulting event.
+        :type metadata: Dict
+        """
+        if self.idempotency_window <= 0:
+            OperationFingerprintJournal.instance().forget(
+                self.event.project_name, self.pulumi_stack_name
+            )
+        else:
+            OperationFingerprintJournal.instance().record_success(
+                self.event.project_name,
+                self.pulumi_stack_name,
+                self.__class__.__name__,
+                self.fingerprint,
+                {
+                    name: value
+                    for name, value in metadata.items()
+                    if name not in self.__class__.TRANSIENT_RESULT_METADATA
+                },
+            )
+
+    async def _select_stack(
+        self, program: Callable, stackName: str = None
+    ) -> auto.Stack:
+        """
+        Selects (or creates) the stack, reusing its pooled workspace if any.
+        :param program: The inline program.
+        :type program: Callable
+        :param stackName: The name of the stack. Defaults to pulumi_stack_name.
+        :type stackName: str
+        :return: The stack.
+        :rtype: pulumi.automation.Stack
+        """
+        if stackName is None:
+            stackName = self.pulumi_stack_name
+        await PulumiPluginCache.instance().ensure_warm()
+        result = await PulumiStackExecutor.instance().run(
+            PulumiWorkspacePool.instance().stack_for,
+            self.event.project_name,
+            stackName,
+            program,
+            {"azure-native:location": self.event.location},
+        )
+        self._selected_stacks = self._selected_stacks + (stackName,)
+        return result
+
+    def _release_stack(self, stackName: str = None):
+        """
+        Gives back a stack handle got from _select_stack to the pool.
+        :param stackName: The name of the stack. Defaults to pulumi_stack_name.
+        :type stackName: str
+        """
+        if stackName is None:
+            stackName = self.pulumi_stack_name
+        if stackName in self._selected_stacks:
+            selected = list(self._selected_stacks)
+            selected.remove(stackName)
+            self._selected_stacks = tuple(selected)
+            PulumiWorkspacePool.instance().release(self.event.project_name, stackName)
+
+    async def _refresh_if_needed(
+        self, stack: auto.Stack, targets: List[str] = None, stackName: str = None
+    ) -> bool:
+        """
+        Refreshes the stack, unless the refresh policy says it's not needed.
+        :param stack: The stack.
+        :type stack: pulumi.automation.Stack
+        :param targets: The URNs to restrict the refresh to, if any.
+        :type targets: List[str]
+        :param stackName: The name of the stack. Defaults to pulumi_stack_name.
+        :type stackName: str
+        :return: True if the stack got refreshed.
+        :rtype: bool
+        """
+        if stackName is None:
+            stackName = self.pulumi_stack_name
+        journal = PulumiRefreshJournal.instance()
+        policy = self.refresh_policy
+        if not policy.should_refresh(
+            journal.last_refresh(self.event.project_name, stackName)
+        ):
+            self.__class__.logger().info(
+                f"Skipping refresh of {self.event.project_name}/{stackName} (policy: {policy.mode.value})"
+            )
+            return False
+
+        await self._before_step("refresh")
+        await PulumiStackExecutor.instance().run(
+            stack.refresh,
+            on_output=self.__class__.logger().debug,
+            target=targets,
+            parallel=self.parallelism("refresh"),
+        )
+        self._step_succeeded("refresh")
+        if not targets:
+            journal.record_refresh(self.event.project_name, stackName)
+        return True
+
+    async def _preview_is_no_op(
+        self, stack: auto.Stack, program: Callable, targets: List[str] = None
+    ) -> bool:
+        """
+        Previews the update, to find out whether it would change anything.
+        :param stack: The stack.
+        :type stack: pulumi.automation.Stack
+        :param program: The inline program.
+        :type program: Callable
+        :param targets: The URNs to restrict the preview to, if any.
+        :type targets: List[str]
+        :return: True if every resource would stay the same.
+        :rtype: bool
+        """
+        await self._before_step("preview")
+        preview = await PulumiStackExecutor.instance().run(
+            stack.preview,
+            on_output=self.__class__.logger().debug,
+            program=program,
+            target=targets,
+            target_dependents=True if targets else None,
+            parallel=self.parallelism("preview"),
+        )
+        self._step_succeeded("preview")
+        changes = {
+            getattr(op, "value", op): count
+            for op, count in (preview.change_summary or {}).items()
+            if count
+        }
+        result = all(op == "same" for op in changes.keys())
+        if result:
+            self.__class__.logger().info(
+                f"Preview of {self.event.project_name}/{self.pulumi_stack_name} reports no changes, skipping up"
+            )
+        else:
+            self.__class__.logger().debug(f"Preview changes: {changes}")
+        return result
+
+    async def _urns_of_types(self, stack: auto.Stack, types: List[str]) -> List[str]:
+        """
+        Finds the URNs of the deployed resources of given types.
+        :param stack: The stack.
+        :type stack: pulumi.automation.Stack
+        :param types: The Pulumi resource types, i.e. "azure-native:web:WebApp".
+        :type types: List[str]
+        :return: The URNs. Empty if the stack hasn't deployed any of them yet.
+        :rtype: List[str]
+        """
+        deployment = await PulumiStackExecutor.instance().run(stack.export_stack)
+        resources = (deployment.deployment or {}).get("resources", None) or []
+        return [
+            resource["urn"]
+            for resource in resources
+            if resource.get("type", None) in types and "urn" in resource
+        ]
+
+    @property
+    def timing_report(self) -> Dict:
+        """
+        Retrieves the per-resource timing report of the last up or destroy.
+        :return: Such report, or None if not available.
+        :rtype: Dict
+        """
+        return self._timing_report
+
+    async def _resource_dependencies(self, stack: auto.Stack) -> Dict[str, List[str]]:
+        """
+        Retrieves the dependency graph of the deployed resources.
+        :param stack: The stack.
+        :type stack: pulumi.automation.Stack
+        :return: The URNs each resource depends on.
+        :rtype: Dict[str, List[str]]
+        """
+        deployment = await PulumiStackExecutor.instance().run(stack.export_stack)
+        resources = (deployment.deployment or {}).get("resources", None) or []
+        return {
+            resource["urn"]: resource.get("dependencies", None) or []
+            for resource in resources
+            if "urn" in resource
+        }
+
+    def _report_timings(
+        self,
+        timings: PulumiResourceTimings,
+        dependencies: Dict[str, List[str]],
+        step: str,
+    ) -> Dict:
+        """
+        Builds the timing report of the operation. It includes the
+        parallelism of the step, so deploy times can be compared across
+        parallelism levels.
+        :param timings: The timings collected from the engine events.
+        :type timings: org.acmsl.iac.licdata.infrastructure.PulumiResourceTimings
+        :param dependencies: The URNs each resource depends on.
+        :type dependencies: Dict[str, List[str]]
+        :param step: The step: up or destroy.
+        :type step: str
+        :return: The report.
+        :rtype: Dict
+        """
+        # deletions run in reverse dependency order
+        self._timing_report = timings.report(dependencies, reverse=step == "destroy")
+        self._timing_report["step"] = step
+        self._timing_report["parallel"] = self.parallelism(step)
+        self.__class__.logger().info(
+            f"timings: \n{json.dumps(self._timing_report, indent=4)}"
+        )
+        return self._timing_report
+
+    def _result_metadata(self, noOp: bool = False) -> Dict:
+        """
+        Builds the metadata of the resulting event.
+        :param noOp: Whether the operation turned out to be a no-op.
+        :type noOp: bool
+        :return: A copy of the request metadata, flagged with "no_op" if
+        needed, and with the "resource_timings" report (as JSON) if available.
+        :rtype: Dict
+        """
+        result = dict(self.event.metadata or {})
+        if noOp:
+            result["no_op"] = True
+        if self._timing_report is not None:
+            result["resource_timings"] = json.dumps(self._timing_report)
+        return result
+
+    def _engine_event_handler(
+        self, timings: PulumiResourceTimings
+    ) -> Callable[[auto.EngineEvent], None]:
+        """
+        Builds the engine event callback of a step. It must be called from
+        the event loop, since the callback runs in a Pulumi thread.
+        :param timings: The timings to feed.
+        :type timings: org.acmsl.iac.licdata.infrastructure.PulumiResourceTimings
+        :return: The callback.
+        :rtype: Callable[[pulumi.automation.EngineEvent], None]
+        """
+        loop = asyncio.get_running_loop()
+
+        def on_event(event: auto.EngineEvent):
+            timings.on_event(event)
+            self._on_engine_event(event, loop)
+
+        return on_event
+
+    def _on_engine_event(
+        self, event: auto.EngineEvent, loop: asyncio.AbstractEventLoop
+    ):
+        """
+        Notifies an engine event, while the step is still running. It's called
+        from a Pulumi thread, so subclasses must hand any async work over to
+        given loop.
+        :param event: The engine event.
+        :type event: pulumi.automation.EngineEvent
+        :param loop: The event loop of the operation.
+        :type loop: asyncio.AbstractEventLoop
+        """
+        pass
+
+    async def _before_step(self, step: str):
+        """
+        Waits until given step may start. Subclasses override it to pace the
+        steps against the rate limits of the cloud provider.
+        :param step: The step: refresh, preview, up or destroy.
+        :type step: str
+        """
+        pass
+
+    def _step_succeeded(self, step: str):
+        """
+        Notifies that given step has completed. Subclasses override it to
+        let the pacing recover once the provider stops throttling.
+        :param step: The step: refresh, preview, up or destroy.
+        :type step: str
+        """
+        pass
+
+    def _operation_failed(self, error: Exception):
+        """
+        Notifies that a Pulumi step failed. The stack may have been left
+        half-updated, so no earlier result can answer a replayed request.
+        :param error: The error.
+        :type error: Exception
+        """
+        OperationFingerprintJournal.instance().forget(
+            self.event.project_name, self.pulumi_stack_name
+        )
+
+    def _stack_changed(self):
+        """
+        Notifies that the operation has changed the deployed resources, so
+        anything cached about them can be discarded.
+        """
+        pass
+
+    def _record_outputs(self, outputs: auto.OutputMap):
+        """
+        Caches the outputs of the stack.
+        :param outputs: The outputs.
+        :type outputs: pulumi.automation.OutputMap
+        """
+        StackOutputsCache.instance().store(
+            self.event.project_name, self.pulumi_stack_name, outputs
+        )
+
+    async def _cached_outputs(
+        self, program: Callable, stack: auto.Stack = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieves the outputs of the stack from the cache, reading (only)
+        the outputs of the stack if they are not cached.
+        :param program: The inline program, to select the stack if needed.
+        :type program: Callable
+        :param stack: The stack, if already selected.
+        :type stack: pulumi.automation.Stack
+        :return: The value of each output.
+        :rtype: Dict[str, Any]
+        """
+        result = StackOutputsCache.instance().get(
+            self.event.project_name, self.pulumi_stack_name
+        )
+        if result is None:
+            selected = stack is None
+            if selected:
+                stack = await self._select_stack(program)
+            try:
+                outputs = await PulumiStackExecutor.instance().run(stack.outputs)
+            finally:
+                if selected:
+                    self._release_stack()
+            self._record_outputs(outputs)
+            result = {name: output.value for name, output in outputs.items()}
+        return result
+
+    def _record_stack_in_sync(self):
+        """
+        Records that the stack has just been brought in sync with the cloud.
+        """
+        PulumiRefreshJournal.instance().record_refresh(
+            self.event.project_name, self.pulumi_stack_name
+        )
+
+    def _forget_stack(self, stackName: str = None):
+        """
+        Forgets what's known about the stack, i.e. after destroying it.
+        :param stackName: The name of the stack. Defaults to pulumi_stack_name.
+        :type stackName: str
+        """
+        if stackName is None:
+            stackName = self.pulumi_stack_name
+        PulumiRefreshJournal.instance().forget(self.event.project_name, stackName)
+        PulumiWorkspacePool.instance().evict(self.event.project_name, stackName)
+        StackOutputsCache.instance().forget(self.event.project_name, stackName)
+        OperationFingerprintJournal.instance().forget(
+            self.event.project_name, stackName
+        )
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
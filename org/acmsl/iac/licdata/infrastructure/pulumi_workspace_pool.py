@@ -0,0 +1,257 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/pulumi_workspace_pool.py
+
+This script defines the PulumiWorkspacePool class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .environment_setting import EnvironmentSetting
+import os
+from pulumi import automation as auto
+from .pulumi_plugin_cache import PulumiPluginCache
+from pythoneda.shared import BaseObject
+import shutil
+import tempfile
+import threading
+import time
+from typing import Callable, Dict
+
+
+class PulumiWorkspacePool(BaseObject):
+    """
+    Keeps Pulumi stack handles alive across operations.
+
+    Class name: PulumiWorkspacePool
+
+    Responsibilities:
+        - Reuse the workspace of each (project, stack), with its settings and
+          config, instead of creating a new one for every operation.
+        - Evict the workspaces that have been idle for too long, but never
+          while an operation still uses them.
+
+    Collaborators:
+        - pulumi.automation.Stack: The pooled handles.
+        - org.acmsl.iac.licdata.infrastructure.PulumiPluginCache
+    """
+
+    DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+    _singleton = None
+
+    def __init__(self, idleTimeout: float = None):
+        """
+        Creates a new PulumiWorkspacePool instance.
+        :param idleTimeout: How long (in seconds) an unused workspace is kept.
+        If omitted, it's read from the LICDATA_IAC_WORKSPACE_IDLE_TIMEOUT
+        environment variable, defaulting to DEFAULT_IDLE_TIMEOUT.
+        :type idleTimeout: float
+        """
+        super().__init__()
+        if idleTimeout is None:
+            idleTimeout = EnvironmentSetting.number(
+                "LICDATA_IAC_WORKSPACE_IDLE_TIMEOUT",
+                self.__class__.DEFAULT_IDLE_TIMEOUT,
+            )
+        self._idle_timeout = idleTimeout
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def instance(cls) -> "PulumiWorkspacePool":
+        """
+        Retrieves the process-wide instance.
+        :return: Such instance.
+        :rtype: org.acmsl.iac.licdata.infrastructure.PulumiWorkspacePool
+        """
+        if cls._singleton is None:
+            cls._singleton = cls()
+        return cls._singleton
+
+    @property
+    def hits(self) -> int:
+        """
+        Retrieves how many times a pooled workspace was reused.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Retrieves how many times a workspace had to be created.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._misses
+
+    def stack_for(
+        self,
+        projectName: str,
+        stackName: str,
+        program: Callable,
+        config: Dict[str, str],
+    ) -> auto.Stack:
+        """
+        Retrieves the stack handle for given project and stack, creating it
+        if needed. This call blocks.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        :param program: The inline program.
+        :type program: Callable
+        :param config: The stack config.
+        :type config: Dict[str, str]
+        :return: The stack.
+        :rtype: pulumi.automation.Stack
+        """
+        self.evict_idle()
+        key = (projectName, stackName)
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        if entry is None:
+            entry = {
+                "stack": auto.create_or_select_stack(
+                    stack_name=stackName,
+                    project_name=projectName,
+                    program=program,
+                    opts=PulumiPluginCache.instance().workspace_options(),
+                ),
+                "config": {},
+                "lock": threading.Lock(),
+            }
+            with self._lock:
+                entry = self._entries.setdefault(key, entry)
+        stack = entry["stack"]
+        with entry["lock"]:
+            stack.workspace.program = program
+            for name, value in config.items():
+                if entry["config"].get(name, None) != value:
+                    stack.set_config(name, auto.ConfigValue(value=value))
+                    entry["config"][name] = value
+            entry["last_used"] = time.monotonic()
+            entry["in_use"] = entry.get("in_use", 0) + 1
+        return stack
+
+    def stack_exists(self, projectName: str, stackName: str) -> bool:
+        """
+        Checks whether given stack exists in the backend, without creating it.
+        This call blocks.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        :return: True in such case.
+        :rtype: bool
+        """
+        with self._lock:
+            if (projectName, stackName) in self._entries:
+                return True
+        workspace = auto.LocalWorkspace(
+            pulumi_home=PulumiPluginCache.instance().pulumi_home,
+            project_settings=auto.ProjectSettings(name=projectName, runtime="python"),
+        )
+        try:
+            # backends may qualify the names with the organization and project
+            return any(
+                summary.name.split("/")[-1] == stackName
+                for summary in workspace.list_stacks()
+            )
+        finally:
+            self._remove_work_dir(workspace)
+
+    def release(self, projectName: str, stackName: str):
+        """
+        Notifies that an operation is done with the stack handle it got from
+        stack_for, so the idle timeout starts counting from now.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        """
+        with self._lock:
+            entry = self._entries.get((projectName, stackName), None)
+        if entry is not None:
+            with entry["lock"]:
+                entry["in_use"] = max(0, entry.get("in_use", 0) - 1)
+                entry["last_used"] = time.monotonic()
+
+    def evict(self, projectName: str, stackName: str):
+        """
+        Evicts the workspace of given stack, if pooled.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        """
+        with self._lock:
+            entry = self._entries.pop((projectName, stackName), None)
+        if entry is not None:
+            self._dispose(entry)
+
+    def evict_idle(self):
+        """
+        Evicts the workspaces not used within the idle timeout, and not in
+        use right now.
+        """
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                key
+                for key, entry in self._entries.items()
+                if entry.get("in_use", 0) == 0
+                and now - entry.get("last_used", now) > self._idle_timeout
+            ]
+            entries = [self._entries.pop(key) for key in idle]
+        for entry in entries:
+            self._dispose(entry)
+
+    def _dispose(self, entry: Dict):
+        """
+        Releases the resources of an evicted workspace.
+        :param entry: The pool entry.
+        :type entry: Dict
+        """
+        self._remove_work_dir(entry["stack"].workspace)
+
+    def _remove_work_dir(self, workspace: auto.LocalWorkspace):
+        """
+        Removes the work dir of given workspace, if it's a temporary one.
+        :param workspace: The workspace.
+        :type workspace: pulumi.automation.LocalWorkspace
+        """
+        work_dir = workspace.work_dir
+        # inline programs get a temporary work dir, which nobody else removes
+        if work_dir and os.path.dirname(work_dir) == tempfile.gettempdir():
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,130 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/refresh_policy.py
+
+This script defines the RefreshPolicy class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .refresh_mode import RefreshMode
+from pythoneda.shared import BaseObject
+import time
+from typing import Dict, Optional
+
+
+class RefreshPolicy(BaseObject):
+    """
+    Decides whether a stack needs to be refreshed before an up or destroy.
+
+    Class name: RefreshPolicy
+
+    Responsibilities:
+        - Read the refresh settings from the event metadata.
+        - Tell whether the last known refresh is recent enough to skip another one.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.RefreshMode
+        - org.acmsl.iac.licdata.infrastructure.PulumiRefreshJournal
+    """
+
+    DEFAULT_MAX_AGE_MINUTES = 30
+
+    def __init__(self, mode: RefreshMode, maxAgeMinutes: float = None):
+        """
+        Creates a new RefreshPolicy instance.
+        :param mode: The refresh mode.
+        :type mode: org.acmsl.iac.licdata.infrastructure.RefreshMode
+        :param maxAgeMinutes: For RefreshMode.IF_STALE, how old the last refresh can be.
+        :type maxAgeMinutes: float
+        """
+        super().__init__()
+        self._mode = mode
+        if maxAgeMinutes is None:
+            maxAgeMinutes = self.__class__.DEFAULT_MAX_AGE_MINUTES
+        self._max_age_minutes = maxAgeMinutes
+
+    @classmethod
+    def from_metadata(cls, metadata: Dict) -> "RefreshPolicy":
+        """
+        Builds the policy from the "refresh_policy" and "refresh_max_age_minutes"
+        entries of given metadata. Missing or invalid values mean RefreshMode.ALWAYS.
+        :param metadata: The event metadata.
+        :type metadata: Dict
+        :return: The policy.
+        :rtype: org.acmsl.iac.licdata.infrastructure.RefreshPolicy
+        """
+        metadata = metadata or {}
+        mode = RefreshMode.ALWAYS
+        value = metadata.get("refresh_policy", None)
+        if value is not None:
+            try:
+                mode = RefreshMode(str(value).lower())
+            except ValueError:
+                cls.logger().warning(f"Unknown refresh policy {value}, using always")
+        max_age = metadata.get("refresh_max_age_minutes", None)
+        if max_age is not None:
+            try:
+                max_age = float(max_age)
+            except ValueError:
+                cls.logger().warning(
+                    f"Invalid refresh max age {max_age}, using {cls.DEFAULT_MAX_AGE_MINUTES}"
+                )
+                max_age = None
+        return cls(mode, max_age)
+
+    @property
+    def mode(self) -> RefreshMode:
+        """
+        Retrieves the refresh mode.
+        :return: Such mode.
+        :rtype: org.acmsl.iac.licdata.infrastructure.RefreshMode
+        """
+        return self._mode
+
+    @property
+    def max_age_minutes(self) -> float:
+        """
+        Retrieves the maximum age of the last refresh, in minutes.
+        :return: Such age.
+        :rtype: float
+        """
+        return self._max_age_minutes
+
+    def should_refresh(self, lastRefresh: Optional[float]) -> bool:
+        """
+        Checks whether the stack needs to be refreshed.
+        :param lastRefresh: When the last successful refresh or up finished (epoch seconds), if known.
+        :type lastRefresh: Optional[float]
+        :return: True in such case.
+        :rtype: bool
+        """
+        if self._mode == RefreshMode.ALWAYS:
+            return True
+        if self._mode == RefreshMode.NEVER:
+            return False
+        if lastRefresh is None:
+            return True
+        return (time.time() - lastRefresh) > self._max_age_minutes * 60
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -20,6 +20,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 import abc
+from .causal_chain import CausalChain
 from pulumi import automation as auto
 from pulumi.automation.errors import CommandError
 from pythoneda.shared import Event
@@ -70,14 +71,14 @@ class RemoveDockerResourcesWithPulumi(RemoveDockerResources, abc.ABC):
                 self.event.stack_name,
                 self.event.project_name,
                 self.event.location,
-                [self.event.id] + self.event.previous_event_ids,
+                CausalChain.of(self.event),
             )
         else:
             result = DockerResourcesRemovalFailed(
                 self.event.stack_name,
                 self.event.project_name,
                 self.event.location,
-                [self.event.id] + self.event.previous_event_ids,
+                CausalChain.of(self.event),
             )
 
         return result
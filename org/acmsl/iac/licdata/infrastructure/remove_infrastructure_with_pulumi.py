@@ -20,8 +20,14 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 import abc
+import functools
 from pulumi import automation as auto
 from pulumi.automation.errors import CommandError
+from .pulumi_resource_timings import PulumiResourceTimings
+from .pulumi_stack_executor import PulumiStackExecutor
+from .pulumi_stack_operation import PulumiStackOperation
+from .pulumi_workspace_pool import PulumiWorkspacePool
+from .stack_operation_scheduler import StackOperationScheduler
 from pythoneda.shared import Event
 from pythoneda.shared.artifact.events import DockerImageAvailable, DockerImageRequested
 from pythoneda.shared.iac import RemoveInfrastructure
@@ -33,7 +39,9 @@ from pythoneda.shared.iac.events import (
 from typing import List
 
 
-class RemoveInfrastructureWithPulumi(RemoveInfrastructure, abc.ABC):
+class RemoveInfrastructureWithPulumi(
+    RemoveInfrastructure, PulumiStackOperation, abc.ABC
+):
     """
     Pulumi implementation to remove infrastructure of IaC stacks.
 
@@ -54,51 +62,138 @@ class RemoveInfrastructureWithPulumi(RemoveInfrastructure, abc.ABC):
         """
         super().__init__(event)
 
+    @property
+    def scheduling_priority(self) -> str:
+        """
+        Retrieves the priority of the operation in the scheduler.
+        :return: StackOperationScheduler.DESTROY.
+        :rtype: str
+        """
+        return StackOperationScheduler.DESTROY
+
+    @property
+    def dependent_stack_names(self) -> List[str]:
+        """
+        Retrieves the names of the stacks that may depend on the stack of the
+        event, and have to be destroyed before it. Subclasses override it.
+        :return: Such names.
+        :rtype: List[str]
+        """
+        return []
+
     async def perform(self) -> List[Event]:
         """
-        Brings down the stack.
+        Brings down the dependent stacks that exist, and then the stack, each
+        one once it's its turn.
         :return: Either an InfrastructureRemoved or an InfrastructureRemovalFailed.
         :rtype: pythoneda.shared.Event
         """
-        result = None
+        try:
+            for stack_name in self.dependent_stack_names:
+                # other operations on the dependent stack are queued under its
+                # own key, not under the key of the stack of the event
+                await self._scheduled(
+                    functools.partial(self._destroy_if_exists, stack_name),
+                    (self.event.project_name, stack_name),
+                )
+        except CommandError as e:
+            return self._removal_failed(e)
 
-        def do_nothing():
-            pass
+        return await self._scheduled(self._perform)
 
-        stack = auto.create_or_select_stack(
-            stack_name=self.event.stack_name,
-            project_name=self.event.project_name,
-            program=do_nothing,
-        )
+    async def _perform(self) -> List[Event]:
+        """
+        Brings down the stack.
+        :return: Either an InfrastructureRemoved or an InfrastructureRemovalFailed.
+        :rtype: pythoneda.shared.Event
+        """
+        try:
+            await self._destroy(self.event.stack_name)
+        except CommandError as e:
+            return self._removal_failed(e)
 
-        stack.set_config(
-            "azure-native:location", auto.ConfigValue(value=event.location)
+        return InfrastructureRemoved(
+            self.event.stack_name,
+            self.event.project_name,
+            self.event.location,
+            self._previous_event_ids(),
         )
-        stack.refresh(on_output=self.__class__.logger().debug)
 
-        try:
-            self._outcome = stack.destroy(on_output=self.__class__.logger().debug)
-            import json
+    def _removal_failed(self, error: CommandError) -> Event:
+        """
+        Builds the outcome of a failed removal.
+        :param error: The error.
+        :type error: pulumi.automation.errors.CommandError
+        :return: An InfrastructureRemovalFailed.
+        :rtype: pythoneda.shared.iac.events.InfrastructureRemovalFailed
+        """
+        self.__class__.logger().error(f"CommandError: {error}")
+        self._operation_failed(error)
+        return InfrastructureRemovalFailed(
+            self.event.stack_name,
+            self.event.project_name,
+            self.event.location,
+            self._previous_event_ids(),
+        )
 
+    async def _destroy_if_exists(self, stackName: str):
+        """
+        Brings down and removes given dependent stack, if it exists.
+        :param stackName: The name of the stack.
+        :type stackName: str
+        """
+        exists = await PulumiStackExecutor.instance().run(
+            PulumiWorkspacePool.instance().stack_exists,
+            self.event.project_name,
+            stackName,
+        )
+        if exists:
+            await self._destroy(stackName, True)
+        else:
             self.__class__.logger().info(
-                f"destroy summary: \n{json.dumps(self.outcome.summary.resource_changes, indent=4)}"
-            )
-            result = InfrastructureRemoved(
-                self.event.stack_name,
-                self.event.project_name,
-                self.event.location,
-                [self.event.id] + self.event.previous_event_ids,
-            )
-        except CommandError as e:
-            self.__class__.logger().error(f"CommandError: {e}")
-            result = InfrastructureRemovalFailed(
-                self.event.stack_name,
-                self.event.project_name,
-                self.event.location,
-                [self.event.id] + self.event.previous_event_ids,
+                f"{self.event.project_name}/{stackName} doesn't exist, nothing to destroy"
             )
 
-        return result
+    async def _destroy(self, stackName: str, remove: bool = False):
+        """
+        Brings down given stack.
+        :param stackName: The name of the stack.
+        :type stackName: str
+        :param remove: Whether to remove the stack itself afterwards.
+        :type remove: bool
+        """
+
+        def do_nothing():
+            pass
+
+        executor = PulumiStackExecutor.instance()
+
+        stack = await self._select_stack(do_nothing, stackName)
+        try:
+            await self._refresh_if_needed(stack, stackName=stackName)
+            # the dependencies are gone once the resources are destroyed
+            dependencies = await self._resource_dependencies(stack)
+            await self._before_step("destroy")
+            timings = PulumiResourceTimings()
+            self._outcome = await executor.run(
+                stack.destroy,
+                on_output=self.__class__.logger().debug,
+                on_event=self._engine_event_handler(timings),
+                parallel=self.parallelism("destroy"),
+            )
+            self._step_succeeded("destroy")
+            self._report_timings(timings, dependencies, "destroy")
+            if remove:
+                await executor.run(stack.workspace.remove_stack, stackName)
+        finally:
+            self._release_stack(stackName)
+        self._stack_changed()
+        self._forget_stack(stackName)
+        import json
+
+        self.__class__.logger().info(
+            f"destroy summary of {stackName}: \n{json.dumps(self.outcome.summary.resource_changes, indent=4)}"
+        )
 
 
 # vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
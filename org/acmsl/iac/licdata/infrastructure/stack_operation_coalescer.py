@@ -0,0 +1,142 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/stack_operation_coalescer.py
+
+This script defines the StackOperationCoalescer class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+from pythoneda.shared import BaseObject
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class StackOperationCoalescer(BaseObject):
+    """
+    Merges redundant stack operations waiting for the same stack.
+
+    Class name: StackOperationCoalescer
+
+    Responsibilities:
+        - Run one operation per stack at a time.
+        - Keep, while one is running, a single follow-up operation: the latest
+          request, which absorbs the ones it supersedes.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.PulumiStackOperation
+    """
+
+    _singleton = None
+
+    def __init__(self):
+        """
+        Creates a new StackOperationCoalescer instance.
+        """
+        super().__init__()
+        self._running = {}
+        self._pending = {}
+        self._merged = 0
+
+    @classmethod
+    def instance(cls) -> "StackOperationCoalescer":
+        """
+        Retrieves the process-wide instance.
+        :return: Such instance.
+        :rtype: org.acmsl.iac.licdata.infrastructure.StackOperationCoalescer
+        """
+        if cls._singleton is None:
+            cls._singleton = cls()
+        return cls._singleton
+
+    @property
+    def merged(self) -> int:
+        """
+        Retrieves how many operations were merged into a later one.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._merged
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retrieves the coalescing counters.
+        :return: The running, pending and merged operations.
+        :rtype: Dict[str, int]
+        """
+        return {
+            "running": len(self._running),
+            "pending": len(self._pending),
+            "merged": self._merged,
+        }
+
+    async def run(
+        self,
+        key: Hashable,
+        operation,
+        perform: Callable[[], Awaitable[Any]],
+        superseded: Any = None,
+    ) -> Any:
+        """
+        Runs given operation, unless a later one for the same stack supersedes
+        it while it waits.
+        :param key: The key of the stack.
+        :type key: Hashable
+        :param operation: The operation.
+        :type operation: org.acmsl.iac.licdata.infrastructure.PulumiStackOperation
+        :param perform: The function that actually performs the operation.
+        :type perform: Callable[[], Awaitable[Any]]
+        :param superseded: What to return if the operation gets superseded.
+        :type superseded: Any
+        :return: What perform returns, or superseded.
+        :rtype: Any
+        """
+        previous = self._pending.get(key, None)
+        if previous is not None:
+            operation.absorb(previous)
+            self._merged += 1
+            self.__class__.logger().info(
+                f"Merging request {previous.event.id} into {operation.event.id} ({key})"
+            )
+        self._pending[key] = operation
+
+        try:
+            while key in self._running:
+                await asyncio.shield(self._running[key])
+                if self._pending.get(key, None) is not operation:
+                    return superseded
+        finally:
+            # whether it runs now or got cancelled while waiting, it's no
+            # longer pending, and no later request must absorb it
+            if self._pending.get(key, None) is operation:
+                del self._pending[key]
+
+        done = asyncio.get_running_loop().create_future()
+        self._running[key] = done
+        try:
+            return await perform()
+        finally:
+            del self._running[key]
+            done.set_result(None)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,256 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/stack_operation_scheduler.py
+
+This script defines the StackOperationScheduler class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+from collections import deque
+from .environment_setting import EnvironmentSetting
+import itertools
+from pythoneda.shared import BaseObject
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class StackOperationScheduler(BaseObject):
+    """
+    Serializes the operations on each stack, and runs different stacks in parallel.
+
+    Class name: StackOperationScheduler
+
+    Responsibilities:
+        - Keep a FIFO queue of operations per stack, so Pulumi never sees two
+          operations racing for the same stack lock.
+        - Run operations on different stacks concurrently, up to a global
+          limit, with separate limits and priorities for destroys and updates.
+        - Report queue depths and wait times.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.PulumiStackOperation
+    """
+
+    DESTROY = "destroy"
+
+    UPDATE = "update"
+
+    PRIORITIES = [DESTROY, UPDATE]
+
+    DEFAULT_MAX_CONCURRENT = 4
+
+    _singleton = None
+
+    def __init__(
+        self, maxConcurrent: int = None, maxConcurrentByPriority: Dict[str, int] = None
+    ):
+        """
+        Creates a new StackOperationScheduler instance.
+        :param maxConcurrent: The maximum number of operations running at once.
+        If omitted, it's read from the LICDATA_IAC_MAX_CONCURRENT_STACKS
+        environment variable, defaulting to DEFAULT_MAX_CONCURRENT.
+        :type maxConcurrent: int
+        :param maxConcurrentByPriority: The maximum number of destroys and
+        updates running at once. If omitted, they're read from the
+        LICDATA_IAC_MAX_CONCURRENT_DESTROYS and LICDATA_IAC_MAX_CONCURRENT_UPDATES
+        environment variables, defaulting to maxConcurrent.
+        :type maxConcurrentByPriority: Dict[str, int]
+        """
+        super().__init__()
+        if maxConcurrent is None:
+            maxConcurrent = EnvironmentSetting.integer(
+                "LICDATA_IAC_MAX_CONCURRENT_STACKS",
+                self.__class__.DEFAULT_MAX_CONCURRENT,
+            )
+        self._max_concurrent = max(1, maxConcurrent)
+        if maxConcurrentByPriority is None:
+            maxConcurrentByPriority = {
+                priority: EnvironmentSetting.integer(
+                    f"LICDATA_IAC_MAX_CONCURRENT_{priority.upper()}S",
+                    self._max_concurrent,
+                )
+                for priority in self.__class__.PRIORITIES
+            }
+        self._limits = {
+            priority: max(
+                1, maxConcurrentByPriority.get(priority, self._max_concurrent)
+            )
+            for priority in self.__class__.PRIORITIES
+        }
+        self._queues = {}
+        self._busy = set()
+        self._running = {priority: 0 for priority in self.__class__.PRIORITIES}
+        self._sequence = itertools.count()
+        self._waits = {
+            priority: {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            for priority in self.__class__.PRIORITIES
+        }
+
+    @classmethod
+    def instance(cls) -> "StackOperationScheduler":
+        """
+        Retrieves the process-wide instance.
+        :return: Such instance.
+        :rtype: org.acmsl.iac.licdata.infrastructure.StackOperationScheduler
+        """
+        if cls._singleton is None:
+            cls._singleton = cls()
+        return cls._singleton
+
+    @property
+    def max_concurrent(self) -> int:
+        """
+        Retrieves the maximum number of operations running at once.
+        :return: Such number.
+        :rtype: int
+        """
+        return self._max_concurrent
+
+    async def run(
+        self, key: Hashable, priority: str, perform: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Waits for the turn of an operation, and performs it.
+        :param key: The key of the stack.
+        :type key: Hashable
+        :param priority: The priority: DESTROY or UPDATE.
+        :type priority: str
+        :param perform: The function that actually performs the operation.
+        :type perform: Callable[[], Awaitable[Any]]
+        :return: What perform returns.
+        :rtype: Any
+        """
+        if priority not in self._limits:
+            priority = self.__class__.UPDATE
+        ticket = {
+            "priority": priority,
+            "sequence": next(self._sequence),
+            "enqueued_at": time.monotonic(),
+            "turn": asyncio.get_running_loop().create_future(),
+        }
+        queue = self._queues.setdefault(key, deque())
+        queue.append(ticket)
+        self._dispatch()
+        try:
+            await ticket["turn"]
+        except asyncio.CancelledError:
+            if ticket["turn"].done() and not ticket["turn"].cancelled():
+                self._release(key, priority)
+            else:
+                queue.remove(ticket)
+                if not queue:
+                    self._queues.pop(key, None)
+            raise
+        self._record_wait(key, priority, time.monotonic() - ticket["enqueued_at"])
+        try:
+            return await perform()
+        finally:
+            self._release(key, priority)
+
+    def _dispatch(self):
+        """
+        Gives the turn to the waiting operations that can run, in priority order.
+        """
+        while sum(self._running.values()) < self._max_concurrent:
+            candidates = [
+                (
+                    self.__class__.PRIORITIES.index(queue[0]["priority"]),
+                    queue[0]["sequence"],
+                    key,
+                )
+                for key, queue in self._queues.items()
+                if queue
+                and key not in self._busy
+                and self._running[queue[0]["priority"]]
+                < self._limits[queue[0]["priority"]]
+            ]
+            if not candidates:
+                break
+            _, _, key = min(candidates)
+            queue = self._queues[key]
+            ticket = queue.popleft()
+            if not queue:
+                del self._queues[key]
+            self._busy.add(key)
+            self._running[ticket["priority"]] += 1
+            ticket["turn"].set_result(None)
+
+    def _release(self, key: Hashable, priority: str):
+        """
+        Frees the slot of a finished operation, and dispatches the next ones.
+        :param key: The key of the stack.
+        :type key: Hashable
+        :param priority: The priority of the operation.
+        :type priority: str
+        """
+        self._busy.discard(key)
+        self._running[priority] -= 1
+        self._dispatch()
+
+    def _record_wait(self, key: Hashable, priority: str, seconds: float):
+        """
+        Records how long an operation waited for its turn.
+        :param key: The key of the stack.
+        :type key: Hashable
+        :param priority: The priority of the operation.
+        :type priority: str
+        :param seconds: The wait time.
+        :type seconds: float
+        """
+        waits = self._waits[priority]
+        waits["count"] += 1
+        waits["total_seconds"] += seconds
+        waits["max_seconds"] = max(waits["max_seconds"], seconds)
+        if seconds >= 1:
+            self.__class__.logger().info(
+                f"{priority} of {key} waited {seconds:.1f}s for its turn"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retrieves the queue depths, running operations and wait times.
+        :return: Such metrics.
+        :rtype: Dict[str, Any]
+        """
+        return {
+            "queue_depth": {
+                str(key): len(queue) for key, queue in self._queues.items()
+            },
+            "queued": sum(len(queue) for queue in self._queues.values()),
+            "running": dict(self._running),
+            "waits": {
+                priority: dict(
+                    waits,
+                    mean_seconds=(
+                        waits["total_seconds"] / waits["count"]
+                        if waits["count"]
+                        else 0.0
+                    ),
+                )
+                for priority, waits in self._waits.items()
+            },
+        }
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,266 @@
+# vim: set fileencoding=utf-8
+"""
+org/acmsl/iac/licdata/infrastructure/stack_outputs_cache.py
+
+This script defines the StackOutputsCache class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from .environment_setting import EnvironmentSetting
+import json
+import os
+from .persisted_stack_records import PersistedStackRecords
+from pathlib import Path
+from pythoneda.shared import BaseObject
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class StackOutputsCache(BaseObject):
+    """
+    A local cache of the outputs of each stack, keeping secrets encrypted at rest.
+
+    Class name: StackOutputsCache
+
+    Responsibilities:
+        - Remember the outputs of each stack across daemon restarts.
+        - Encrypt the secret outputs before persisting them, or keep them in
+          memory only if encryption is not available.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.PersistedStackRecords
+        - cryptography.fernet.Fernet: Encrypts the secrets, if installed.
+    """
+
+    KEY_FILE_NAME = "stack-outputs.key"
+
+    DEFAULT_MAX_AGE = 60 * 60
+
+    _singleton = None
+
+    def __init__(self, stateDir: str = None, maxAge: float = None):
+        """
+        Creates a new StackOutputsCache instance.
+        :param stateDir: The folder of the cache. Defaults to
+        PersistedStackRecords.default_state_dir().
+        :type stateDir: str
+        :param maxAge: How long (in seconds) cached outputs remain usable, so
+        rotated credentials get read again. If omitted, it's read from the
+        LICDATA_IAC_OUTPUTS_MAX_AGE environment variable, defaulting to
+        DEFAULT_MAX_AGE.
+        :type maxAge: float
+        """
+        super().__init__()
+        if maxAge is None:
+            maxAge = EnvironmentSetting.number(
+                "LICDATA_IAC_OUTPUTS_MAX_AGE", self.__class__.DEFAULT_MAX_AGE
+            )
+        self._max_age = maxAge
+        if stateDir is None:
+            stateDir = PersistedStackRecords.default_state_dir()
+        self._key_path = Path(stateDir) / self.__class__.KEY_FILE_NAME
+        self._records = PersistedStackRecords("stack-outputs.json", stateDir)
+        self._secrets_in_memory = {}
+        self._fernet = None
+        self._fernet_loaded = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "StackOutputsCache":
+        """
+        Retrieves the process-wide instance.
+        :return: Such instance.
+        :rtype: org.acmsl.iac.licdata.infrastructure.StackOutputsCache
+        """
+        if cls._singleton is None:
+            cls._singleton = cls()
+        return cls._singleton
+
+    def store(self, projectName: str, stackName: str, outputs: Dict):
+        """
+        Stores the outputs of given stack.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        :param outputs: The outputs.
+        :type outputs: pulumi.automation.OutputMap
+        """
+        entries = {}
+        secrets = {}
+        for name, output in (outputs or {}).items():
+            if output.secret:
+                entries[name] = {"secret": self._encrypt(output.value)}
+                if entries[name]["secret"] is None:
+                    secrets[name] = output.value
+            else:
+                entries[name] = {"value": output.value}
+        key = PersistedStackRecords.key_for(projectName, stackName)
+        with self._lock:
+            self._secrets_in_memory[key] = secrets
+        self._records.put(
+            projectName, stackName, {"stored_at": time.time(), "outputs": entries}
+        )
+
+    def get(
+        self, projectName: str, stackName: str, maxAge: float = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves the cached outputs of given stack.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        :param maxAge: The maximum age of the outputs, in seconds. Defaults to
+        the max age of the cache.
+        :type maxAge: float
+        :return: The value of each output, or None if not cached, too old,
+        or if a secret cannot be recovered.
+        :rtype: Optional[Dict[str, Any]]
+        """
+        record = self._records.get(projectName, stackName)
+        if record is None:
+            return None
+        if maxAge is None:
+            maxAge = self._max_age
+        if time.time() - record.get("stored_at", 0) > maxAge:
+            return None
+        key = PersistedStackRecords.key_for(projectName, stackName)
+        with self._lock:
+            secrets = self._secrets_in_memory.get(key, {})
+        result = {}
+        for name, entry in record.get("outputs", {}).items():
+            if "value" in entry:
+                result[name] = entry["value"]
+            elif entry.get("secret", None) is not None:
+                found, result[name] = self._decrypt(entry["secret"])
+                if not found:
+                    return None
+            elif name in secrets:
+                result[name] = secrets[name]
+            else:
+                # the secret was only kept in memory, by a previous process
+                return None
+        return result
+
+    def forget(self, projectName: str, stackName: str):
+        """
+        Forgets the outputs of given stack.
+        :param projectName: The name of the project.
+        :type projectName: str
+        :param stackName: The name of the stack.
+        :type stackName: str
+        """
+        with self._lock:
+            self._secrets_in_memory.pop(
+                PersistedStackRecords.key_for(projectName, stackName), None
+            )
+        self._records.remove(projectName, stackName)
+
+    def _cipher(self):
+        """
+        Retrieves the cipher of the secrets: a Fernet instance whose key is
+        read from the LICDATA_IAC_OUTPUTS_KEY environment variable, or from
+        a key file only the current user can read, created if missing.
+        :return: The cipher, or None if the cryptography package is not available.
+        :rtype: cryptography.fernet.Fernet
+        """
+        with self._lock:
+            if not self._fernet_loaded:
+                self._fernet_loaded = True
+                try:
+                    from cryptography.fernet import Fernet
+                except ImportError:
+                    self.__class__.logger().warning(
+                        "cryptography is not installed: secret outputs will not be persisted"
+                    )
+                    return None
+                try:
+                    self._fernet = Fernet(self._load_key(Fernet))
+                except (OSError, ValueError) as e:
+                    self.__class__.logger().warning(
+                        f"Cannot load the key of the outputs cache: {e}"
+                    )
+            return self._fernet
+
+    def _load_key(self, fernet) -> bytes:
+        """
+        Loads the encryption key, generating it on first use.
+        :param fernet: The Fernet class.
+        :type fernet: type
+        :return: The key.
+        :rtype: bytes
+        """
+        result = os.environ.get("LICDATA_IAC_OUTPUTS_KEY", None)
+        if result is not None:
+            return result.encode("ascii")
+        try:
+            return self._key_path.read_bytes().strip()
+        except FileNotFoundError:
+            pass
+        self._key_path.parent.mkdir(parents=True, exist_ok=True)
+        result = fernet.generate_key()
+        try:
+            fd = os.open(self._key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            # created concurrently by another process
+            return self._key_path.read_bytes().strip()
+        with os.fdopen(fd, "wb") as file:
+            file.write(result)
+        return result
+
+    def _encrypt(self, value: Any) -> Optional[str]:
+        """
+        Encrypts given secret value.
+        :param value: The value. It must be JSON-serializable.
+        :type value: Any
+        :return: The encrypted value, or None if encryption is not available.
+        :rtype: Optional[str]
+        """
+        cipher = self._cipher()
+        if cipher is None:
+            return None
+        return cipher.encrypt(json.dumps(value).encode("utf-8")).decode("ascii")
+
+    def _decrypt(self, token: str) -> tuple:
+        """
+        Decrypts given secret value.
+        :param token: The encrypted value.
+        :type token: str
+        :return: Whether it could be decrypted, and the value.
+        :rtype: tuple
+        """
+        cipher = self._cipher()
+        if cipher is None:
+            return (False, None)
+        from cryptography.fernet import InvalidToken
+
+        try:
+            return (True, json.loads(cipher.decrypt(token.encode("ascii"))))
+        except (InvalidToken, ValueError) as e:
+            self.__class__.logger().warning(f"Cannot decrypt a cached output: {e}")
+            return (False, None)
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -22,6 +22,9 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import abc
 from pulumi import automation as auto
 from pulumi.automation.errors import CommandError
+from .pulumi_resource_timings import PulumiResourceTimings
+from .pulumi_stack_executor import PulumiStackExecutor
+from .pulumi_stack_operation import PulumiStackOperation
 from pythoneda.shared import Event
 from pythoneda.shared.iac import UpdateDockerResources
 from pythoneda.shared.iac.events import (
@@ -29,10 +32,12 @@ from pythoneda.shared.iac.events import (
     DockerResourcesUpdateFailed,
     DockerResourcesUpdated,
 )
-from typing import List
+from typing import Any, Dict, List, Optional
 
 
-class UpdateDockerResourcesWithPulumi(UpdateDockerResources, abc.ABC):
+class UpdateDockerResourcesWithPulumi(
+    UpdateDockerResources, PulumiStackOperation, abc.ABC
+):
     """
     Updates Pulumi to update Docker resources of IaC stacks.
 
@@ -72,6 +77,16 @@ class UpdateDockerResourcesWithPulumi(UpdateDockerResources, abc.ABC):
         pass
 
     async def perform(self) -> Event:
+        """
+        Brings up the Docker resources, unless a later request for the same
+        stack supersedes this one.
+        :return: Either a DockerResourcesUpdated or a DockerResourcesUpdateFailed,
+        or None if superseded.
+        :rtype: Event
+        """
+        return await self._coalesced(self._perform)
+
+    async def _perform(self) -> Event:
         """
         Brings up the Docker resources.
         :param event: The event.
@@ -84,35 +99,113 @@ class UpdateDockerResourcesWithPulumi(UpdateDockerResources, abc.ABC):
             self.declare_infrastructure()
             return self.declare_docker_resources()
 
-        result = None
+        replayed_metadata = self._replayed_metadata()
+        if replayed_metadata is not None:
+            return DockerResourcesUpdated(
+                self.event.stack_name,
+                self.event.project_name,
+                self.event.location,
+                replayed_metadata,
+                self._previous_event_ids(),
+            )
 
-        stack = auto.create_or_select_stack(
-            stack_name=self.event.stack_name,
-            project_name=self.event.project_name,
-            program=declare_docker_resources_wrapper,
-        )
+        result = None
 
-        # stack.workspace.install_plugin("azure-native", "v2.11.0")
-        stack.set_config(
-            "azure-native:location", auto.ConfigValue(value=self.event.location)
-        )
-        stack.refresh(on_output=self.__class__.logger().debug)
+        executor = PulumiStackExecutor.instance()
 
         try:
-            self._outcome = stack.up(on_output=self.__class__.logger().debug)
-            import json
+            stack = await self._select_stack(declare_docker_resources_wrapper)
+            targets = await self._docker_targets(stack)
+            await self._refresh_if_needed(stack, targets)
+            if self.preview_first and await self._preview_is_no_op(
+                stack, declare_docker_resources_wrapper, targets
+            ):
+                result = self._build_DockerResourcesUpdated_from_outputs(
+                    await self._cached_outputs(declare_docker_resources_wrapper, stack),
+                    True,
+                )
+            else:
+                await self._before_step("up")
+                timings = PulumiResourceTimings()
+                self._outcome = await executor.run(
+                    stack.up,
+                    on_output=self.__class__.logger().debug,
+                    on_event=self._engine_event_handler(timings),
+                    parallel=self.parallelism("up"),
+                    program=declare_docker_resources_wrapper,
+                    target=targets,
+                    target_dependents=True if targets else None,
+                )
+                self._step_succeeded("up")
+                self._record_outputs(self._outcome.outputs)
+                if not targets:
+                    self._record_stack_in_sync()
+                self._report_timings(
+                    timings, await self._resource_dependencies(stack), "up"
+                )
+                self._stack_changed()
+                import json
 
-            self.__class__.logger().info(
-                f"update summary: \n{json.dumps(self.outcome.summary.resource_changes, indent=4)}"
-            )
-            result = self._build_DockerResourcesUpdated_from_outcome(self._outcome)
+                self.__class__.logger().info(
+                    f"update summary: \n{json.dumps(self.outcome.summary.resource_changes, indent=4)}"
+                )
+                result = self._build_DockerResourcesUpdated_from_outcome(self._outcome)
+            self._record_success(result.metadata)
         except CommandError as e:
             self.__class__.logger().error(f"CommandError: {e}")
+            self._operation_failed(e)
             result = self._build_DockerResourcesUpdateFailed()
 
         return result
 
-    @abc.abstractmethod
+    def _fingerprint_inputs(self) -> Dict[str, Any]:
+        """
+        Retrieves the inputs that determine what the operation deploys.
+        :return: The common inputs, plus the Docker image.
+        :rtype: Dict[str, Any]
+        """
+        result = super()._fingerprint_inputs()
+        result["image_name"] = self.event.image_name
+        result["image_version"] = self.event.image_version
+        return result
+
+    @property
+    def targeted(self) -> bool:
+        """
+        Checks whether the update should be restricted to the Docker layer.
+        :return: True in such case.
+        :rtype: bool
+        """
+        return self._metadata_flag("targeted")
+
+    def docker_resource_types(self) -> List[str]:
+        """
+        Retrieves the Pulumi types of the Docker-layer resources, used in
+        targeted updates.
+        :return: Such types.
+        :rtype: List[str]
+        """
+        return []
+
+    async def _docker_targets(self, stack: auto.Stack) -> Optional[List[str]]:
+        """
+        Retrieves the URNs a targeted update is restricted to.
+        :param stack: The stack.
+        :type stack: pulumi.automation.Stack
+        :return: The URNs, or None for a full update.
+        :rtype: Optional[List[str]]
+        """
+        if not self.targeted or self.layered:
+            # a layered stack holds nothing but the Docker layer
+            return None
+        result = await self._urns_of_types(stack, self.docker_resource_types())
+        if not result:
+            self.__class__.logger().info(
+                "No Docker-layer resources deployed yet, running a full update"
+            )
+            result = None
+        return result
+
     def _build_DockerResourcesUpdated_from_outcome(
         self, outcome: auto.UpResult
     ) -> DockerResourcesUpdated:
@@ -123,6 +216,23 @@ class UpdateDockerResourcesWithPulumi(UpdateDockerResources, abc.ABC):
         :return: A DockerResourcesUpdated event.
         :rtype: pythoneda.shared.iac.events.DockerResourcesUpdated
         """
+        return self._build_DockerResourcesUpdated_from_outputs(
+            {name: output.value for name, output in outcome.outputs.items()}
+        )
+
+    @abc.abstractmethod
+    def _build_DockerResourcesUpdated_from_outputs(
+        self, outputs: Dict[str, Any], noOp: bool = False
+    ) -> DockerResourcesUpdated:
+        """
+        Builds a DockerResourcesUpdated event from the stack outputs.
+        :param outputs: The value of each stack output.
+        :type outputs: Dict[str, Any]
+        :param noOp: Whether the stack was already up to date.
+        :type noOp: bool
+        :return: A DockerResourcesUpdated event.
+        :rtype: pythoneda.shared.iac.events.DockerResourcesUpdated
+        """
         pass
 
     def _build_DockerResourcesUpdateFailed(self) -> DockerResourcesUpdateFailed:
@@ -136,7 +246,7 @@ class UpdateDockerResourcesWithPulumi(UpdateDockerResources, abc.ABC):
             self.event.project_name,
             self.event.location,
             self.event.metadata,
-            [self.event.id] + self.event.previous_event_ids,
+            self._previous_event_ids(),
         )
 
 
@@ -22,6 +22,9 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import abc
 from pulumi import automation as auto
 from pulumi.automation.errors import CommandError
+from .pulumi_resource_timings import PulumiResourceTimings
+from .pulumi_stack_executor import PulumiStackExecutor
+from .pulumi_stack_operation import PulumiStackOperation
 from pythoneda.shared import Event
 from pythoneda.shared.iac import UpdateInfrastructure
 from pythoneda.shared.iac.events import (
@@ -32,7 +35,9 @@ from pythoneda.shared.iac.events import (
 from typing import Dict, List
 
 
-class UpdateInfrastructureWithPulumi(UpdateInfrastructure, abc.ABC):
+class UpdateInfrastructureWithPulumi(
+    UpdateInfrastructure, PulumiStackOperation, abc.ABC
+):
     """
     Updates Pulumi to update infrastructure of IaC stacks.
 
@@ -51,9 +56,28 @@ class UpdateInfrastructureWithPulumi(UpdateInfrastructure, abc.ABC):
         :param event: The event.
         :type event: pythoneda.shared.iac.events.InfrastructureUpdateRequested
         """
+        self._stack_outputs = None
         super().__init__(event)
 
+    @property
+    def stack_outputs(self) -> auto.OutputMap:
+        """
+        Retrieves the outputs of the stack, once the operation is performed.
+        :return: Such outputs.
+        :rtype: pulumi.automation.OutputMap
+        """
+        return self._stack_outputs
+
     async def perform(self):
+        """
+        Brings up the stack, unless a later request for the same stack
+        supersedes this one.
+        :return: Either an InfrastructureUpdated event or an InfrastructureUpdateFailed.
+        :rtype: pythoneda.shared.iac.events.InfrastructureUpdated
+        """
+        return await self._coalesced(self._perform, [])
+
+    async def _perform(self):
         """
         Brings up the stack.
         :return: Either an InfrastructureUpdated event or an InfrastructureUpdateFailed.
@@ -65,43 +89,73 @@ class UpdateInfrastructureWithPulumi(UpdateInfrastructure, abc.ABC):
 
         result = []
 
-        stack = auto.create_or_select_stack(
-            stack_name=self.event.stack_name,
-            project_name=self.event.project_name,
-            program=declare_infrastructure_wrapper,
-        )
+        replayed_metadata = self._replayed_metadata()
+        if replayed_metadata is not None:
+            result.append(
+                InfrastructureUpdated(
+                    self.event.stack_name,
+                    self.event.project_name,
+                    self.event.location,
+                    replayed_metadata,
+                    self._previous_event_ids(),
+                )
+            )
+            return result
 
-        # stack.workspace.install_plugin("azure-native", "v2.11.0")
-        stack.set_config(
-            "azure-native:location", auto.ConfigValue(value=self.event.location)
-        )
-        stack.refresh(on_output=self.__class__.logger().debug)
+        executor = PulumiStackExecutor.instance()
 
         try:
-            self._outcome = stack.up(on_output=self.__class__.logger().debug)
-            import json
-
-            self.__class__.logger().info(
-                f"update summary: \n{json.dumps(self.outcome.summary.resource_changes, indent=4)}"
+            stack = await self._select_stack(declare_infrastructure_wrapper)
+            await self._refresh_if_needed(stack)
+            no_op = self.preview_first and await self._preview_is_no_op(
+                stack, declare_infrastructure_wrapper
             )
+            if no_op:
+                self._stack_outputs = await executor.run(stack.outputs)
+                self._record_outputs(self._stack_outputs)
+            else:
+                await self._before_step("up")
+                timings = PulumiResourceTimings()
+                self._outcome = await executor.run(
+                    stack.up,
+                    on_output=self.__class__.logger().debug,
+                    on_event=self._engine_event_handler(timings),
+                    parallel=self.parallelism("up"),
+                    program=declare_infrastructure_wrapper,
+                )
+                self._step_succeeded("up")
+                self._stack_outputs = self.outcome.outputs
+                self._record_outputs(self._stack_outputs)
+                self._record_stack_in_sync()
+                self._report_timings(
+                    timings, await self._resource_dependencies(stack), "up"
+                )
+                self._stack_changed()
+                import json
+
+                self.__class__.logger().info(
+                    f"update summary: \n{json.dumps(self.outcome.summary.resource_changes, indent=4)}"
+                )
             event = InfrastructureUpdated(
                 self.event.stack_name,
                 self.event.project_name,
                 self.event.location,
-                self.event.metadata,
-                [self.event.id] + self.event.previous_event_ids,
+                self._result_metadata(no_op),
+                self._previous_event_ids(),
             )
+            self._record_success(event.metadata)
             result.append(event)
 
         except CommandError as e:
             self.__class__.logger().error(f"CommandError: {e}")
+            self._operation_failed(e)
             result.append(
                 InfrastructureUpdateFailed(
                     self.event.stack_name,
                     self.event.project_name,
                     self.event.location,
                     self.event.metadata,
-                    [self.event.id] + self.event.previous_event_ids,
+                    self._previous_event_ids(),
                 )
             )
 
@@ -0,0 +1,105 @@
+# vim: set fileencoding=utf-8
+"""
+tests/azure/test_arm_paced_stack_operation.py
+
+This script defines the ArmPacedStackOperationTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.azure.arm_paced_stack_operation import (
+    ArmPacedStackOperation,
+)
+from org.acmsl.iac.licdata.infrastructure.azure.arm_rate_limiter import (
+    ArmRateLimiter,
+)
+import unittest
+
+
+class _StackOperation:
+    """
+    Stands for PulumiStackOperation.
+    """
+
+    def parallelism(self, step: str) -> int:
+        return 16
+
+    def _operation_failed(self, error: Exception):
+        pass
+
+
+class _PacedOperation(ArmPacedStackOperation, _StackOperation):
+    """
+    A paced operation on its own subscription.
+    """
+
+    def __init__(self, limiter: ArmRateLimiter):
+        self._limiter = limiter
+
+    @property
+    def arm_rate_limiter(self) -> ArmRateLimiter:
+        return self._limiter
+
+
+class ArmPacedStackOperationTests(unittest.TestCase):
+    """
+    Tests ArmPacedStackOperation.
+
+    Class name: ArmPacedStackOperationTests
+
+    Responsibilities:
+        - Check only ARM throttling codes slow the subscription down.
+        - Check the parallelism is capped only while throttled.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.ArmPacedStackOperation
+    """
+
+    def test_throttling_codes_back_off(self):
+        for message in [
+            "error: Code=TooManyRequests Message=slow down",
+            'code: "SubscriptionRequestsThrottled"',
+        ]:
+            limiter = ArmRateLimiter(rate=10, burst=10)
+            _PacedOperation(limiter)._operation_failed(Exception(message))
+            self.assertEqual(limiter.throttled, 1, message)
+
+    def test_other_errors_containing_429_do_not_back_off(self):
+        limiter = ArmRateLimiter(rate=10, burst=10)
+        operation = _PacedOperation(limiter)
+        operation._operation_failed(Exception("resource vm-4291 not found"))
+        operation._operation_failed(Exception("status 429"))
+        self.assertEqual(limiter.throttled, 0)
+
+    def test_parallelism_is_capped_only_while_throttled(self):
+        limiter = ArmRateLimiter(rate=4, burst=10)
+        operation = _PacedOperation(limiter)
+        self.assertEqual(operation.parallelism("up"), 16)
+        limiter.observe(429, {})
+        self.assertEqual(operation.parallelism("up"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
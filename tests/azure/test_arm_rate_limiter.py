@@ -0,0 +1,105 @@
+# vim: set fileencoding=utf-8
+"""
+tests/azure/test_arm_rate_limiter.py
+
+This script defines the ArmRateLimiterTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.azure.arm_rate_limiter import (
+    ArmRateLimiter,
+)
+import asyncio
+import unittest
+
+
+class ArmRateLimiterTests(unittest.TestCase):
+    """
+    Tests ArmRateLimiter.
+
+    Class name: ArmRateLimiterTests
+
+    Responsibilities:
+        - Check the limiter backs off on throttling and recovers on success.
+        - Check the response headers are honored.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.ArmRateLimiter
+    """
+
+    def test_throttling_halves_the_rate_down_to_the_minimum(self):
+        limiter = ArmRateLimiter(rate=4, burst=10)
+        self.assertFalse(limiter.is_throttled())
+        limiter.observe(429, {})
+        self.assertEqual(limiter.rate, 2)
+        self.assertEqual(limiter.throttled, 1)
+        self.assertTrue(limiter.is_throttled())
+        for _ in range(10):
+            limiter.observe(429, {})
+        self.assertEqual(limiter.rate, ArmRateLimiter.MIN_RATE)
+        self.assertEqual(limiter.concurrency_budget(), 1)
+
+    def test_successes_recover_the_configured_rate(self):
+        limiter = ArmRateLimiter(rate=10, burst=10)
+        limiter.observe(429, {})
+        for _ in range(10):
+            limiter.observe(200, {})
+        self.assertEqual(limiter.rate, 10)
+        self.assertFalse(limiter.is_throttled())
+        self.assertEqual(limiter.concurrency_budget(), 10)
+
+    def test_retry_after_pauses_the_limiter(self):
+        limiter = ArmRateLimiter(rate=10, burst=10)
+        limiter.observe(503, {"retry-after": "30"})
+        self.assertTrue(limiter.is_throttled())
+        self.assertGreater(limiter._reserve(1), 29)
+
+    def test_reads_the_retry_after_headers(self):
+        self.assertEqual(ArmRateLimiter.retry_after({"retry-after-ms": "1500"}), 1.5)
+        self.assertEqual(ArmRateLimiter.retry_after({"retry-after": "2"}), 2)
+        self.assertIsNone(ArmRateLimiter.retry_after({"retry-after": "soon"}))
+        self.assertIsNone(ArmRateLimiter.retry_after({}))
+
+    def test_remaining_quota_caps_the_tokens(self):
+        headers = {
+            "x-ms-ratelimit-remaining-subscription-reads": "7",
+            "x-ms-ratelimit-remaining-subscription-writes": "3",
+        }
+        self.assertEqual(ArmRateLimiter.remaining_quota(headers), 3)
+        limiter = ArmRateLimiter(rate=10, burst=10)
+        limiter.observe(200, headers)
+        self.assertLessEqual(limiter.stats()["tokens"], 3.1)
+
+    def test_acquire_waits_once_the_bucket_is_empty(self):
+        limiter = ArmRateLimiter(rate=100, burst=2)
+        limiter.acquire(2)
+        self.assertEqual(limiter.waited_seconds, 0)
+        asyncio.run(limiter.acquire_async(1))
+        self.assertGreater(limiter.waited_seconds, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,107 @@
+# vim: set fileencoding=utf-8
+"""
+tests/azure/test_azure_resource_inventory.py
+
+This script defines the AzureResourceInventoryTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.azure.azure_resource_inventory import (
+    AzureResourceInventory,
+)
+from types import SimpleNamespace
+import unittest
+
+
+class AzureResourceInventoryTests(unittest.TestCase):
+    """
+    Tests AzureResourceInventory.
+
+    Class name: AzureResourceInventoryTests
+
+    Responsibilities:
+        - Check prefix lookups against the indexed listings.
+        - Check listings expire and get invalidated.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.AzureResourceInventory
+    """
+
+    RESOURCES = [
+        SimpleNamespace(name="licdata-web-b", type="Microsoft.Web/sites"),
+        SimpleNamespace(name="licdata-web-a", type="Microsoft.Web/sites"),
+        SimpleNamespace(name="licdata-plan", type="Microsoft.Web/serverFarms"),
+    ]
+
+    def lister(self):
+        self.listings += 1
+        return list(self.RESOURCES)
+
+    def setUp(self):
+        self.listings = 0
+
+    def test_finds_the_first_name_with_the_prefix_and_type(self):
+        inventory = AzureResourceInventory(ttl=60)
+        found = inventory.find(
+            "sub", "RG", "licdata-web", "microsoft.web/sites", self.lister
+        )
+        self.assertEqual(found.name, "licdata-web-a")
+        self.assertIsNone(
+            inventory.find("sub", "rg", "licdata-plan", "Microsoft.Web/sites")
+        )
+        self.assertEqual(
+            inventory.find("sub", "rg", "licdata-p", "Microsoft.Web/serverFarms").name,
+            "licdata-plan",
+        )
+        self.assertEqual(self.listings, 1)
+
+    def test_unknown_group_without_lister_yields_none(self):
+        inventory = AzureResourceInventory(ttl=60)
+        self.assertIsNone(inventory.find("sub", "rg", "x", "Microsoft.Web/sites"))
+        self.assertFalse(inventory.is_fresh("sub", "rg"))
+
+    def test_zero_ttl_uses_the_listing_just_fetched(self):
+        inventory = AzureResourceInventory(ttl=0)
+        found = inventory.find(
+            "sub", "rg", "licdata-web", "Microsoft.Web/sites", self.lister
+        )
+        self.assertEqual(found.name, "licdata-web-a")
+        inventory.find("sub", "rg", "licdata-web", "Microsoft.Web/sites", self.lister)
+        self.assertEqual(self.listings, 2)
+
+    def test_invalidate_forgets_the_listings(self):
+        inventory = AzureResourceInventory(ttl=60)
+        inventory.store("sub", "rg", self.RESOURCES)
+        inventory.store("other", "rg", self.RESOURCES)
+        inventory.invalidate("sub")
+        self.assertFalse(inventory.is_fresh("sub", "rg"))
+        self.assertTrue(inventory.is_fresh("other", "RG"))
+        inventory.invalidate()
+        self.assertFalse(inventory.is_fresh("other", "rg"))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
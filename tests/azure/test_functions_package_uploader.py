@@ -0,0 +1,232 @@
+# vim: set fileencoding=utf-8
+"""
+tests/azure/test_functions_package_uploader.py
+
+This script defines the FunctionsPackageUploaderTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import importlib.util
+from org.acmsl.iac.licdata.infrastructure.package_digest import PackageDigest
+import os
+import socket
+import tempfile
+import threading
+from types import SimpleNamespace
+import unittest
+import uuid
+
+HAS_BLOB_SDK = importlib.util.find_spec("azure.storage.blob") is not None
+
+if HAS_BLOB_SDK:
+    from azure.core.exceptions import ResourceNotFoundError
+    from org.acmsl.iac.licdata.infrastructure.azure.functions_package_uploader import (
+        FunctionsPackageUploader,
+    )
+
+AZURITE_CONNECTION_STRING = os.environ.get(
+    "LICDATA_IAC_AZURITE_CONNECTION_STRING",
+    "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;"
+    "AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;"
+    "BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;",
+)
+
+
+def azurite_is_running() -> bool:
+    """
+    Checks whether an emulator was configured, or the default Azurite blob
+    endpoint accepts connections.
+    """
+    if "LICDATA_IAC_AZURITE_CONNECTION_STRING" in os.environ:
+        return True
+    try:
+        with socket.create_connection(("127.0.0.1", 10000), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+class FakeBlobClient:
+    """
+    Records the calls the uploader makes to a blob.
+    """
+
+    blob_name = "rest.zip"
+
+    def __init__(self, metadata: dict = None):
+        self.metadata = metadata
+        self.staged = {}
+        self.staging_order = []
+        self.committed = None
+        self.uploads = []
+        self._lock = threading.Lock()
+
+    def get_blob_properties(self):
+        if self.metadata is None:
+            raise ResourceNotFoundError("The specified blob does not exist.")
+        return SimpleNamespace(metadata=self.metadata)
+
+    def stage_block(self, block_id, data, length=None):
+        with self._lock:
+            self.staged[block_id] = bytes(data)
+            self.staging_order.append(block_id)
+
+    def commit_block_list(self, blocks, metadata=None):
+        self.committed = [block.id for block in blocks]
+        self.metadata = metadata
+
+    def upload_blob(self, data, length=None, overwrite=False, metadata=None):
+        self.uploads.append(data.read())
+        self.metadata = metadata
+
+
+@unittest.skipUnless(HAS_BLOB_SDK, "azure-storage-blob is not installed")
+class FunctionsPackageUploaderTests(unittest.TestCase):
+    """
+    Tests FunctionsPackageUploader.
+
+    Class name: FunctionsPackageUploaderTests
+
+    Responsibilities:
+        - Check large packages are staged block by block, and the block list
+          committed in order.
+        - Check small packages go in a single put.
+        - Check unchanged packages aren't uploaded again.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.FunctionsPackageUploader
+    """
+
+    CONTENT = bytes(range(256)) * 10
+
+    def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._folder.name, "rest.zip")
+        with open(self._path, "wb") as file:
+            file.write(self.CONTENT)
+
+    def tearDown(self):
+        self._folder.cleanup()
+
+    def test_stages_the_blocks_and_commits_them_in_order(self):
+        client = FakeBlobClient()
+        uploaded = FunctionsPackageUploader(client, blockSize=256, maxWorkers=1).upload(
+            self._path
+        )
+        self.assertTrue(uploaded)
+        self.assertEqual(len(client.committed), 10)
+        self.assertEqual(client.staging_order, client.committed)
+        self.assertEqual(client.committed, sorted(client.committed))
+        self.assertEqual(
+            b"".join(client.staged[block_id] for block_id in client.committed),
+            self.CONTENT,
+        )
+        self.assertEqual(client.metadata, {"sha256": PackageDigest.sha256(self._path)})
+        self.assertEqual(client.uploads, [])
+
+    def test_commits_the_blocks_in_order_when_staged_concurrently(self):
+        client = FakeBlobClient()
+        FunctionsPackageUploader(client, blockSize=100, maxWorkers=4).upload(self._path)
+        self.assertEqual(client.committed, sorted(client.committed))
+        self.assertEqual(
+            b"".join(client.staged[block_id] for block_id in client.committed),
+            self.CONTENT,
+        )
+
+    def test_small_packages_go_in_a_single_put(self):
+        client = FakeBlobClient()
+        uploaded = FunctionsPackageUploader(client, blockSize=len(self.CONTENT)).upload(
+            self._path
+        )
+        self.assertTrue(uploaded)
+        self.assertEqual(client.uploads, [self.CONTENT])
+        self.assertEqual(client.staged, {})
+        self.assertIsNone(client.committed)
+
+    def test_skips_the_upload_when_the_digest_matches(self):
+        client = FakeBlobClient({"sha256": PackageDigest.sha256(self._path)})
+        uploaded = FunctionsPackageUploader(client, blockSize=256).upload(self._path)
+        self.assertFalse(uploaded)
+        self.assertEqual(client.staged, {})
+        self.assertEqual(client.uploads, [])
+
+    def test_uploads_when_the_digest_differs(self):
+        client = FakeBlobClient({"sha256": "stale"})
+        self.assertTrue(
+            FunctionsPackageUploader(client, blockSize=256).upload(self._path)
+        )
+        self.assertEqual(len(client.committed), 10)
+
+
+@unittest.skipUnless(HAS_BLOB_SDK, "azure-storage-blob is not installed")
+@unittest.skipUnless(azurite_is_running(), "Azurite is not running")
+class FunctionsPackageUploaderAzuriteTests(unittest.TestCase):
+    """
+    Tests FunctionsPackageUploader against a local Azurite emulator.
+
+    Class name: FunctionsPackageUploaderAzuriteTests
+
+    Responsibilities:
+        - Check a block upload round-trips, and isn't repeated.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.azure.FunctionsPackageUploader
+    """
+
+    def test_uploads_once_and_round_trips(self):
+        from azure.storage.blob import ContainerClient
+
+        container = ContainerClient.from_connection_string(
+            AZURITE_CONNECTION_STRING, f"licdata-{uuid.uuid4().hex[:12]}"
+        )
+        container.create_container()
+        try:
+            with tempfile.TemporaryDirectory() as folder:
+                path = os.path.join(folder, "rest.zip")
+                content = os.urandom(3 * 1024 * 1024 + 17)
+                with open(path, "wb") as file:
+                    file.write(content)
+                uploader = FunctionsPackageUploader.for_connection_string(
+                    AZURITE_CONNECTION_STRING,
+                    container.container_name,
+                    "rest.zip",
+                    blockSize=1024 * 1024,
+                    maxWorkers=4,
+                )
+                self.assertTrue(uploader.upload(path))
+                blob = container.get_blob_client("rest.zip")
+                self.assertEqual(blob.download_blob().readall(), content)
+                self.assertEqual(
+                    blob.get_blob_properties().metadata["sha256"],
+                    PackageDigest.sha256(path),
+                )
+                self.assertFalse(uploader.upload(path))
+        finally:
+            container.delete_container()
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,131 @@
+# vim: set fileencoding=utf-8
+"""
+tests/dbus/test_local_event_bus.py
+
+This script defines the LocalEventBusTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.dbus.local_event_bus import LocalEventBus
+import asyncio
+import unittest
+
+
+class Requested:
+    """
+    An event delivered locally in the tests.
+
+    Class name: Requested
+
+    Responsibilities:
+        - Stand for a pythoneda.shared.Event.
+
+    Collaborators:
+        - None
+    """
+
+    def __init__(self, eventId: str):
+        self.id = eventId
+
+
+class LocalEventBusTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests LocalEventBus.
+
+    Class name: LocalEventBusTests
+
+    Responsibilities:
+        - Check each event is delivered in its own task.
+        - Check overflowing events are left to d-bus.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.dbus.LocalEventBus
+    """
+
+    async def settle(self):
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+    async def test_a_slow_handler_does_not_hold_back_later_events(self):
+        bus = LocalEventBus(maxInFlight=8)
+        release = asyncio.Event()
+        handled = []
+
+        async def handler(event):
+            handled.append(event.id)
+            if event.id == "slow":
+                await release.wait()
+
+        bus.subscribe([__name__], handler)
+        await bus.publish(Requested("slow"))
+        await bus.publish(Requested("fast"))
+        await self.settle()
+        self.assertEqual(handled, ["slow", "fast"])
+        self.assertEqual(bus.stats()["in_flight"], 1)
+        self.assertTrue(bus.was_delivered("slow"))
+        release.set()
+        await self.settle()
+        self.assertEqual(bus.stats()["delivered"], 2)
+        self.assertEqual(bus.stats()["in_flight"], 0)
+
+    async def test_unrelated_events_are_not_delivered(self):
+        bus = LocalEventBus()
+
+        async def handler(event):
+            pass
+
+        bus.subscribe(["pythoneda.shared.artifact.events"], handler)
+        self.assertEqual(await bus.publish(Requested("a")), 0)
+        self.assertFalse(bus.was_delivered("a"))
+
+    async def test_events_overflow_to_dbus(self):
+        bus = LocalEventBus(maxInFlight=1)
+        release = asyncio.Event()
+
+        async def handler(event):
+            await release.wait()
+
+        bus.subscribe([__name__], handler)
+        self.assertEqual(await bus.publish(Requested("a")), 1)
+        self.assertEqual(await bus.publish(Requested("b")), 0)
+        self.assertFalse(bus.was_delivered("b"))
+        self.assertEqual(bus.stats()["overflowed"], 1)
+        release.set()
+
+    async def test_failures_are_counted(self):
+        bus = LocalEventBus()
+
+        async def handler(event):
+            raise ValueError("boom")
+
+        bus.subscribe([__name__], handler)
+        await bus.publish(Requested("a"))
+        await self.settle()
+        self.assertEqual(bus.stats()["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,133 @@
+# vim: set fileencoding=utf-8
+"""
+tests/dbus/test_signal_emission_queue.py
+
+This script defines the SignalEmissionQueueTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.dbus.signal_emission_queue import (
+    SignalEmissionQueue,
+)
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+
+class StackEvent:
+    """
+    A status event of a stack, emitted in the tests.
+
+    Class name: StackEvent
+
+    Responsibilities:
+        - Stand for a pythoneda.shared.Event about a stack.
+
+    Collaborators:
+        - None
+    """
+
+    def __init__(self, eventId: str, stackName: str, previousEventIds: list):
+        self.id = eventId
+        self.stack_name = stackName
+        self.project_name = "licdata"
+        self.previous_event_ids = previousEventIds
+
+
+class InfrastructureUpdated(StackEvent):
+    """
+    A result of an update, emitted in the tests.
+    """
+
+
+class SignalEmissionQueueTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests SignalEmissionQueue.
+
+    Class name: SignalEmissionQueueTests
+
+    Responsibilities:
+        - Check batching is opt-in.
+        - Check queued events are sent in order.
+        - Check the overflow policies.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.dbus.SignalEmissionQueue
+    """
+
+    def setUp(self):
+        self.sent = []
+
+    async def send(self, event):
+        self.sent.append(event.id)
+
+    def queue(self, **kwargs) -> SignalEmissionQueue:
+        return SignalEmissionQueue(self.send, flushWindow=60, **kwargs)
+
+    def test_batching_is_opt_in(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            queue = SignalEmissionQueue(self.send)
+        self.assertEqual(queue.flush_window, 0)
+
+    async def test_queued_events_are_sent_in_order(self):
+        queue = self.queue()
+        await queue.put(InfrastructureUpdated("a", "dev", ["request-1"]))
+        await queue.put(InfrastructureUpdated("b", "prod", ["request-2"]))
+        await queue.put(InfrastructureUpdated("c", "dev", ["request-1"]))
+        self.assertEqual(self.sent, [])
+        await queue.flush()
+        self.assertEqual(self.sent, ["a", "b", "c"])
+        self.assertEqual(queue.stats()["queue_depth"], 0)
+
+    async def test_drop_oldest_when_full(self):
+        queue = self.queue(maxQueued=2, overflow=SignalEmissionQueue.DROP_OLDEST)
+        for event_id in ["a", "b", "c"]:
+            await queue.put(InfrastructureUpdated(event_id, "dev", [event_id]))
+        await queue.flush()
+        self.assertEqual(self.sent, ["b", "c"])
+        self.assertEqual(queue.stats()["dropped"], 1)
+
+    async def test_drop_newest_when_full(self):
+        queue = self.queue(maxQueued=2, overflow=SignalEmissionQueue.DROP_NEWEST)
+        for event_id in ["a", "b", "c"]:
+            await queue.put(InfrastructureUpdated(event_id, "dev", [event_id]))
+        await queue.flush()
+        self.assertEqual(self.sent, ["a", "b"])
+
+    async def test_wait_when_full(self):
+        queue = SignalEmissionQueue(self.send, flushWindow=0, maxQueued=1)
+        await queue.put(InfrastructureUpdated("a", "dev", ["a"]))
+        await asyncio.wait_for(
+            queue.put(InfrastructureUpdated("b", "dev", ["b"])), timeout=1
+        )
+        await queue.flush()
+        self.assertEqual(self.sent, ["a", "b"])
+        self.assertEqual(queue.stats()["dropped"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
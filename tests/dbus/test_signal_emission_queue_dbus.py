@@ -0,0 +1,160 @@
+# vim: set fileencoding=utf-8
+"""
+tests/dbus/test_signal_emission_queue_dbus.py
+
+This script defines the SignalEmissionQueueDbusTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.dbus.signal_emission_queue import (
+    SignalEmissionQueue,
+)
+import asyncio
+import importlib.util
+import shutil
+import subprocess
+import unittest
+
+HAS_DBUS_NEXT = importlib.util.find_spec("dbus_next") is not None
+
+if HAS_DBUS_NEXT:
+    from dbus_next import Message, MessageType
+    from dbus_next.aio import MessageBus
+
+DBUS_DAEMON = shutil.which("dbus-daemon")
+
+INTERFACE = "org.acmsl.iac.licdata.infrastructure.Tests"
+
+
+class Updated:
+    """
+    An event sent as a d-bus signal in the tests.
+
+    Class name: Updated
+
+    Responsibilities:
+        - Stand for a pythoneda.shared.Event.
+
+    Collaborators:
+        - None
+    """
+
+    def __init__(self, eventId: str):
+        self.id = eventId
+
+
+@unittest.skipUnless(HAS_DBUS_NEXT, "dbus-next is not installed")
+@unittest.skipIf(DBUS_DAEMON is None, "dbus-daemon is not installed")
+class SignalEmissionQueueDbusTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests SignalEmissionQueue against a private dbus-daemon.
+
+    Class name: SignalEmissionQueueDbusTests
+
+    Responsibilities:
+        - Check batched events reach d-bus listeners, in order.
+        - Check flush() sends what is still queued.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.dbus.SignalEmissionQueue
+    """
+
+    async def asyncSetUp(self):
+        self.daemon = subprocess.Popen(
+            [DBUS_DAEMON, "--session", "--nofork", "--print-address=1"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        address = self.daemon.stdout.readline().strip()
+        if not address:
+            self.daemon.kill()
+            self.daemon.wait()
+            self.skipTest("dbus-daemon did not start")
+        self.sender = await MessageBus(bus_address=address).connect()
+        self.receiver = await MessageBus(bus_address=address).connect()
+        self.received = []
+        self.all_received = asyncio.Event()
+        self.expected = 0
+        self.receiver.add_message_handler(self.receive)
+        await self.receiver.call(
+            Message(
+                destination="org.freedesktop.DBus",
+                path="/org/freedesktop/DBus",
+                interface="org.freedesktop.DBus",
+                member="AddMatch",
+                signature="s",
+                body=[f"type='signal',interface='{INTERFACE}'"],
+            )
+        )
+
+    async def asyncTearDown(self):
+        self.sender.disconnect()
+        self.receiver.disconnect()
+        self.daemon.terminate()
+        self.daemon.wait()
+        self.daemon.stdout.close()
+
+    def receive(self, message):
+        if (
+            message.message_type == MessageType.SIGNAL
+            and message.interface == INTERFACE
+        ):
+            self.received.append(message.body[0])
+            if len(self.received) >= self.expected:
+                self.all_received.set()
+
+    async def send(self, event):
+        await self.sender.send(
+            Message.new_signal(
+                "/org/acmsl/iac/licdata", INTERFACE, "Updated", "s", [event.id]
+            )
+        )
+
+    async def wait_for(self, count: int):
+        self.expected = count
+        if len(self.received) < count:
+            await asyncio.wait_for(self.all_received.wait(), timeout=5)
+
+    async def test_batched_events_reach_the_listeners_in_order(self):
+        queue = SignalEmissionQueue(self.send, flushWindow=0.01)
+        for event_id in ["a", "b", "c"]:
+            await queue.put(Updated(event_id))
+        await self.wait_for(3)
+        self.assertEqual(self.received, ["a", "b", "c"])
+        self.assertEqual(queue.stats()["sent"], 3)
+
+    async def test_flush_sends_the_queued_events(self):
+        queue = SignalEmissionQueue(self.send, flushWindow=60)
+        await queue.put(Updated("a"))
+        await queue.put(Updated("b"))
+        await queue.flush()
+        await self.wait_for(2)
+        self.assertEqual(self.received, ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
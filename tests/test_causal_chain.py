@@ -0,0 +1,84 @@
+# vim: set fileencoding=utf-8
+"""
+tests/test_causal_chain.py
+
+This script defines the CausalChainTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.causal_chain import CausalChain
+import os
+from types import SimpleNamespace
+import unittest
+from unittest import mock
+
+
+class CausalChainTests(unittest.TestCase):
+    """
+    Tests CausalChain.
+
+    Class name: CausalChainTests
+
+    Responsibilities:
+        - Check chains keep their order, newest first.
+        - Check long chains keep the newest ids and the root.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.CausalChain
+    """
+
+    def setUp(self):
+        CausalChain._max_length = None
+
+    def tearDown(self):
+        CausalChain._max_length = None
+
+    def test_short_chains_are_kept_whole(self):
+        self.assertEqual(CausalChain.extend(["c"], ["b", "a"], 5), ["c", "b", "a"])
+        self.assertEqual(CausalChain.extend(["c", "d"], None, 5), ["c", "d"])
+
+    def test_long_chains_keep_the_newest_ids_and_the_root(self):
+        previous = [str(i) for i in range(9, 0, -1)]
+        self.assertEqual(CausalChain.extend(["10"], previous, 4), ["10", "9", "8", "1"])
+        self.assertEqual(CausalChain.extend(["c", "b", "a"], [], 2), ["c", "a"])
+
+    def test_length_is_never_below_the_minimum(self):
+        self.assertEqual(CausalChain.extend(["c"], ["b", "a"], 0), ["c", "a"])
+
+    def test_of_chains_the_event_to_its_ancestors(self):
+        event = SimpleNamespace(id="c", previous_event_ids=["b", "a"])
+        self.assertEqual(CausalChain.of(event), ["c", "b", "a"])
+
+    def test_max_length_is_read_from_the_environment(self):
+        with mock.patch.dict(os.environ, {"LICDATA_IAC_MAX_CAUSAL_CHAIN": "3"}):
+            self.assertEqual(CausalChain.max_length(), 3)
+        CausalChain._max_length = None
+        with mock.patch.dict(os.environ, {"LICDATA_IAC_MAX_CAUSAL_CHAIN": "many"}):
+            self.assertEqual(CausalChain.max_length(), CausalChain.DEFAULT_MAX_LENGTH)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,77 @@
+# vim: set fileencoding=utf-8
+"""
+tests/test_environment_setting.py
+
+This script defines the EnvironmentSettingTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.environment_setting import (
+    EnvironmentSetting,
+)
+import os
+import unittest
+from unittest import mock
+
+
+class EnvironmentSettingTests(unittest.TestCase):
+    """
+    Tests EnvironmentSetting.
+
+    Class name: EnvironmentSettingTests
+
+    Responsibilities:
+        - Check valid settings are parsed.
+        - Check missing or invalid settings fall back to the default.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.EnvironmentSetting
+    """
+
+    def test_valid_settings_are_parsed(self):
+        with mock.patch.dict(os.environ, {"A": "7", "B": "0.5", "C": "x"}):
+            self.assertEqual(EnvironmentSetting.integer("A", 1), 7)
+            self.assertEqual(EnvironmentSetting.number("B", 1.0), 0.5)
+            self.assertEqual(EnvironmentSetting.choice("C", "y", ["x", "y"]), "x")
+
+    def test_missing_settings_use_the_default(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(EnvironmentSetting.integer("A", 1), 1)
+            self.assertEqual(EnvironmentSetting.number("B", 1.5), 1.5)
+            self.assertEqual(EnvironmentSetting.choice("C", "y", ["x", "y"]), "y")
+
+    def test_invalid_settings_use_the_default(self):
+        with mock.patch.dict(os.environ, {"A": "7x", "B": "", "C": "z"}):
+            with self.assertLogs(level="WARNING"):
+                self.assertEqual(EnvironmentSetting.integer("A", 1), 1)
+            with self.assertLogs(level="WARNING"):
+                self.assertEqual(EnvironmentSetting.number("B", 1.5), 1.5)
+            with self.assertLogs(level="WARNING"):
+                self.assertEqual(EnvironmentSetting.choice("C", "y", ["x", "y"]), "y")
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,94 @@
+# vim: set fileencoding=utf-8
+"""
+tests/test_operation_fingerprint_journal.py
+
+This script defines the OperationFingerprintJournalTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.operation_fingerprint_journal import (
+    OperationFingerprintJournal,
+)
+from org.acmsl.iac.licdata.infrastructure.persisted_stack_records import (
+    PersistedStackRecords,
+)
+import tempfile
+import unittest
+
+
+class OperationFingerprintJournalTests(unittest.TestCase):
+    """
+    Tests OperationFingerprintJournal.
+
+    Class name: OperationFingerprintJournalTests
+
+    Responsibilities:
+        - Check results are only replayed for the same inputs, within the window.
+        - Check any later success or removal invalidates earlier results.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.OperationFingerprintJournal
+    """
+
+    def setUp(self):
+        self.state_dir = tempfile.TemporaryDirectory()
+        self.journal = OperationFingerprintJournal(
+            PersistedStackRecords("operation-fingerprints.json", self.state_dir.name)
+        )
+
+    def tearDown(self):
+        self.state_dir.cleanup()
+
+    def test_matches_the_same_inputs_within_the_window(self):
+        self.journal.record_success("p", "s", "Up", "abc", {"url": "x"})
+        self.assertEqual(
+            self.journal.matching_result("p", "s", "Up", "abc", 60), {"url": "x"}
+        )
+        self.assertIsNone(self.journal.matching_result("p", "s", "Up", "def", 60))
+        self.assertIsNone(self.journal.matching_result("p", "s", "Up", "abc", -1))
+
+    def test_a_success_of_another_kind_invalidates_earlier_results(self):
+        self.journal.record_success("p", "s", "Infrastructure", "abc", {})
+        self.journal.record_success("p", "s", "Docker", "def", {})
+        self.assertIsNone(
+            self.journal.matching_result("p", "s", "Infrastructure", "abc", 60)
+        )
+        self.assertIsNotNone(
+            self.journal.matching_result("p", "s", "Docker", "def", 60)
+        )
+
+    def test_forget_drops_the_stack(self):
+        self.journal.record_success("p", "s", "Up", "abc", {})
+        self.journal.record_success("p", "other", "Up", "abc", {})
+        self.journal.forget("p", "s")
+        self.assertIsNone(self.journal.matching_result("p", "s", "Up", "abc", 60))
+        self.assertIsNotNone(
+            self.journal.matching_result("p", "other", "Up", "abc", 60)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,130 @@
+# vim: set fileencoding=utf-8
+"""
+tests/test_package_digest.py
+
+This script defines the PackageDigestTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import hashlib
+from org.acmsl.iac.licdata.infrastructure.package_digest import PackageDigest
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class PackageDigestTests(unittest.TestCase):
+    """
+    Tests PackageDigest.
+
+    Class name: PackageDigestTests
+
+    Responsibilities:
+        - Check packages are hashed in chunks.
+        - Check digests are memoized by path, size and mtime.
+        - Check the content-addressed names.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.PackageDigest
+    """
+
+    def setUp(self):
+        PackageDigest._digests = {}
+        self._folder = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._folder.name, "rest.zip")
+
+    def tearDown(self):
+        self._folder.cleanup()
+        PackageDigest._digests = {}
+
+    def _write(self, content: bytes, mtime_ns: int = None):
+        with open(self._path, "wb") as file:
+            file.write(content)
+        if mtime_ns is not None:
+            os.utime(self._path, ns=(mtime_ns, mtime_ns))
+
+    def test_streams_the_package_in_chunks(self):
+        content = b"0123456789" * 10
+        self._write(content)
+        reads = []
+        real_open = open
+
+        def tracking_open(*args, **kwargs):
+            file = real_open(*args, **kwargs)
+            read = file.read
+            file.read = lambda size=-1: reads.append(size) or read(size)
+            return file
+
+        with mock.patch.object(PackageDigest, "CHUNK_SIZE", 16):
+            with mock.patch("builtins.open", tracking_open):
+                result = PackageDigest.sha256(self._path)
+        self.assertEqual(result, hashlib.sha256(content).hexdigest())
+        self.assertEqual(set(reads), {16})
+        self.assertEqual(len(reads), 8)
+
+    def test_memoizes_by_size_and_mtime(self):
+        self._write(b"first", 1_000_000_000)
+        first = PackageDigest.sha256(self._path)
+        # same size and mtime: the memoized digest is trusted
+        self._write(b"other", 1_000_000_000)
+        with mock.patch("hashlib.sha256") as sha256:
+            self.assertEqual(PackageDigest.sha256(self._path), first)
+            sha256.assert_not_called()
+        # a new mtime means the package is hashed again
+        self._write(b"other", 2_000_000_000)
+        self.assertEqual(
+            PackageDigest.sha256(self._path), hashlib.sha256(b"other").hexdigest()
+        )
+        # so does a new size
+        self._write(b"longer", 2_000_000_000)
+        self.assertEqual(
+            PackageDigest.sha256(self._path), hashlib.sha256(b"longer").hexdigest()
+        )
+
+    def test_content_addressed_names_follow_the_content(self):
+        self._write(b"content", 1_000_000_000)
+        digest = hashlib.sha256(b"content").hexdigest()
+        self.assertEqual(
+            PackageDigest.content_addressed_name(self._path), f"rest-{digest[:16]}.zip"
+        )
+        self.assertEqual(
+            PackageDigest.content_addressed_name(self._path, 8),
+            f"rest-{digest[:8]}.zip",
+        )
+        # a rebuilt package with the same bytes keeps its name
+        self._write(b"content", 2_000_000_000)
+        self.assertEqual(
+            PackageDigest.content_addressed_name(self._path), f"rest-{digest[:16]}.zip"
+        )
+
+    def test_missing_packages_raise(self):
+        with self.assertRaises(FileNotFoundError):
+            PackageDigest.sha256(self._path)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
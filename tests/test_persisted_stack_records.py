@@ -0,0 +1,90 @@
+# vim: set fileencoding=utf-8
+"""
+tests/test_persisted_stack_records.py
+
+This script defines the PersistedStackRecordsTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.persisted_stack_records import (
+    PersistedStackRecords,
+)
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class PersistedStackRecordsTests(unittest.TestCase):
+    """
+    Tests PersistedStackRecords.
+
+    Class name: PersistedStackRecordsTests
+
+    Responsibilities:
+        - Check the records survive a reload.
+        - Check failed writes keep the previous file and leave no
+          temporary file behind.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.PersistedStackRecords
+    """
+
+    def test_records_survive_a_reload(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            PersistedStackRecords("records.json", state_dir).put(
+                "licdata", "dev", {"a": 1}
+            )
+            records = PersistedStackRecords("records.json", state_dir)
+            self.assertEqual(records.get("licdata", "dev"), {"a": 1})
+            records.remove("licdata", "dev")
+            self.assertIsNone(
+                PersistedStackRecords("records.json", state_dir).get("licdata", "dev")
+            )
+
+    def test_unserializable_records_leave_no_temporary_file(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            records = PersistedStackRecords("records.json", state_dir)
+            records.put("licdata", "dev", {"a": 1})
+            with self.assertLogs(level="WARNING"):
+                records.put("licdata", "prod", {"a": object()})
+            self.assertEqual(os.listdir(state_dir), ["records.json"])
+            self.assertEqual(
+                PersistedStackRecords("records.json", state_dir).get("licdata", "dev"),
+                {"a": 1},
+            )
+
+    def test_failed_replace_leaves_no_temporary_file(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            records = PersistedStackRecords("records.json", state_dir)
+            with mock.patch("os.replace", side_effect=OSError("read-only")):
+                with self.assertLogs(level="WARNING"):
+                    records.put("licdata", "dev", {"a": 1})
+            self.assertEqual(os.listdir(state_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
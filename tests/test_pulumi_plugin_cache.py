@@ -0,0 +1,95 @@
+# vim: set fileencoding=utf-8
+"""
+tests/test_pulumi_plugin_cache.py
+
+This script defines the PulumiPluginCacheTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+from org.acmsl.iac.licdata.infrastructure.pulumi_plugin_cache import (
+    PulumiPluginCache,
+)
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class PulumiPluginCacheTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests PulumiPluginCache.
+
+    Class name: PulumiPluginCacheTests
+
+    Responsibilities:
+        - Check an unreadable manifest disables the warm-up instead of failing.
+        - Check failed warm-ups are retried only after the backoff.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.PulumiPluginCache
+    """
+
+    def test_reads_the_manifest(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "plugins.json")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write('{"azure-native": "v2.11.0"}')
+            self.assertEqual(
+                PulumiPluginCache.read_manifest(path), {"azure-native": "v2.11.0"}
+            )
+
+    def test_unreadable_manifests_pin_no_plugins(self):
+        with tempfile.TemporaryDirectory() as folder:
+            invalid = os.path.join(folder, "invalid.json")
+            with open(invalid, "w", encoding="utf-8") as file:
+                file.write("[1, 2")
+            for path in [os.path.join(folder, "missing.json"), invalid]:
+                with self.assertLogs(level="WARNING"):
+                    self.assertEqual(PulumiPluginCache.read_manifest(path), {})
+
+    async def test_failed_warm_ups_are_retried_after_the_backoff(self):
+        cache = PulumiPluginCache(plugins={}, retryBackoff=60)
+        with mock.patch.object(cache, "warm_up", return_value=False) as warm_up:
+            self.assertFalse(await cache.ensure_warm())
+            self.assertFalse(await cache.ensure_warm())
+            self.assertEqual(warm_up.call_count, 1)
+            cache._failed_at -= 61
+            self.assertFalse(await cache.ensure_warm())
+            self.assertEqual(warm_up.call_count, 2)
+
+    async def test_successful_warm_ups_run_once(self):
+        cache = PulumiPluginCache(plugins={}, retryBackoff=0)
+        with mock.patch.object(cache, "warm_up", return_value=True) as warm_up:
+            self.assertTrue(
+                all(await asyncio.gather(cache.ensure_warm(), cache.ensure_warm()))
+            )
+            self.assertTrue(await cache.ensure_warm())
+            self.assertEqual(warm_up.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,110 @@
+# vim: set fileencoding=utf-8
+"""
+tests/test_pulumi_resource_timings.py
+
+This script defines the PulumiResourceTimingsTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.pulumi_resource_timings import (
+    PulumiResourceTimings,
+)
+from types import SimpleNamespace
+import unittest
+
+
+class PulumiResourceTimingsTests(unittest.TestCase):
+    """
+    Tests PulumiResourceTimings.
+
+    Class name: PulumiResourceTimingsTests
+
+    Responsibilities:
+        - Check resource steps are timed from the engine events.
+        - Check the critical path follows the order the steps ran in.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.PulumiResourceTimings
+    """
+
+    # rg <- plan <- app: the app depends on the plan, which depends on the group
+    DEPENDENCIES = {"app": ["plan"], "plan": ["rg"], "rg": [], "logs": ["rg"]}
+
+    DURATIONS = {"rg": 1.0, "plan": 5.0, "app": 2.0, "logs": 1.0}
+
+    @classmethod
+    def engine_event(cls, urn: str, started: bool = True, failed: bool = False):
+        metadata = SimpleNamespace(urn=urn, type="test:Resource", op="create")
+        ended = SimpleNamespace(metadata=metadata)
+        return SimpleNamespace(
+            resource_pre_event=SimpleNamespace(metadata=metadata) if started else None,
+            res_outputs_event=None if started or failed else ended,
+            res_op_failed_event=ended if failed else None,
+        )
+
+    def test_times_started_and_finished_steps(self):
+        timings = PulumiResourceTimings()
+        timings.on_event(self.engine_event("rg"))
+        timings.on_event(self.engine_event("app"))
+        timings.on_event(self.engine_event("rg", started=False))
+        timings.on_event(self.engine_event("app", started=False, failed=True))
+        timings.on_event(self.engine_event("plan"))
+        durations = timings.durations()
+        self.assertEqual(sorted(durations.keys()), ["app", "rg"])
+        self.assertTrue(durations["app"]["failed"])
+        self.assertFalse(durations["rg"]["failed"])
+
+    def test_critical_path_follows_dependencies(self):
+        path, seconds = PulumiResourceTimings.critical_path(
+            self.DURATIONS, self.DEPENDENCIES
+        )
+        self.assertEqual(path, ["rg", "plan", "app"])
+        self.assertEqual(seconds, 8.0)
+
+    def test_critical_path_of_deletions_runs_backwards(self):
+        path, seconds = PulumiResourceTimings.critical_path(
+            self.DURATIONS,
+            PulumiResourceTimings.reversed_dependencies(self.DEPENDENCIES),
+        )
+        self.assertEqual(path, ["app", "plan", "rg"])
+        self.assertEqual(seconds, 8.0)
+
+    def test_reversed_dependencies(self):
+        self.assertEqual(
+            PulumiResourceTimings.reversed_dependencies(self.DEPENDENCIES),
+            {"plan": ["app"], "rg": ["plan", "logs"]},
+        )
+
+    def test_critical_path_ignores_cycles(self):
+        path, seconds = PulumiResourceTimings.critical_path(
+            {"a": 1.0, "b": 2.0}, {"a": ["b"], "b": ["a"]}
+        )
+        self.assertEqual(seconds, 3.0)
+        self.assertEqual(len(path), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
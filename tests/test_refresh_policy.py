@@ -0,0 +1,109 @@
+# vim: set fileencoding=utf-8
+"""
+tests/test_refresh_policy.py
+
+This script defines the RefreshPolicyTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.persisted_stack_records import (
+    PersistedStackRecords,
+)
+from org.acmsl.iac.licdata.infrastructure.pulumi_refresh_journal import (
+    PulumiRefreshJournal,
+)
+from org.acmsl.iac.licdata.infrastructure.refresh_mode import RefreshMode
+from org.acmsl.iac.licdata.infrastructure.refresh_policy import RefreshPolicy
+import tempfile
+import time
+import unittest
+
+
+class RefreshPolicyTests(unittest.TestCase):
+    """
+    Tests RefreshPolicy and PulumiRefreshJournal.
+
+    Class name: RefreshPolicyTests
+
+    Responsibilities:
+        - Check the policy is read from the event metadata.
+        - Check stale and fresh stacks are told apart.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.RefreshPolicy
+        - org.acmsl.iac.licdata.infrastructure.PulumiRefreshJournal
+    """
+
+    def test_missing_or_invalid_policy_means_always(self):
+        self.assertEqual(RefreshPolicy.from_metadata(None).mode, RefreshMode.ALWAYS)
+        self.assertEqual(
+            RefreshPolicy.from_metadata({"refresh_policy": "sometimes"}).mode,
+            RefreshMode.ALWAYS,
+        )
+
+    def test_reads_mode_and_max_age(self):
+        policy = RefreshPolicy.from_metadata(
+            {"refresh_policy": "Stale", "refresh_max_age_minutes": "5"}
+        )
+        self.assertEqual(policy.mode, RefreshMode.IF_STALE)
+        self.assertEqual(policy.max_age_minutes, 5.0)
+
+    def test_invalid_max_age_uses_default(self):
+        policy = RefreshPolicy.from_metadata(
+            {"refresh_policy": "stale", "refresh_max_age_minutes": "soon"}
+        )
+        self.assertEqual(policy.max_age_minutes, RefreshPolicy.DEFAULT_MAX_AGE_MINUTES)
+
+    def test_always_and_never_ignore_the_last_refresh(self):
+        self.assertTrue(RefreshPolicy(RefreshMode.ALWAYS).should_refresh(time.time()))
+        self.assertFalse(RefreshPolicy(RefreshMode.NEVER).should_refresh(None))
+
+    def test_stale_compares_the_age_of_the_last_refresh(self):
+        policy = RefreshPolicy(RefreshMode.IF_STALE, 10)
+        self.assertTrue(policy.should_refresh(None))
+        self.assertFalse(policy.should_refresh(time.time() - 60))
+        self.assertTrue(policy.should_refresh(time.time() - 11 * 60))
+
+    def test_journal_records_and_forgets_refreshes(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            journal = PulumiRefreshJournal(
+                PersistedStackRecords("refresh-journal.json", state_dir)
+            )
+            self.assertIsNone(journal.last_refresh("licdata", "dev"))
+            journal.record_refresh("licdata", "dev")
+            self.assertAlmostEqual(
+                journal.last_refresh("licdata", "dev"), time.time(), delta=5
+            )
+            reloaded = PulumiRefreshJournal(
+                PersistedStackRecords("refresh-journal.json", state_dir)
+            )
+            self.assertIsNotNone(reloaded.last_refresh("licdata", "dev"))
+            journal.forget("licdata", "dev")
+            self.assertIsNone(journal.last_refresh("licdata", "dev"))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
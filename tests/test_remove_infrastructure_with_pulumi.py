@@ -0,0 +1,145 @@
+# vim: set fileencoding=utf-8
+"""
+tests/test_remove_infrastructure_with_pulumi.py
+
+This script defines the RemoveInfrastructureWithPulumiTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.remove_infrastructure_with_pulumi import (
+    RemoveInfrastructureWithPulumi,
+)
+from org.acmsl.iac.licdata.infrastructure.stack_operation_scheduler import (
+    StackOperationScheduler,
+)
+from pulumi.automation.errors import CommandError
+from pythoneda.shared.iac.events import (
+    InfrastructureRemovalFailed,
+    InfrastructureRemoved,
+)
+from types import SimpleNamespace
+import unittest
+from unittest import mock
+
+
+class FakeRemoval(RemoveInfrastructureWithPulumi):
+    """
+    A removal whose destroys are only recorded.
+
+    Class name: FakeRemoval
+
+    Responsibilities:
+        - Stand for a stack removal in the tests.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.RemoveInfrastructureWithPulumi
+    """
+
+    dependent_stack_names = ["dev-app"]
+
+    def __init__(self, scheduler: StackOperationScheduler, failing: str = None):
+        self.destroyed = []
+        self._failing = failing
+        self.schedule_with(scheduler)
+
+    @property
+    def event(self):
+        return SimpleNamespace(
+            id="1",
+            stack_name="dev",
+            project_name="licdata",
+            location="westeurope",
+            metadata={},
+            previous_event_ids=[],
+        )
+
+    def _operation_failed(self, error: Exception):
+        pass
+
+    async def _destroy(self, stackName: str, remove: bool = False):
+        if stackName == self._failing:
+            raise CommandError("boom")
+        self.destroyed.append((stackName, remove, set(self._scheduler._busy)))
+
+
+class RemoveInfrastructureWithPulumiTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests RemoveInfrastructureWithPulumi.
+
+    Class name: RemoveInfrastructureWithPulumiTests
+
+    Responsibilities:
+        - Check dependent stacks are destroyed first, only if they exist.
+        - Check each stack is destroyed holding its own scheduler slot.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.RemoveInfrastructureWithPulumi
+    """
+
+    def pool(self, existing):
+        return SimpleNamespace(
+            stack_exists=lambda project, stack: (project, stack) in existing
+        )
+
+    async def test_existing_dependents_go_first_under_their_own_key(self):
+        removal = FakeRemoval(StackOperationScheduler(maxConcurrent=1))
+        with mock.patch(
+            "org.acmsl.iac.licdata.infrastructure.remove_infrastructure_with_pulumi.PulumiWorkspacePool.instance",
+            return_value=self.pool({("licdata", "dev-app")}),
+        ):
+            result = await removal.perform()
+        self.assertIsInstance(result, InfrastructureRemoved)
+        self.assertEqual(
+            removal.destroyed,
+            [
+                ("dev-app", True, {("licdata", "dev-app")}),
+                ("dev", False, {("licdata", "dev")}),
+            ],
+        )
+
+    async def test_missing_dependents_are_not_created(self):
+        removal = FakeRemoval(StackOperationScheduler())
+        with mock.patch(
+            "org.acmsl.iac.licdata.infrastructure.remove_infrastructure_with_pulumi.PulumiWorkspacePool.instance",
+            return_value=self.pool(set()),
+        ):
+            result = await removal.perform()
+        self.assertIsInstance(result, InfrastructureRemoved)
+        self.assertEqual([name for name, _, _ in removal.destroyed], ["dev"])
+
+    async def test_a_failed_dependent_keeps_the_stack(self):
+        removal = FakeRemoval(StackOperationScheduler(), failing="dev-app")
+        with mock.patch(
+            "org.acmsl.iac.licdata.infrastructure.remove_infrastructure_with_pulumi.PulumiWorkspacePool.instance",
+            return_value=self.pool({("licdata", "dev-app")}),
+        ):
+            result = await removal.perform()
+        self.assertIsInstance(result, InfrastructureRemovalFailed)
+        self.assertEqual(removal.destroyed, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,193 @@
+# vim: set fileencoding=utf-8
+"""
+tests/test_stack_operation_coalescer.py
+
+This script defines the StackOperationCoalescerTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.stack_operation_coalescer import (
+    StackOperationCoalescer,
+)
+import asyncio
+from types import SimpleNamespace
+import unittest
+
+
+class FakeOperation:
+    """
+    A stack operation that records the requests it absorbs.
+
+    Class name: FakeOperation
+
+    Responsibilities:
+        - Stand for a PulumiStackOperation in the coalescer tests.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.StackOperationCoalescer
+    """
+
+    def __init__(self, eventId: str):
+        self.event = SimpleNamespace(id=eventId)
+        self.absorbed = []
+
+    def absorb(self, other: "FakeOperation"):
+        self.absorbed.append(other.event.id)
+        self.absorbed.extend(other.absorbed)
+
+
+class StackOperationCoalescerTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests StackOperationCoalescer.
+
+    Class name: StackOperationCoalescerTests
+
+    Responsibilities:
+        - Check operations on the same stack run one at a time.
+        - Check waiting operations get merged into the latest one.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.StackOperationCoalescer
+    """
+
+    def setUp(self):
+        self.performed = []
+
+    def perform(self, operation: FakeOperation, release: asyncio.Event = None):
+        async def run():
+            self.performed.append(operation.event.id)
+            if release is not None:
+                await release.wait()
+            return operation.event.id
+
+        return run
+
+    async def test_waiting_operations_merge_into_the_latest(self):
+        coalescer = StackOperationCoalescer()
+        release = asyncio.Event()
+        first, second, third = [FakeOperation(i) for i in ["a", "b", "c"]]
+        running = asyncio.ensure_future(
+            coalescer.run("stack", first, self.perform(first, release), "merged")
+        )
+        await asyncio.sleep(0)
+        waiting = [
+            asyncio.ensure_future(
+                coalescer.run("stack", op, self.perform(op), "merged")
+            )
+            for op in [second, third]
+        ]
+        await asyncio.sleep(0)
+        self.assertEqual(coalescer.stats(), {"running": 1, "pending": 1, "merged": 1})
+        release.set()
+        results = await asyncio.gather(running, *waiting)
+        self.assertEqual(results, ["a", "merged", "c"])
+        self.assertEqual(self.performed, ["a", "c"])
+        self.assertEqual(third.absorbed, ["b"])
+        self.assertEqual(coalescer.stats(), {"running": 0, "pending": 0, "merged": 1})
+
+    async def test_different_stacks_run_concurrently(self):
+        coalescer = StackOperationCoalescer()
+        release = asyncio.Event()
+        first, second = FakeOperation("a"), FakeOperation("b")
+        tasks = [
+            asyncio.ensure_future(
+                coalescer.run(key, op, self.perform(op, release), "merged")
+            )
+            for key, op in [("one", first), ("two", second)]
+        ]
+        await asyncio.sleep(0)
+        self.assertEqual(coalescer.stats()["running"], 2)
+        release.set()
+        self.assertEqual(await asyncio.gather(*tasks), ["a", "b"])
+        self.assertEqual(coalescer.merged, 0)
+
+    async def test_a_failure_lets_the_next_operation_run(self):
+        coalescer = StackOperationCoalescer()
+        release = asyncio.Event()
+        first, second = FakeOperation("a"), FakeOperation("b")
+
+        async def fail():
+            await release.wait()
+            raise RuntimeError("boom")
+
+        failing = asyncio.ensure_future(coalescer.run("stack", first, fail))
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(
+            coalescer.run("stack", second, self.perform(second))
+        )
+        await asyncio.sleep(0)
+        release.set()
+        with self.assertRaises(RuntimeError):
+            await failing
+        self.assertEqual(await waiting, "b")
+
+    async def test_a_cancelled_waiting_operation_is_forgotten(self):
+        coalescer = StackOperationCoalescer()
+        release = asyncio.Event()
+        first, second, third = [FakeOperation(i) for i in ["a", "b", "c"]]
+        running = asyncio.ensure_future(
+            coalescer.run("stack", first, self.perform(first, release), "merged")
+        )
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(
+            coalescer.run("stack", second, self.perform(second), "merged")
+        )
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiting
+        self.assertEqual(coalescer.stats()["pending"], 0)
+        later = asyncio.ensure_future(
+            coalescer.run("stack", third, self.perform(third), "merged")
+        )
+        await asyncio.sleep(0)
+        release.set()
+        self.assertEqual(await asyncio.gather(running, later), ["a", "c"])
+        self.assertEqual(third.absorbed, [])
+        self.assertEqual(self.performed, ["a", "c"])
+        self.assertEqual(coalescer.stats(), {"running": 0, "pending": 0, "merged": 0})
+
+    async def test_a_cancelled_running_operation_lets_the_next_one_run(self):
+        coalescer = StackOperationCoalescer()
+        release = asyncio.Event()
+        first, second = FakeOperation("a"), FakeOperation("b")
+        running = asyncio.ensure_future(
+            coalescer.run("stack", first, self.perform(first, release))
+        )
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(
+            coalescer.run("stack", second, self.perform(second))
+        )
+        await asyncio.sleep(0)
+        running.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await running
+        self.assertEqual(await waiting, "b")
+        self.assertEqual(coalescer.stats(), {"running": 0, "pending": 0, "merged": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
@@ -0,0 +1,151 @@
+# vim: set fileencoding=utf-8
+"""
+tests/test_stack_operation_scheduler.py
+
+This script defines the StackOperationSchedulerTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.stack_operation_scheduler import (
+    StackOperationScheduler,
+)
+import asyncio
+import unittest
+
+
+class StackOperationSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests StackOperationScheduler.
+
+    Class name: StackOperationSchedulerTests
+
+    Responsibilities:
+        - Check operations on the same stack run in FIFO order, one at a time.
+        - Check the global and per-priority limits, and the priority order.
+        - Check cancelled operations leave the queues consistent.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.StackOperationScheduler
+    """
+
+    def setUp(self):
+        self.started = []
+        self.releases = {}
+
+    def operation(self, name: str):
+        release = asyncio.Event()
+        self.releases[name] = release
+
+        async def perform():
+            self.started.append(name)
+            await release.wait()
+            return name
+
+        return perform
+
+    async def settle(self):
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+    async def test_same_stack_runs_in_fifo_order(self):
+        scheduler = StackOperationScheduler(maxConcurrent=4)
+        tasks = [
+            asyncio.ensure_future(
+                scheduler.run(
+                    "stack", StackOperationScheduler.UPDATE, self.operation(n)
+                )
+            )
+            for n in ["a", "b", "c"]
+        ]
+        await self.settle()
+        self.assertEqual(self.started, ["a"])
+        self.assertEqual(scheduler.stats()["queue_depth"], {"stack": 2})
+        for name in ["a", "b", "c"]:
+            self.releases[name].set()
+            await self.settle()
+        self.assertEqual(await asyncio.gather(*tasks), ["a", "b", "c"])
+        self.assertEqual(self.started, ["a", "b", "c"])
+        self.assertEqual(scheduler.stats()["waits"]["update"]["count"], 3)
+
+    async def test_destroys_go_first_once_a_slot_frees_up(self):
+        scheduler = StackOperationScheduler(maxConcurrent=1)
+        tasks = [
+            asyncio.ensure_future(scheduler.run(key, priority, self.operation(key)))
+            for key, priority in [
+                ("one", StackOperationScheduler.UPDATE),
+                ("two", StackOperationScheduler.UPDATE),
+                ("three", StackOperationScheduler.DESTROY),
+            ]
+        ]
+        await self.settle()
+        self.assertEqual(self.started, ["one"])
+        for name in ["one", "three", "two"]:
+            self.releases[name].set()
+            await self.settle()
+        await asyncio.gather(*tasks)
+        self.assertEqual(self.started, ["one", "three", "two"])
+
+    async def test_per_priority_limits(self):
+        scheduler = StackOperationScheduler(
+            maxConcurrent=3,
+            maxConcurrentByPriority={StackOperationScheduler.DESTROY: 1},
+        )
+        tasks = [
+            asyncio.ensure_future(scheduler.run(key, priority, self.operation(key)))
+            for key, priority in [
+                ("one", StackOperationScheduler.DESTROY),
+                ("two", StackOperationScheduler.DESTROY),
+                ("three", StackOperationScheduler.UPDATE),
+            ]
+        ]
+        await self.settle()
+        self.assertEqual(self.started, ["one", "three"])
+        self.assertEqual(scheduler.stats()["running"], {"destroy": 1, "update": 1})
+        for release in self.releases.values():
+            release.set()
+        await asyncio.gather(*tasks)
+        self.assertEqual(self.started, ["one", "three", "two"])
+
+    async def test_cancelled_waiters_leave_the_queue(self):
+        scheduler = StackOperationScheduler(maxConcurrent=1)
+        running = asyncio.ensure_future(
+            scheduler.run("stack", StackOperationScheduler.UPDATE, self.operation("a"))
+        )
+        waiting = asyncio.ensure_future(
+            scheduler.run("stack", StackOperationScheduler.UPDATE, self.operation("b"))
+        )
+        await self.settle()
+        waiting.cancel()
+        await self.settle()
+        self.assertEqual(scheduler.stats()["queued"], 0)
+        self.releases["a"].set()
+        self.assertEqual(await running, "a")
+        self.assertEqual(scheduler.stats()["running"], {"destroy": 0, "update": 0})
+        self.assertEqual(self.started, ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End:
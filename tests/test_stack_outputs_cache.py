@@ -0,0 +1,81 @@
+# vim: set fileencoding=utf-8
+"""
+tests/test_stack_outputs_cache.py
+
+This script defines the StackOutputsCacheTests class.
+
+Copyright (C) 2024-today acmsl's Licdata IaC
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from org.acmsl.iac.licdata.infrastructure.stack_outputs_cache import (
+    StackOutputsCache,
+)
+import tempfile
+from types import SimpleNamespace
+import unittest
+
+
+class StackOutputsCacheTests(unittest.TestCase):
+    """
+    Tests StackOutputsCache.
+
+    Class name: StackOutputsCacheTests
+
+    Responsibilities:
+        - Check the cached outputs expire.
+
+    Collaborators:
+        - org.acmsl.iac.licdata.infrastructure.StackOutputsCache
+    """
+
+    OUTPUTS = {"container_registry_url": SimpleNamespace(value="acr", secret=False)}
+
+    def setUp(self):
+        self.state_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.state_dir.cleanup()
+
+    def test_outputs_are_served_within_the_max_age(self):
+        cache = StackOutputsCache(self.state_dir.name, maxAge=60)
+        cache.store("licdata", "dev", self.OUTPUTS)
+        self.assertEqual(cache.get("licdata", "dev"), {"container_registry_url": "acr"})
+        self.assertIsNone(cache.get("licdata", "prod"))
+
+    def test_outputs_expire(self):
+        cache = StackOutputsCache(self.state_dir.name, maxAge=-1)
+        cache.store("licdata", "dev", self.OUTPUTS)
+        self.assertIsNone(cache.get("licdata", "dev"))
+        self.assertIsNotNone(cache.get("licdata", "dev", maxAge=60))
+
+    def test_forget_drops_the_outputs(self):
+        cache = StackOutputsCache(self.state_dir.name, maxAge=60)
+        cache.store("licdata", "dev", self.OUTPUTS)
+        cache.forget("licdata", "dev")
+        self.assertIsNone(cache.get("licdata", "dev"))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+# vim: syntax=python ts=4 sw=4 sts=4 tw=79 sr et
+# Local Variables:
+# mode: python
+# python-indent-offset: 4
+# tab-width: 4
+# indent-tabs-mode: nil
+# fill-column: 79
+# End: